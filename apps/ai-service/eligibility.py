@@ -0,0 +1,321 @@
+"""
+Eligibility engine.
+
+A commission's ruleset is compiled once into a flat list of requirement
+checks (document type, maximum document age, age conditions and result
+tests, all parsed and normalized up front) and cached by ruleset id and
+version. Evaluating a fighter is then a dictionary lookup per requirement
+and a few date comparisons, cheap enough to run on every roster view.
+"""
+
+import json
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, timedelta
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, ConfigDict, Field
+
+# Documents expiring within this many days make a fighter conditionally eligible
+EXPIRING_SOON_DAYS = 30
+
+# Compiled rulesets kept in memory
+MAX_COMPILED_RULESETS = 256
+
+# Document statuses that can fulfil a requirement
+USABLE_STATUSES = frozenset({"verified"})
+
+# Document statuses that will be usable once reviewed
+PENDING_STATUSES = frozenset({"pending", "processing"})
+
+# Note on requirements whose only documents have expired
+EXPIRED_NOTE = "Document expired"
+
+
+# Models
+class RulesetRequirement(BaseModel):
+    """One entry of a Ruleset's requirements JSON."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    name: str
+    document_type: str = Field(alias="documentType")
+    is_required: bool = Field(True, alias="isRequired")
+    expiration_days: Optional[int] = Field(None, alias="expirationDays", ge=0)
+    condition: Optional[Any] = None
+    tests: Dict[str, Any] = {}
+
+
+class RulesetPayload(BaseModel):
+    id: str
+    version: int = 1
+    # May be omitted once this id and version have been compiled
+    requirements: Optional[List[RulesetRequirement]] = None
+
+
+class FighterDocument(BaseModel):
+    id: str
+    type: str
+    status: str = "pending"
+    issue_date: Optional[date] = None
+    expiration_date: Optional[date] = None
+    results: Optional[Dict[str, Any]] = None
+
+
+class RequirementResult(BaseModel):
+    name: str
+    document_type: str
+    is_required: bool
+    is_fulfilled: bool
+    document_id: Optional[str] = None
+    expires_at: Optional[date] = None
+    notes: Optional[str] = None
+
+
+class EligibilityResult(BaseModel):
+    status: str
+    overall_score: int
+    requirements: List[RequirementResult]
+    expiring_soon: List[RequirementResult]
+    valid_until: Optional[date] = None
+
+
+# Compiled form
+@dataclass(frozen=True)
+class CompiledRequirement:
+    name: str
+    document_type: str
+    is_required: bool
+    max_age: Optional[timedelta]
+    age_over: Optional[int]
+    age_under: Optional[int]
+    # (result key, accepted normalized values)
+    tests: Tuple[Tuple[str, frozenset], ...]
+
+    def applies_to(self, age: Optional[int]) -> bool:
+        """Whether the requirement's age condition covers a fighter."""
+        # Unknown ages get every requirement, as unparseable conditions do
+        if age is None:
+            return True
+        if self.age_over is not None and age <= self.age_over:
+            return False
+        if self.age_under is not None and age >= self.age_under:
+            return False
+        return True
+
+
+@dataclass(frozen=True)
+class CompiledRuleset:
+    ruleset_id: str
+    version: int
+    requirements: Tuple[CompiledRequirement, ...]
+
+
+def _normalize(value: Any) -> str:
+    return str(value).strip().lower().replace(" ", "_")
+
+
+def _parse_condition(condition: Any) -> Dict[str, Any]:
+    """Parse an ``{"ageOver": n, "ageUnder": n}`` condition, possibly JSON text."""
+    if isinstance(condition, str):
+        try:
+            condition = json.loads(condition)
+        except ValueError:
+            return {}
+    return condition if isinstance(condition, dict) else {}
+
+
+def _age_limit(condition: Dict[str, Any], key: str) -> Optional[int]:
+    """An integer age bound of a condition, or None if absent or unparseable."""
+    try:
+        return int(condition[key])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def compile_ruleset(ruleset: RulesetPayload) -> CompiledRuleset:
+    """Compile a ruleset's requirements JSON into evaluable checks."""
+    requirements = []
+    for requirement in ruleset.requirements or []:
+        condition = _parse_condition(requirement.condition)
+        tests = []
+        for key, expected in requirement.tests.items():
+            accepted = expected if isinstance(expected, list) else [expected]
+            tests.append(
+                (_normalize(key), frozenset(_normalize(value) for value in accepted))
+            )
+        requirements.append(
+            CompiledRequirement(
+                name=requirement.name,
+                document_type=_normalize(requirement.document_type),
+                is_required=requirement.is_required,
+                max_age=(
+                    timedelta(days=requirement.expiration_days)
+                    if requirement.expiration_days is not None
+                    else None
+                ),
+                age_over=_age_limit(condition, "ageOver"),
+                age_under=_age_limit(condition, "ageUnder"),
+                tests=tuple(tests),
+            )
+        )
+    return CompiledRuleset(ruleset.id, ruleset.version, tuple(requirements))
+
+
+class RulesetCache:
+    """Compiled rulesets keyed by (ruleset id, version), least recently used out."""
+
+    def __init__(self, max_size: int = MAX_COMPILED_RULESETS):
+        self.max_size = max_size
+        self._compiled: OrderedDict[Tuple[str, int], CompiledRuleset] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, ruleset: RulesetPayload) -> Optional[CompiledRuleset]:
+        """
+        Compiled form of a ruleset, compiling it on first sight.
+
+        A version is immutable (editing requirements creates a new version),
+        so requirements sent for a cached version are not recompiled.
+        Returns None if the version is unknown and no requirements were sent.
+        """
+        key = (ruleset.id, ruleset.version)
+        with self._lock:
+            compiled = self._compiled.get(key)
+            if compiled is not None:
+                self._compiled.move_to_end(key)
+                return compiled
+        if ruleset.requirements is None:
+            return None
+
+        compiled = compile_ruleset(ruleset)
+        with self._lock:
+            self._compiled[key] = compiled
+            while len(self._compiled) > self.max_size:
+                self._compiled.popitem(last=False)
+        return compiled
+
+    def clear(self) -> None:
+        with self._lock:
+            self._compiled.clear()
+
+
+def age_on(date_of_birth: Optional[date], today: date) -> Optional[int]:
+    if date_of_birth is None:
+        return None
+    had_birthday = (today.month, today.day) >= (date_of_birth.month, date_of_birth.day)
+    return today.year - date_of_birth.year - (0 if had_birthday else 1)
+
+
+def _check_document(
+    requirement: CompiledRequirement, document: FighterDocument, today: date
+) -> Tuple[bool, Optional[date], Optional[str]]:
+    """Check one document against a requirement: (fulfilled, expires_at, notes)."""
+    if document.status not in USABLE_STATUSES:
+        if document.status in PENDING_STATUSES:
+            return False, None, "Document pending verification"
+        return False, None, f"Document {document.status}"
+
+    expires_at = document.expiration_date
+    if requirement.max_age is not None and document.issue_date is not None:
+        aged_out = document.issue_date + requirement.max_age
+        expires_at = aged_out if expires_at is None else min(expires_at, aged_out)
+    if expires_at is not None and expires_at <= today:
+        return False, expires_at, EXPIRED_NOTE
+
+    results = {_normalize(k): v for k, v in (document.results or {}).items()}
+    for key, accepted in requirement.tests:
+        value = results.get(key)
+        if value is None or _normalize(value) not in accepted:
+            expected = " or ".join(sorted(accepted))
+            return False, expires_at, f"{key}: {value} (expected {expected})"
+    return True, expires_at, None
+
+
+def evaluate(
+    compiled: CompiledRuleset,
+    documents: List[FighterDocument],
+    today: date,
+    date_of_birth: Optional[date] = None,
+) -> EligibilityResult:
+    """
+    Evaluate a fighter's documents against a compiled ruleset.
+
+    For each applicable requirement the fulfilling document that stays
+    valid longest is used. Status follows the API's eligibility service:
+    ``incomplete`` if a required requirement is unmet (``expired`` if every
+    unmet one is only expired), ``conditional`` if a required document
+    expires within EXPIRING_SOON_DAYS, otherwise ``eligible``.
+    """
+    by_type: Dict[str, List[FighterDocument]] = {}
+    for document in documents:
+        by_type.setdefault(_normalize(document.type), []).append(document)
+
+    age = age_on(date_of_birth, today)
+    soon = today + timedelta(days=EXPIRING_SOON_DAYS)
+    results: List[RequirementResult] = []
+    for requirement in compiled.requirements:
+        if not requirement.applies_to(age):
+            continue
+
+        candidates = [
+            (_check_document(requirement, document, today), document.id)
+            for document in by_type.get(requirement.document_type, ())
+        ]
+        if not candidates:
+            results.append(
+                RequirementResult(
+                    name=requirement.name,
+                    document_type=requirement.document_type,
+                    is_required=requirement.is_required,
+                    is_fulfilled=False,
+                    notes="No document on file",
+                )
+            )
+            continue
+
+        # Fulfilling documents first, then the one valid longest
+        (fulfilled, expires_at, notes), document_id = max(
+            candidates, key=lambda c: (c[0][0], c[0][1] or date.max)
+        )
+        results.append(
+            RequirementResult(
+                name=requirement.name,
+                document_type=requirement.document_type,
+                is_required=requirement.is_required,
+                is_fulfilled=fulfilled,
+                document_id=document_id,
+                expires_at=expires_at,
+                notes=notes,
+            )
+        )
+
+    required = [r for r in results if r.is_required]
+    unmet = [r for r in required if not r.is_fulfilled]
+    expiring_soon = [
+        r
+        for r in results
+        if r.is_fulfilled and r.expires_at is not None and r.expires_at <= soon
+    ]
+    if unmet and all(r.notes == EXPIRED_NOTE for r in unmet):
+        status = "expired"
+    elif unmet:
+        status = "incomplete"
+    elif any(r.is_required for r in expiring_soon):
+        status = "conditional"
+    else:
+        status = "eligible"
+
+    expirations = [r.expires_at for r in required if r.is_fulfilled and r.expires_at]
+    fulfilled_count = sum(1 for r in results if r.is_fulfilled)
+    return EligibilityResult(
+        status=status,
+        overall_score=round(100 * fulfilled_count / len(results)) if results else 0,
+        requirements=results,
+        expiring_soon=expiring_soon,
+        valid_until=min(expirations) if expirations and not unmet else None,
+    )
+
+
+# Global compiled ruleset cache
+compiled_rulesets = RulesetCache()
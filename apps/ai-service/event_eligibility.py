@@ -0,0 +1,284 @@
+"""
+Whole-card eligibility.
+
+An event card is evaluated in one pass: the ruleset is compiled once, the
+date thresholds are computed once, and each fighter is evaluated once
+however many bouts they appear in. The board then keeps a dependency map
+from document to fighter to bout, so a processed document recomputes only
+the fighter who holds it and the bouts that fighter is on.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date
+from threading import Lock
+from typing import Dict, List, Optional, Set
+
+from pydantic import BaseModel
+
+from eligibility import (
+    CompiledRuleset,
+    EligibilityResult,
+    FighterDocument,
+    evaluate,
+)
+
+# Fighter statuses from worst to best; a bout takes the worse of its two
+STATUS_ORDER = (
+    "suspended",
+    "expired",
+    "incomplete",
+    "under_review",
+    "conditional",
+    "eligible",
+)
+
+
+# Models
+class CardBout(BaseModel):
+    id: str
+    fighter_a_id: str
+    fighter_b_id: str
+
+
+class CardFighter(BaseModel):
+    id: str
+    date_of_birth: Optional[date] = None
+    documents: List[FighterDocument] = []
+
+
+class BoutEligibility(BaseModel):
+    bout_id: str
+    fighter_a_id: str
+    fighter_b_id: str
+    status: str
+    fighter_a_status: str
+    fighter_b_status: str
+
+
+class EventEligibility(BaseModel):
+    event_id: str
+    ruleset_id: str
+    ruleset_version: int
+    bouts: List[BoutEligibility]
+    fighters: Dict[str, EligibilityResult]
+
+
+def bout_status(status_a: str, status_b: str) -> str:
+    """The worse of two fighter statuses."""
+    rank = {status: index for index, status in enumerate(STATUS_ORDER)}
+    return min(status_a, status_b, key=lambda s: rank.get(s, 0))
+
+
+@dataclass
+class _Fighter:
+    date_of_birth: Optional[date]
+    documents: Dict[str, FighterDocument]
+    result: Optional[EligibilityResult] = None
+
+
+@dataclass
+class _Card:
+    compiled: CompiledRuleset
+    as_of: Optional[date]
+    bouts: Dict[str, CardBout]
+    fighters: Dict[str, _Fighter]
+    # fighter id -> ids of the bouts they are on
+    fighter_bouts: Dict[str, Set[str]] = field(default_factory=dict)
+
+    def today(self) -> date:
+        return self.as_of or date.today()
+
+    def evaluate_fighter(self, fighter_id: str, today: date) -> EligibilityResult:
+        fighter = self.fighters[fighter_id]
+        fighter.result = evaluate(
+            self.compiled,
+            list(fighter.documents.values()),
+            today,
+            fighter.date_of_birth,
+        )
+        return fighter.result
+
+    def bout(self, bout_id: str) -> BoutEligibility:
+        bout = self.bouts[bout_id]
+        status_a = self.fighters[bout.fighter_a_id].result.status
+        status_b = self.fighters[bout.fighter_b_id].result.status
+        return BoutEligibility(
+            bout_id=bout.id,
+            fighter_a_id=bout.fighter_a_id,
+            fighter_b_id=bout.fighter_b_id,
+            status=bout_status(status_a, status_b),
+            fighter_a_status=status_a,
+            fighter_b_status=status_b,
+        )
+
+
+class EligibilityBoard:
+    """Event cards under evaluation and the document -> fighter -> bout map."""
+
+    def __init__(self):
+        self._cards: Dict[str, _Card] = {}
+        # document id -> fighter id
+        self._document_fighter: Dict[str, str] = {}
+        # document id -> review status last recorded for it
+        self._document_status: Dict[str, str] = {}
+        # fighter id -> ids of the events they are on
+        self._fighter_events: Dict[str, Set[str]] = {}
+        self._lock = Lock()
+
+    def load_card(
+        self,
+        event_id: str,
+        compiled: CompiledRuleset,
+        bouts: List[CardBout],
+        fighters: List[CardFighter],
+        as_of: Optional[date] = None,
+    ) -> EventEligibility:
+        """
+        Evaluate a whole card and keep it for incremental updates.
+
+        Fighters on several bouts are evaluated once. Every fighter on a
+        bout must be listed in ``fighters``; a card loaded again for the
+        same event replaces the previous one.
+        """
+        fighter_ids = {fighter.id for fighter in fighters}
+        for bout in bouts:
+            missing = {bout.fighter_a_id, bout.fighter_b_id} - fighter_ids
+            if missing:
+                raise ValueError(
+                    f"Bout {bout.id} has fighters without records: {sorted(missing)}"
+                )
+
+        card = _Card(
+            compiled=compiled,
+            as_of=as_of,
+            bouts={bout.id: bout for bout in bouts},
+            fighters={
+                fighter.id: _Fighter(
+                    fighter.date_of_birth,
+                    {document.id: document for document in fighter.documents},
+                )
+                for fighter in fighters
+            },
+        )
+        for bout in bouts:
+            card.fighter_bouts.setdefault(bout.fighter_a_id, set()).add(bout.id)
+            card.fighter_bouts.setdefault(bout.fighter_b_id, set()).add(bout.id)
+
+        today = card.today()
+        for fighter_id in card.fighters:
+            card.evaluate_fighter(fighter_id, today)
+
+        with self._lock:
+            self._unlink(event_id)
+            self._cards[event_id] = card
+            for fighter in fighters:
+                self._fighter_events.setdefault(fighter.id, set()).add(event_id)
+                for document in fighter.documents:
+                    self._document_fighter[document.id] = fighter.id
+                    self._document_status[document.id] = document.status
+            return self._snapshot(event_id, card)
+
+    def get_card(self, event_id: str) -> Optional[EventEligibility]:
+        """Current eligibility of a loaded card, or None."""
+        with self._lock:
+            card = self._cards.get(event_id)
+            return self._snapshot(event_id, card) if card is not None else None
+
+    def remove_card(self, event_id: str) -> bool:
+        with self._lock:
+            return self._unlink(event_id)
+
+    def update_document(
+        self, document: FighterDocument, fighter_id: Optional[str] = None
+    ) -> List[BoutEligibility]:
+        """
+        Record a new or changed document and recompute what depends on it.
+
+        Only the fighter holding the document is re-evaluated, on each card
+        they are on, and only their bouts are rebuilt. ``fighter_id`` is
+        needed for documents the board has not seen yet. Returns the
+        recomputed bouts, none if the fighter is on no loaded card.
+
+        Raises ValueError if ``fighter_id`` is not the fighter the board
+        holds the document for.
+        """
+        with self._lock:
+            owner = self._owner(document.id, fighter_id)
+            if owner is None or owner not in self._fighter_events:
+                return []
+            return self._apply(owner, document)
+
+    def document_processed(
+        self, document: FighterDocument, fighter_id: str
+    ) -> List[BoutEligibility]:
+        """
+        Apply a finished extraction and recompute what depends on it.
+
+        Review status is kept from the last status recorded for the
+        document, and a document the board has not seen enters as pending,
+        so an extraction alone never verifies a document. Raises ValueError
+        like ``update_document``.
+        """
+        with self._lock:
+            owner = self._owner(document.id, fighter_id)
+            if owner is None or owner not in self._fighter_events:
+                return []
+            status = self._document_status.get(document.id, "pending")
+            return self._apply(owner, document.model_copy(update={"status": status}))
+
+    def _owner(self, document_id: str, fighter_id: Optional[str]) -> Optional[str]:
+        """Fighter holding a document, checked against the one claimed for it."""
+        owner = self._document_fighter.get(document_id)
+        if owner is None:
+            return fighter_id
+        if fighter_id is not None and fighter_id != owner:
+            raise ValueError(
+                f"Document {document_id} belongs to fighter {owner}, not {fighter_id}"
+            )
+        return owner
+
+    def _apply(self, owner: str, document: FighterDocument) -> List[BoutEligibility]:
+        """Store a document on every card of its owner and rebuild their bouts."""
+        self._document_fighter[document.id] = owner
+        self._document_status[document.id] = document.status
+        updated = []
+        for event_id in sorted(self._fighter_events[owner]):
+            card = self._cards[event_id]
+            card.fighters[owner].documents[document.id] = document
+            card.evaluate_fighter(owner, card.today())
+            for bout_id in sorted(card.fighter_bouts.get(owner, ())):
+                updated.append(card.bout(bout_id))
+        return updated
+
+    def _unlink(self, event_id: str) -> bool:
+        """Drop a card and its entries from the dependency map."""
+        card = self._cards.pop(event_id, None)
+        if card is None:
+            return False
+        for fighter_id, fighter in card.fighters.items():
+            events = self._fighter_events.get(fighter_id, set())
+            events.discard(event_id)
+            if events:
+                continue
+            self._fighter_events.pop(fighter_id, None)
+            for document_id in fighter.documents:
+                self._document_fighter.pop(document_id, None)
+                self._document_status.pop(document_id, None)
+        return True
+
+    @staticmethod
+    def _snapshot(event_id: str, card: _Card) -> EventEligibility:
+        return EventEligibility(
+            event_id=event_id,
+            ruleset_id=card.compiled.ruleset_id,
+            ruleset_version=card.compiled.version,
+            bouts=[card.bout(bout_id) for bout_id in card.bouts],
+            fighters={
+                fighter_id: fighter.result
+                for fighter_id, fighter in card.fighters.items()
+            },
+        )
+
+
+# Global eligibility board
+eligibility_board = EligibilityBoard()
@@ -6,6 +6,21 @@ from datetime import datetime, date
 import os
 from dotenv import load_dotenv
 
+from eligibility import (
+    EligibilityResult,
+    FighterDocument,
+    RulesetPayload,
+    compiled_rulesets,
+    evaluate,
+)
+from event_eligibility import (
+    BoutEligibility,
+    CardBout,
+    CardFighter,
+    EventEligibility,
+    eligibility_board,
+)
+
 load_dotenv()
 
 app = FastAPI(
@@ -63,6 +78,44 @@ class ProcessDocumentRequest(BaseModel):
     expected_type: Optional[str] = None
 
 
+class EligibilityRequest(BaseModel):
+    fighter_id: str
+    commission_id: str
+    discipline: str
+    ruleset: RulesetPayload
+    documents: List[FighterDocument] = []
+    date_of_birth: Optional[date] = None
+    as_of: Optional[date] = None
+
+
+class EligibilityResponse(EligibilityResult):
+    fighter_id: str
+    commission_id: str
+    discipline: str
+    ruleset_id: str
+    ruleset_version: int
+    calculated_at: datetime
+
+
+class EventEligibilityRequest(BaseModel):
+    commission_id: str
+    discipline: str
+    ruleset: RulesetPayload
+    bouts: List[CardBout]
+    fighters: List[CardFighter]
+    as_of: Optional[date] = None
+
+
+class DocumentUpdateRequest(BaseModel):
+    fighter_id: Optional[str] = None
+    document: FighterDocument
+
+
+class DocumentUpdateResponse(BaseModel):
+    document_id: str
+    bouts: List[BoutEligibility]
+
+
 class HealthCheckResponse(BaseModel):
     status: str
     version: str
@@ -117,6 +170,22 @@ async def analyze_document(request: ProcessDocumentRequest):
         requires_review=False,
     )
 
+    # Recompute the fighter's bouts on any loaded event card
+    extracted = mock_result.extracted_data
+    try:
+        eligibility_board.document_processed(
+            FighterDocument(
+                id=request.document_id,
+                type=mock_result.classification,
+                issue_date=extracted.issue_date,
+                expiration_date=extracted.expiration_date,
+                results=extracted.results,
+            ),
+            request.fighter_id,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
     return mock_result
 
 
@@ -202,27 +271,92 @@ async def validate_document(request: ProcessDocumentRequest):
     }
 
 
-@app.post("/api/v1/eligibility/calculate")
-async def calculate_eligibility(
-    fighter_id: str,
-    commission_id: str,
-    discipline: str,
-    documents: List[Dict[str, Any]],
-):
+def _compile(ruleset: RulesetPayload):
+    """Compiled form of a request's ruleset, or 409 if it must be sent in full."""
+    compiled = compiled_rulesets.get(ruleset)
+    if compiled is None:
+        raise HTTPException(
+            status_code=409,
+            detail=(
+                f"Ruleset {ruleset.id} version {ruleset.version} "
+                "is not compiled; include its requirements"
+            ),
+        )
+    return compiled
+
+
+@app.post("/api/v1/eligibility/calculate", response_model=EligibilityResponse)
+async def calculate_eligibility(request: EligibilityRequest):
     """
     Calculate fighter eligibility based on documents and ruleset.
     Returns detailed eligibility breakdown.
+
+    The ruleset is compiled on first use and cached by id and version, so
+    repeat checks (every roster view) may omit its requirements.
     """
-    # TODO: Implement eligibility calculation
-    return {
-        "fighter_id": fighter_id,
-        "commission_id": commission_id,
-        "discipline": discipline,
-        "status": "eligible",
-        "requirements": [],
-        "expiring_soon": [],
-        "calculated_at": datetime.now().isoformat(),
-    }
+    compiled = _compile(request.ruleset)
+    result = evaluate(
+        compiled,
+        request.documents,
+        today=request.as_of or date.today(),
+        date_of_birth=request.date_of_birth,
+    )
+    return EligibilityResponse(
+        **result.model_dump(),
+        fighter_id=request.fighter_id,
+        commission_id=request.commission_id,
+        discipline=request.discipline,
+        ruleset_id=compiled.ruleset_id,
+        ruleset_version=compiled.version,
+        calculated_at=datetime.now(),
+    )
+
+
+@app.post("/api/v1/eligibility/events/{event_id}", response_model=EventEligibility)
+async def calculate_event_eligibility(event_id: str, request: EventEligibilityRequest):
+    """
+    Calculate eligibility for every fighter on every bout of an event card.
+    The card is kept so processed documents recompute only their fighter's bouts.
+    """
+    compiled = _compile(request.ruleset)
+    try:
+        return eligibility_board.load_card(
+            event_id, compiled, request.bouts, request.fighters, request.as_of
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+@app.get("/api/v1/eligibility/events/{event_id}", response_model=EventEligibility)
+async def get_event_eligibility(event_id: str):
+    """Current eligibility of a loaded event card."""
+    card = eligibility_board.get_card(event_id)
+    if card is None:
+        raise HTTPException(status_code=404, detail=f"Event {event_id} is not loaded")
+    return card
+
+
+@app.delete("/api/v1/eligibility/events/{event_id}")
+async def remove_event_eligibility(event_id: str):
+    """Stop tracking an event card."""
+    if not eligibility_board.remove_card(event_id):
+        raise HTTPException(status_code=404, detail=f"Event {event_id} is not loaded")
+    return {"event_id": event_id, "removed": True}
+
+
+@app.post("/api/v1/eligibility/documents", response_model=DocumentUpdateResponse)
+async def update_eligibility_document(request: DocumentUpdateRequest):
+    """
+    Record a document change (review, new upload, new dates) and recompute
+    only the bouts of the fighter who holds it.
+    """
+    try:
+        bouts = eligibility_board.update_document(
+            request.document, request.fighter_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return DocumentUpdateResponse(document_id=request.document.id, bouts=bouts)
 
 
 if __name__ == "__main__":
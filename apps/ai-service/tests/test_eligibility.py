@@ -0,0 +1,228 @@
+"""Tests for ruleset compilation and fighter eligibility."""
+
+from datetime import date
+
+from fastapi.testclient import TestClient
+
+from eligibility import (
+    FighterDocument,
+    RulesetCache,
+    RulesetPayload,
+    compile_ruleset,
+    evaluate,
+)
+from main import app
+
+TODAY = date(2025, 6, 1)
+
+client = TestClient(app)
+
+
+def ruleset(*requirements, ruleset_id="ruleset-1", version=1):
+    return RulesetPayload.model_validate(
+        {"id": ruleset_id, "version": version, "requirements": list(requirements)}
+    )
+
+
+def requirement(document_type="blood_test", **extra):
+    return {"name": document_type, "documentType": document_type, **extra}
+
+
+def document(document_id="doc-1", document_type="blood_test", **extra):
+    return FighterDocument(
+        **{"id": document_id, "type": document_type, "status": "verified", **extra}
+    )
+
+
+def test_compile_normalizes_requirements():
+    """Test that types, test keys and accepted values are normalized."""
+    compiled = compile_ruleset(
+        ruleset(
+            requirement(
+                "Blood Test",
+                expirationDays=30,
+                tests={"HIV": ["Negative", "Non Reactive"]},
+            )
+        )
+    )
+
+    (compiled_requirement,) = compiled.requirements
+    assert compiled_requirement.document_type == "blood_test"
+    assert compiled_requirement.max_age.days == 30
+    assert compiled_requirement.tests == (
+        ("hiv", frozenset({"negative", "non_reactive"})),
+    )
+
+
+def test_age_conditions_are_coerced_to_int():
+    """Test that numeric strings in JSON conditions compile to int bounds."""
+    compiled = compile_ruleset(
+        ruleset(requirement(condition='{"ageOver": "34", "ageUnder": 60}'))
+    )
+
+    (compiled_requirement,) = compiled.requirements
+    assert compiled_requirement.age_over == 34
+    assert compiled_requirement.age_under == 60
+
+
+def test_unparseable_age_conditions_are_dropped():
+    """Test that a bad age bound is ignored instead of failing evaluation."""
+    compiled = compile_ruleset(
+        ruleset(requirement(condition={"ageOver": "thirty", "ageUnder": None}))
+    )
+
+    (compiled_requirement,) = compiled.requirements
+    assert compiled_requirement.age_over is None
+    assert compiled_requirement.age_under is None
+    result = evaluate(compiled, [document()], TODAY, date(1990, 1, 1))
+    assert result.status == "eligible"
+
+
+def test_age_conditions_select_requirements():
+    """Test that requirements apply only to fighters inside their age range."""
+    compiled = compile_ruleset(
+        ruleset(
+            requirement("blood_test"),
+            requirement("eye_exam", condition={"ageOver": 35}),
+        )
+    )
+
+    young = evaluate(compiled, [document()], TODAY, date(2000, 1, 1))
+    old = evaluate(compiled, [document()], TODAY, date(1980, 1, 1))
+    unknown = evaluate(compiled, [document()], TODAY)
+
+    assert [r.name for r in young.requirements] == ["blood_test"]
+    assert young.status == "eligible"
+    assert [r.name for r in old.requirements] == ["blood_test", "eye_exam"]
+    assert old.status == "incomplete"
+    assert len(unknown.requirements) == 2
+
+
+def test_cache_reuses_compiled_version():
+    """Test that a cached version is served without its requirements."""
+    cache = RulesetCache()
+    compiled = cache.get(ruleset(requirement()))
+
+    assert cache.get(RulesetPayload(id="ruleset-1", version=1)) is compiled
+    assert cache.get(RulesetPayload(id="ruleset-1", version=2)) is None
+
+
+def test_cache_evicts_least_recently_used():
+    """Test that the cache keeps at most max_size rulesets."""
+    cache = RulesetCache(max_size=2)
+    cache.get(ruleset(requirement(), ruleset_id="a"))
+    cache.get(ruleset(requirement(), ruleset_id="b"))
+    cache.get(RulesetPayload(id="a"))
+    cache.get(ruleset(requirement(), ruleset_id="c"))
+
+    assert cache.get(RulesetPayload(id="a")) is not None
+    assert cache.get(RulesetPayload(id="b")) is None
+
+
+def test_result_tests_must_match():
+    """Test that result values are compared after normalization."""
+    compiled = compile_ruleset(
+        ruleset(requirement(tests={"hiv": "negative", "hepatitis_b": "negative"}))
+    )
+
+    passing = evaluate(
+        compiled,
+        [document(results={"HIV": "Negative", "Hepatitis B": "negative"})],
+        TODAY,
+    )
+    failing = evaluate(
+        compiled,
+        [document(results={"hiv": "positive", "hepatitis_b": "negative"})],
+        TODAY,
+    )
+
+    assert passing.status == "eligible"
+    assert failing.status == "incomplete"
+    assert failing.requirements[0].notes == "hiv: positive (expected negative)"
+
+
+def test_max_age_and_expiration_date_use_the_earlier():
+    """Test that a document expires at the earlier of its two limits."""
+    compiled = compile_ruleset(ruleset(requirement(expirationDays=180)))
+
+    aged = evaluate(
+        compiled,
+        [document(issue_date=date(2025, 1, 1), expiration_date=date(2026, 1, 1))],
+        TODAY,
+    )
+    dated = evaluate(
+        compiled,
+        [document(issue_date=date(2025, 5, 1), expiration_date=date(2025, 9, 1))],
+        TODAY,
+    )
+
+    assert aged.requirements[0].expires_at == date(2025, 6, 30)
+    assert dated.requirements[0].expires_at == date(2025, 9, 1)
+
+
+def test_statuses():
+    """Test the expired, incomplete, conditional and eligible statuses."""
+    compiled = compile_ruleset(
+        ruleset(requirement("blood_test"), requirement("license"))
+    )
+    license_document = document("doc-2", "license")
+
+    expired = evaluate(
+        compiled,
+        [document(expiration_date=date(2025, 5, 1)), license_document],
+        TODAY,
+    )
+    incomplete = evaluate(compiled, [document(status="pending")], TODAY)
+    conditional = evaluate(
+        compiled,
+        [document(expiration_date=date(2025, 6, 15)), license_document],
+        TODAY,
+    )
+    eligible = evaluate(compiled, [document(), license_document], TODAY)
+
+    assert expired.status == "expired"
+    assert incomplete.status == "incomplete"
+    assert conditional.status == "conditional"
+    assert conditional.valid_until == date(2025, 6, 15)
+    assert eligible.status == "eligible"
+    assert eligible.overall_score == 100
+
+
+def test_calculate_compiles_then_serves_from_cache():
+    """Test that the endpoint accepts a cached ruleset without requirements."""
+    payload = {
+        "fighter_id": "fighter-1",
+        "commission_id": "commission-1",
+        "discipline": "mma",
+        "documents": [document().model_dump(mode="json")],
+        "as_of": TODAY.isoformat(),
+    }
+    full = {"id": "api-ruleset", "version": 1, "requirements": [requirement()]}
+
+    first = client.post(
+        "/api/v1/eligibility/calculate", json={**payload, "ruleset": full}
+    )
+    cached = client.post(
+        "/api/v1/eligibility/calculate",
+        json={**payload, "ruleset": {"id": "api-ruleset", "version": 1}},
+    )
+
+    assert first.status_code == 200
+    assert cached.status_code == 200
+    assert cached.json()["status"] == "eligible"
+    assert cached.json()["ruleset_version"] == 1
+
+
+def test_calculate_unknown_ruleset_without_requirements_is_409():
+    """Test that an uncompiled ruleset sent without requirements is rejected."""
+    response = client.post(
+        "/api/v1/eligibility/calculate",
+        json={
+            "fighter_id": "fighter-1",
+            "commission_id": "commission-1",
+            "discipline": "mma",
+            "ruleset": {"id": "never-sent", "version": 3},
+        },
+    )
+
+    assert response.status_code == 409
@@ -0,0 +1,186 @@
+"""Tests for whole-card eligibility and incremental recomputation."""
+
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+
+from eligibility import FighterDocument, RulesetPayload, compile_ruleset
+from event_eligibility import CardBout, CardFighter, EligibilityBoard
+from main import app
+
+TODAY = date(2025, 6, 1)
+
+COMPILED = compile_ruleset(
+    RulesetPayload.model_validate(
+        {
+            "id": "card-ruleset",
+            "requirements": [{"name": "blood_test", "documentType": "blood_test"}],
+        }
+    )
+)
+
+client = TestClient(app)
+
+
+def blood_test(document_id, status="verified"):
+    return FighterDocument(id=document_id, type="blood_test", status=status)
+
+
+def fighter(fighter_id, *documents):
+    return CardFighter(id=fighter_id, documents=list(documents))
+
+
+def load(board, event_id="event-1"):
+    """Load a card where fighter a fights on both bouts."""
+    return board.load_card(
+        event_id,
+        COMPILED,
+        [
+            CardBout(id="bout-1", fighter_a_id="a", fighter_b_id="b"),
+            CardBout(id="bout-2", fighter_a_id="a", fighter_b_id="c"),
+            CardBout(id="bout-3", fighter_a_id="d", fighter_b_id="e"),
+        ],
+        [
+            fighter("a", blood_test("doc-a", status="pending")),
+            fighter("b", blood_test("doc-b")),
+            fighter("c", blood_test("doc-c")),
+            fighter("d", blood_test("doc-d")),
+            fighter("e", blood_test("doc-e")),
+        ],
+        as_of=TODAY,
+    )
+
+
+def test_load_card_takes_the_worse_status_per_bout():
+    """Test that each bout reports the worse of its fighters' statuses."""
+    card = load(EligibilityBoard())
+
+    statuses = {bout.bout_id: bout.status for bout in card.bouts}
+    assert statuses == {
+        "bout-1": "incomplete",
+        "bout-2": "incomplete",
+        "bout-3": "eligible",
+    }
+    assert card.fighters["b"].status == "eligible"
+    assert card.ruleset_id == "card-ruleset"
+
+
+def test_load_card_requires_every_bout_fighter():
+    """Test that a bout referencing an unlisted fighter is rejected."""
+    board = EligibilityBoard()
+
+    with pytest.raises(ValueError, match="bout-1"):
+        board.load_card(
+            "event-1",
+            COMPILED,
+            [CardBout(id="bout-1", fighter_a_id="a", fighter_b_id="z")],
+            [fighter("a")],
+        )
+    assert board.get_card("event-1") is None
+
+
+def test_missing_fighter_is_422():
+    """Test that the endpoint maps a card with unknown fighters to 422."""
+    response = client.post(
+        "/api/v1/eligibility/events/event-422",
+        json={
+            "commission_id": "commission-1",
+            "discipline": "mma",
+            "ruleset": {
+                "id": "card-ruleset-422",
+                "requirements": [{"name": "id", "documentType": "photo_id"}],
+            },
+            "bouts": [{"id": "bout-1", "fighter_a_id": "a", "fighter_b_id": "z"}],
+            "fighters": [{"id": "a"}],
+        },
+    )
+
+    assert response.status_code == 422
+
+
+def test_update_recomputes_only_the_owners_bouts():
+    """Test that a reviewed document rebuilds only its fighter's bouts."""
+    board = EligibilityBoard()
+    load(board)
+
+    updated = board.update_document(blood_test("doc-a"))
+
+    assert [bout.bout_id for bout in updated] == ["bout-1", "bout-2"]
+    assert all(bout.status == "eligible" for bout in updated)
+    assert board.get_card("event-1").fighters["a"].status == "eligible"
+
+
+def test_update_with_conflicting_fighter_is_rejected():
+    """Test that a known document cannot be claimed by another fighter."""
+    board = EligibilityBoard()
+    load(board)
+
+    with pytest.raises(ValueError, match="doc-a"):
+        board.update_document(blood_test("doc-a"), fighter_id="b")
+
+
+def test_update_with_conflicting_fighter_is_409():
+    """Test that the endpoint maps a conflicting fighter_id to 409."""
+    load_response = client.post(
+        "/api/v1/eligibility/events/event-409",
+        json={
+            "commission_id": "commission-1",
+            "discipline": "mma",
+            "ruleset": {
+                "id": "card-ruleset-409",
+                "requirements": [{"name": "id", "documentType": "photo_id"}],
+            },
+            "bouts": [{"id": "bout-1", "fighter_a_id": "a", "fighter_b_id": "b"}],
+            "fighters": [
+                {"id": "a", "documents": [{"id": "doc-409", "type": "photo_id"}]},
+                {"id": "b"},
+            ],
+        },
+    )
+    response = client.post(
+        "/api/v1/eligibility/documents",
+        json={"fighter_id": "b", "document": {"id": "doc-409", "type": "photo_id"}},
+    )
+
+    assert load_response.status_code == 200
+    assert response.status_code == 409
+
+
+def test_processed_document_keeps_its_review_status():
+    """Test that an extraction neither verifies nor unverifies a document."""
+    board = EligibilityBoard()
+    load(board)
+
+    pending = board.document_processed(blood_test("doc-a"), "a")
+    verified = board.document_processed(blood_test("doc-b", status="pending"), "b")
+    new = board.document_processed(blood_test("doc-new"), "c")
+
+    assert pending[0].fighter_a_status == "incomplete"
+    assert verified[0].fighter_b_status == "eligible"
+    assert new[0].fighter_b_status == "eligible"
+    card = board.get_card("event-1")
+    assert card.fighters["c"].requirements[0].document_id == "doc-c"
+
+
+def test_unlink_keeps_fighters_still_on_another_card():
+    """Test that removing a card only drops entries no other card needs."""
+    board = EligibilityBoard()
+    load(board, "event-1")
+    board.load_card(
+        "event-2",
+        COMPILED,
+        [CardBout(id="bout-9", fighter_a_id="a", fighter_b_id="f")],
+        [fighter("a", blood_test("doc-a", status="pending")), fighter("f")],
+        as_of=TODAY,
+    )
+
+    assert board.remove_card("event-1")
+    assert not board.remove_card("event-1")
+
+    assert board.update_document(blood_test("doc-b")) == []
+    updated = board.update_document(blood_test("doc-a"))
+    assert [bout.bout_id for bout in updated] == ["bout-9"]
+
+    assert board.remove_card("event-2")
+    assert board.update_document(blood_test("doc-a")) == []
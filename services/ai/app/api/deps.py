@@ -8,6 +8,7 @@ from fastapi import Header, Request
 from app.core.logging import request_id_var
 from app.services.classifier import classifier
 from app.services.extractor import extractor
+from app.services.jobs import job_manager
 from app.services.openai_client import ai_client
 from app.services.textract import textract_service
 
@@ -48,3 +49,8 @@ def get_classifier():
 def get_extractor():
     """Get data extractor instance."""
     return extractor
+
+
+def get_job_manager():
+    """Get document processing job manager instance."""
+    return job_manager
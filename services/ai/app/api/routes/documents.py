@@ -1,21 +1,38 @@
 """Document processing endpoints."""
 
-import uuid
-from datetime import datetime
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Annotated
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 
+from app.api.deps import get_job_manager
+from app.config import settings
+from app.core.exceptions import JobQueueFullError
 from app.core.logging import get_logger
 from app.models.document import (
+    BatchProcessRequest,
+    BatchProcessResponse,
+    BatchStatusResponse,
     DocumentProcessRequest,
     DocumentProcessResponse,
     DocumentStatusResponse,
     ProcessingStatus,
 )
+from app.services.jobs import JobManager
 
 router = APIRouter(prefix="/api/v1/documents", tags=["documents"])
 logger = get_logger(__name__)
 
+# Maximum documents a single event stream may follow
+MAX_STREAM_DOCUMENTS = 500
+
+# Seconds between keep-alive comments on an idle event stream
+STREAM_KEEPALIVE_SECONDS = 15.0
+
+TERMINAL_STATUSES = (ProcessingStatus.COMPLETED, ProcessingStatus.FAILED)
+
 
 @router.post(
     "/process",
@@ -24,21 +41,25 @@ logger = get_logger(__name__)
     summary="Process a document",
     description="Initiates processing of a document from S3",
 )
-async def process_document(request: DocumentProcessRequest) -> DocumentProcessResponse:
+async def process_document(
+    request: DocumentProcessRequest,
+    jobs: Annotated[JobManager, Depends(get_job_manager)],
+) -> DocumentProcessResponse:
     """
     Process a document from S3.
 
-    This endpoint accepts a document ID and S3 key, then initiates
+    This endpoint accepts a document ID and S3 key, then queues
     OCR processing, classification, and data extraction.
 
     Args:
         request: Document processing request with document_id and s3_key
+        jobs: Job manager that runs the processing pipeline
 
     Returns:
         Processing job information with job_id and status
 
     Raises:
-        HTTPException: If the document cannot be processed
+        HTTPException: If the processing queue is full
     """
     logger.info(
         "Document processing requested",
@@ -49,24 +70,121 @@ async def process_document(request: DocumentProcessRequest) -> DocumentProcessRe
         },
     )
 
-    # TODO: Implement actual document processing
-    # 1. Validate document exists in S3
-    # 2. Check document size and format
-    # 3. Queue processing job
-    # 4. Return job ID
-
-    # Stub implementation
-    job_id = str(uuid.uuid4())
+    try:
+        job = await jobs.submit(request)
+    except JobQueueFullError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=e.message,
+            headers={"Retry-After": "5"},
+        ) from e
 
     return DocumentProcessResponse(
-        job_id=job_id,
-        document_id=request.document_id,
-        status=ProcessingStatus.PENDING,
-        message="Document processing queued (stub implementation)",
-        created_at=datetime.utcnow(),
+        job_id=job.job_id,
+        document_id=job.document_id,
+        status=job.status,
+        message="Document processing queued",
+        created_at=job.created_at,
+    )
+
+
+@router.post(
+    "/batch",
+    response_model=BatchProcessResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Process a batch of documents",
+    description="Queues many documents from S3 in one call",
+)
+async def process_document_batch(
+    request: BatchProcessRequest,
+    jobs: Annotated[JobManager, Depends(get_job_manager)],
+) -> BatchProcessResponse:
+    """
+    Queue a batch of documents for processing.
+
+    Documents repeated within the batch, and documents that already have a
+    queued or running job, are reported rather than queued again.
+
+    Args:
+        request: Documents to process
+        jobs: Job manager that runs the processing pipeline
+
+    Returns:
+        Batch ID and the job ID of each document
+
+    Raises:
+        HTTPException: If the batch is empty or too large, or the queue is full
+    """
+    document_count = len(request.documents)
+    if not 1 <= document_count <= settings.job_batch_max_documents:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                f"A batch must contain between 1 and "
+                f"{settings.job_batch_max_documents} documents"
+            ),
+        )
+
+    logger.info(
+        "Document batch processing requested",
+        extra={"document_count": document_count},
+    )
+
+    try:
+        submission = await jobs.submit_batch(request.documents)
+    except JobQueueFullError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=e.message,
+            headers={"Retry-After": "30"},
+        ) from e
+
+    return BatchProcessResponse(
+        batch_id=submission.batch_id,
+        accepted=len(submission.jobs),
+        jobs={job.document_id: job.job_id for job in submission.jobs},
+        existing_jobs={
+            document_id: job.job_id
+            for document_id, job in submission.existing.items()
+        },
+        duplicates=submission.duplicates,
+        message="Document batch queued",
     )
 
 
+@router.get(
+    "/batch/{batch_id}",
+    response_model=BatchStatusResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get batch processing status",
+    description="Retrieves aggregate progress of a document batch",
+)
+async def get_batch_status(
+    batch_id: str,
+    jobs: Annotated[JobManager, Depends(get_job_manager)],
+) -> BatchStatusResponse:
+    """
+    Get the aggregate processing status of a batch.
+
+    Args:
+        batch_id: Batch identifier returned by the batch endpoint
+        jobs: Job manager tracking processing jobs
+
+    Returns:
+        Job counts by status and mean progress
+
+    Raises:
+        HTTPException: If the batch is not found
+    """
+    batch = await jobs.get_batch(batch_id)
+    if batch is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Batch not found: {batch_id}",
+        )
+    return batch
+
+
 @router.get(
     "/{document_id}/status",
     response_model=DocumentStatusResponse,
@@ -74,12 +192,16 @@ async def process_document(request: DocumentProcessRequest) -> DocumentProcessRe
     summary="Get document processing status",
     description="Retrieves the current processing status of a document",
 )
-async def get_document_status(document_id: str) -> DocumentStatusResponse:
+async def get_document_status(
+    document_id: str,
+    jobs: Annotated[JobManager, Depends(get_job_manager)],
+) -> DocumentStatusResponse:
     """
     Get the processing status of a document.
 
     Args:
         document_id: Unique identifier of the document
+        jobs: Job manager tracking processing jobs
 
     Returns:
         Current processing status and progress
@@ -89,26 +211,87 @@ async def get_document_status(document_id: str) -> DocumentStatusResponse:
     """
     logger.info("Document status requested", extra={"document_id": document_id})
 
-    # TODO: Implement actual status retrieval
-    # 1. Query processing job status from database/cache
-    # 2. Return current status and progress
-    # 3. Include any error messages
-
-    # Stub implementation - simulate document not found for demonstration
-    if document_id.startswith("invalid"):
+    job = await jobs.get_status(document_id)
+    if job is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Document not found: {document_id}",
         )
 
-    return DocumentStatusResponse(
-        document_id=document_id,
-        status=ProcessingStatus.PENDING,
-        progress=0,
-        document_type=None,
-        extraction_complete=False,
-        error_message=None,
-        started_at=None,
-        completed_at=None,
-        metadata={"note": "Stub implementation"},
+    return job.to_status_response()
+
+
+def _format_event(event: DocumentStatusResponse) -> str:
+    """Render a status snapshot as a server-sent event."""
+    name = event.stage.value if event.stage else event.status.value
+    return f"event: {name}\ndata: {event.model_dump_json()}\n\n"
+
+
+@router.get(
+    "/events",
+    status_code=status.HTTP_200_OK,
+    summary="Stream document processing events",
+    description=(
+        "Server-sent event stream of stage transitions and progress for one "
+        "or more documents; closes once every document has finished"
+    ),
+    response_class=StreamingResponse,
+)
+async def stream_document_events(
+    jobs: Annotated[JobManager, Depends(get_job_manager)],
+    document_id: Annotated[list[str] | None, Query()] = None,
+) -> StreamingResponse:
+    """
+    Stream processing status events for documents.
+
+    The current status of each document is sent first, followed by every
+    subsequent stage transition. Documents without a job yet are followed
+    until one is submitted.
+
+    Args:
+        jobs: Job manager publishing stage transitions
+        document_id: Documents to follow (repeat the parameter for several)
+
+    Returns:
+        ``text/event-stream`` response
+
+    Raises:
+        HTTPException: If no documents, or too many, are requested
+    """
+    document_ids = list(dict.fromkeys(document_id or []))
+    if not document_ids or len(document_ids) > MAX_STREAM_DOCUMENTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Follow between 1 and {MAX_STREAM_DOCUMENTS} documents",
+        )
+    logger.info(
+        "Document event stream opened", extra={"document_count": len(document_ids)}
+    )
+
+    async def event_stream() -> AsyncIterator[str]:
+        # Subscribe before reading snapshots so no transition is missed
+        with jobs.events.subscribe(document_ids) as subscription:
+            pending = set(document_ids)
+            for doc_id in document_ids:
+                job = await jobs.get_status(doc_id)
+                if job is not None:
+                    yield _format_event(job.to_status_response())
+                    if job.finished:
+                        pending.discard(doc_id)
+
+            while pending:
+                try:
+                    async with asyncio.timeout(STREAM_KEEPALIVE_SECONDS):
+                        event = await subscription.get()
+                except TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield _format_event(event)
+                if event.status in TERMINAL_STATUSES:
+                    pending.discard(event.document_id)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
@@ -1,20 +1,35 @@
 """Data extraction and classification endpoints."""
 
+import asyncio
+import json
+import time
+from collections.abc import AsyncIterator
 from datetime import datetime
+from typing import Any
 
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
 
+from app.core.exceptions import AIServiceException, DocumentNotFoundException
 from app.core.logging import get_logger
+from app.core.singleflight import SingleFlight
 from app.models.document import ClassificationResult, DocumentType
 from app.models.extraction import (
     ClassificationRequest,
+    ExtractedField,
     ExtractionRequest,
     ExtractionResponse,
 )
+from app.services.classifier import classifier
+from app.services.extractor import extractor
 
 router = APIRouter(prefix="/api/v1/extract", tags=["extraction"])
 logger = get_logger(__name__)
 
+# Concurrent identical classify/extract requests (e.g. the web app and the
+# API both reacting to the same upload) share one OCR + LLM computation
+in_flight = SingleFlight("extraction")
+
 
 @router.post(
     "/classify",
@@ -28,7 +43,8 @@ async def classify_document(request: ClassificationRequest) -> ClassificationRes
     Classify a document type.
 
     Uses AI to analyze the document and determine its type
-    (e.g., medical clearance, photo ID, weigh-in record).
+    (e.g., medical clearance, photo ID, weigh-in record). Identical
+    requests arriving while one is in flight share its result.
 
     Args:
         request: Classification request with document_id
@@ -41,22 +57,40 @@ async def classify_document(request: ClassificationRequest) -> ClassificationRes
     """
     logger.info(
         "Document classification requested",
-        extra={"document_id": request.document_id, "s3_key": request.s3_key},
+        extra={
+            "document_id": request.document_id,
+            "s3_key": request.s3_key,
+            "force_reprocess": request.force_reprocess,
+        },
     )
 
-    # TODO: Implement actual classification
-    # 1. Retrieve document from S3 or cache
-    # 2. Extract text using Textract
-    # 3. Use OpenAI/Anthropic to classify document type
-    # 4. Return classification with confidence score
-
-    # Stub implementation
-    return ClassificationResult(
-        document_type=DocumentType.UNKNOWN,
-        confidence=0.0,
-        alternative_types=[],
-        reasoning="Stub implementation - actual classification not yet implemented",
+    if not request.s3_key:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="s3_key is required to classify a document.",
+        )
+    s3_key = request.s3_key
+
+    key = (
+        "classify",
+        request.document_id,
+        s3_key,
+        None,
+        request.force_reprocess,
     )
+    try:
+        return await in_flight.do(
+            key,
+            lambda: classifier.classify(
+                request.document_id,
+                s3_key,
+                force_reprocess=request.force_reprocess,
+            ),
+        )
+    except DocumentNotFoundException as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=e.message
+        ) from e
 
 
 @router.post(
@@ -71,7 +105,8 @@ async def extract_data(request: ExtractionRequest) -> ExtractionResponse:
     Extract structured data from a document.
 
     Based on the document type, extracts relevant fields
-    (e.g., names, dates, license numbers).
+    (e.g., names, dates, license numbers). Identical requests arriving
+    while one is in flight share its result.
 
     Args:
         request: Extraction request with document_id and document_type
@@ -91,27 +126,152 @@ async def extract_data(request: ExtractionRequest) -> ExtractionResponse:
         },
     )
 
-    # TODO: Implement actual data extraction
-    # 1. Retrieve document and OCR text
-    # 2. Use document-type-specific extraction logic
-    # 3. Validate extracted data
-    # 4. Return structured data with confidence scores
+    s3_key = _validate_extraction_request(request)
+
+    started = time.perf_counter()
+    key = (
+        "extract",
+        request.document_id,
+        s3_key,
+        request.document_type,
+        request.force_reprocess,
+    )
+    try:
+        extracted_data, extracted_fields, raw_text = await in_flight.do(
+            key,
+            lambda: extractor.extract(
+                request.document_id,
+                s3_key,
+                request.document_type,
+                force_reprocess=request.force_reprocess,
+            ),
+        )
+    except DocumentNotFoundException as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=e.message
+        ) from e
+
+    return _extraction_response(
+        request, extracted_data, extracted_fields, raw_text, started
+    )
+
+
+@router.post(
+    "/data/stream",
+    status_code=status.HTTP_200_OK,
+    summary="Stream structured data extraction",
+    description=(
+        "Extracts structured data as server-sent events: a `field` event per "
+        "field as soon as it is known, then a `result` event with the full "
+        "extraction (or an `error` event)"
+    ),
+    response_class=StreamingResponse,
+)
+async def stream_extract_data(request: ExtractionRequest) -> StreamingResponse:
+    """
+    Extract structured data, streaming fields as they become available.
+
+    Rule-extracted fields are sent immediately; AI-extracted fields follow
+    one by one while the completion is still being generated, so reviewers
+    see the first values long before the full response is ready.
+
+    Args:
+        request: Extraction request with document_id and document_type
+
+    Returns:
+        Event stream of extracted fields and the final extraction
+
+    Raises:
+        HTTPException: If the request cannot be extracted
+    """
+    logger.info(
+        "Streaming data extraction requested",
+        extra={
+            "document_id": request.document_id,
+            "document_type": request.document_type,
+            "force_reprocess": request.force_reprocess,
+        },
+    )
+    s3_key = _validate_extraction_request(request)
+
+    async def event_stream() -> AsyncIterator[str]:
+        started = time.perf_counter()
+        fields: asyncio.Queue[ExtractedField | None] = asyncio.Queue()
+        task = asyncio.create_task(
+            extractor.extract(
+                request.document_id,
+                s3_key,
+                request.document_type,
+                force_reprocess=request.force_reprocess,
+                on_field=fields.put_nowait,
+            )
+        )
+        task.add_done_callback(lambda _: fields.put_nowait(None))
+        try:
+            while (field := await fields.get()) is not None:
+                yield _format_event("field", field.model_dump_json())
+            try:
+                extracted_data, extracted_fields, raw_text = task.result()
+            except AIServiceException as e:
+                error = {"error": e.__class__.__name__, "message": e.message}
+                yield _format_event("error", json.dumps(error))
+                return
+            response = _extraction_response(
+                request, extracted_data, extracted_fields, raw_text, started
+            )
+            yield _format_event("result", response.model_dump_json())
+        finally:
+            task.cancel()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
-    # Stub implementation
+
+def _validate_extraction_request(request: ExtractionRequest) -> str:
+    """Reject extraction requests that cannot be processed; return the S3 key."""
     if request.document_type == DocumentType.UNKNOWN:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot extract data from unknown document type. Classify document first.",
         )
+    if not request.s3_key:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="s3_key is required to extract data from a document.",
+        )
+    return request.s3_key
+
+
+def _extraction_response(
+    request: ExtractionRequest,
+    extracted_data: dict[str, Any],
+    extracted_fields: list[ExtractedField],
+    raw_text: str,
+    started: float,
+) -> ExtractionResponse:
+    """Assemble the extraction response for a completed extraction."""
+    confidence_score = (
+        sum(f.confidence for f in extracted_fields) / len(extracted_fields)
+        if extracted_fields
+        else 0.0
+    )
 
     return ExtractionResponse(
         document_id=request.document_id,
         document_type=request.document_type,
-        extracted_data={},
-        extracted_fields=[],
-        raw_text=None,
-        confidence_score=0.0,
-        processing_time_ms=0,
+        extracted_data=extracted_data,
+        extracted_fields=extracted_fields,
+        raw_text=raw_text or None,
+        confidence_score=confidence_score,
+        processing_time_ms=int((time.perf_counter() - started) * 1000),
         extracted_at=datetime.utcnow(),
-        warnings=["Stub implementation - actual extraction not yet implemented"],
+        warnings=[] if extracted_fields else ["No fields could be extracted"],
     )
+
+
+def _format_event(name: str, data: str) -> str:
+    """Render a server-sent event."""
+    return f"event: {name}\ndata: {data}\n\n"
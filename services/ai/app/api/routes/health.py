@@ -1,11 +1,14 @@
 """Health check endpoints."""
 
 from datetime import datetime
+from typing import Any
 
 from fastapi import APIRouter, status
 from pydantic import BaseModel, Field
 
 from app.config import settings
+from app.services.openai_client import ai_client
+from app.services.textract import textract_service
 
 router = APIRouter(tags=["health"])
 
@@ -27,6 +30,17 @@ class ReadinessResponse(BaseModel):
     details: dict[str, str] = Field(
         default_factory=dict, description="Additional details"
     )
+    ocr_cache: dict[str, int] = Field(
+        default_factory=dict, description="OCR cache hit/miss/eviction counters"
+    )
+    ai_providers: dict[str, dict[str, Any]] = Field(
+        default_factory=dict,
+        description="Circuit breaker state and rolling statistics per AI provider",
+    )
+    llm_cache: dict[str, int] = Field(
+        default_factory=dict,
+        description="AI completion cache hit/miss/eviction counters",
+    )
 
 
 @router.get(
@@ -61,23 +75,32 @@ async def readiness_check() -> ReadinessResponse:
     """
     Readiness check endpoint.
 
-    Verifies that all external dependencies are available.
-    Currently returns stub data - will be implemented with actual checks.
+    Verifies that all external dependencies are available. AI providers
+    are reported unavailable when no client is configured or while their
+    circuit breaker is open; the service stays ready as long as one of
+    them can take traffic.
+    AWS checks currently return stub data.
     """
-    # TODO: Implement actual dependency checks
-    # - AWS S3 connectivity
-    # - AWS Textract availability
-    # - OpenAI API availability
-    # - Anthropic API availability
+    ai_providers = ai_client.provider_health()
 
     checks = {
         "aws_s3": True,  # Stub
         "aws_textract": True,  # Stub
-        "openai": True,  # Stub
-        "anthropic": True,  # Stub
+        "openai": (
+            ai_providers["openai"]["configured"]
+            and ai_providers["openai"]["state"] != "open"
+        ),
+        "anthropic": (
+            ai_providers["anthropic"]["configured"]
+            and ai_providers["anthropic"]["state"] != "open"
+        ),
     }
 
-    all_ready = all(checks.values())
+    all_ready = (
+        checks["aws_s3"]
+        and checks["aws_textract"]
+        and (checks["openai"] or checks["anthropic"])
+    )
 
     return ReadinessResponse(
         ready=all_ready,
@@ -85,4 +108,7 @@ async def readiness_check() -> ReadinessResponse:
         details={
             "message": "All systems operational (stub implementation)",
         },
+        ai_providers=ai_providers,
+        ocr_cache=textract_service.cache_stats(),
+        llm_cache=ai_client.cache_stats(),
     )
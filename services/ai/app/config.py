@@ -56,6 +56,13 @@ class Settings(BaseSettings):
         default=0.0, description="Temperature for OpenAI responses"
     )
 
+    openai_requests_per_minute: int = Field(
+        default=500, description="OpenAI request budget per minute (0 for unlimited)"
+    )
+    openai_tokens_per_minute: int = Field(
+        default=300000, description="OpenAI token budget per minute (0 for unlimited)"
+    )
+
     # Anthropic Configuration
     anthropic_model: str = Field(
         default="claude-3-5-sonnet-20241022", description="Anthropic model to use"
@@ -63,6 +70,72 @@ class Settings(BaseSettings):
     anthropic_max_tokens: int = Field(
         default=4096, description="Maximum tokens for Anthropic responses"
     )
+    anthropic_requests_per_minute: int = Field(
+        default=50,
+        description="Anthropic request budget per minute (0 for unlimited)",
+    )
+    anthropic_tokens_per_minute: int = Field(
+        default=40000,
+        description="Anthropic token budget per minute (0 for unlimited)",
+    )
+
+    # AI Provider Routing Configuration
+    ai_request_timeout_seconds: float = Field(
+        default=60.0, description="Timeout for a single AI provider request"
+    )
+    ai_hedging_enabled: bool = Field(
+        default=False,
+        description="Start the fallback provider when the primary is slow",
+    )
+    ai_hedge_percentile: float = Field(
+        default=0.95,
+        ge=0.5,
+        le=1.0,
+        description="Primary latency percentile after which the fallback starts",
+    )
+    ai_hedge_default_delay_seconds: float = Field(
+        default=5.0,
+        description="Hedge delay used until enough latency samples exist",
+    )
+    ai_hedge_min_delay_seconds: float = Field(
+        default=0.5, description="Lower bound for the hedge delay"
+    )
+
+    ai_circuit_failure_threshold: int = Field(
+        default=5, description="Consecutive provider failures that open its circuit"
+    )
+    ai_circuit_reset_seconds: float = Field(
+        default=30.0, description="Seconds a provider circuit stays open"
+    )
+
+    # AI Response Cache Configuration
+    ai_cache_enabled: bool = Field(
+        default=True, description="Cache temperature-0 AI completions"
+    )
+    ai_cache_max_entries: int = Field(
+        default=1024, description="Maximum AI completions held in memory"
+    )
+    ai_cache_dir: str = Field(
+        default=".cache/llm",
+        description="Directory for the on-disk AI completion cache (empty to disable)",
+    )
+    ai_cache_ttl_seconds: float = Field(
+        default=7 * 24 * 3600, description="Lifetime of a cached AI completion"
+    )
+
+    # Local Classifier Configuration
+    local_classifier_enabled: bool = Field(
+        default=True,
+        description="Classify confident documents locally before calling the LLM",
+    )
+    local_classifier_min_confidence: float = Field(
+        default=0.9,
+        description="Local probability required to skip the LLM classification",
+    )
+    local_classifier_corpus_path: str = Field(
+        default="",
+        description="Labelled JSONL training corpus (empty for the bundled one)",
+    )
 
     # Processing Configuration
     max_document_size_mb: int = Field(
@@ -71,6 +144,147 @@ class Settings(BaseSettings):
     processing_timeout_seconds: int = Field(
         default=300, description="Document processing timeout in seconds"
     )
+    extraction_prompt_max_tokens: int = Field(
+        default=2000,
+        description="Token budget for OCR text in extraction prompts (0 for no limit)",
+    )
+    extraction_map_reduce_enabled: bool = Field(
+        default=True,
+        description="Extract long multi-page documents chunk by chunk and merge",
+    )
+    extraction_map_max_chunks: int = Field(
+        default=6, description="Most page chunks extracted for one document"
+    )
+    extraction_batch_enabled: bool = Field(
+        default=False,
+        description="Share one prompt between short same-type documents",
+    )
+    extraction_batch_window_ms: int = Field(
+        default=50, description="How long an extraction batch waits for documents"
+    )
+    extraction_batch_max_documents: int = Field(
+        default=8, description="Documents that close an extraction batch at once"
+    )
+    extraction_batch_max_chars: int = Field(
+        default=2000, description="Longest document text eligible for batching"
+    )
+
+    # Job Engine Configuration
+    job_worker_count: int = Field(
+        default=4, description="Concurrent document processing workers"
+    )
+    job_queue_size: int = Field(
+        default=1000, description="Maximum queued document processing jobs"
+    )
+    job_history_size: int = Field(
+        default=10000, description="Finished jobs retained for status queries"
+    )
+
+    job_batch_max_documents: int = Field(
+        default=5000, description="Maximum documents accepted in one batch"
+    )
+    job_batch_concurrency: int = Field(
+        default=2,
+        description="Maximum jobs of one batch queued or running at once",
+    )
+
+    # Durable Job Queue Configuration
+    job_backend: Literal["memory", "sqlite"] = Field(
+        default="memory",
+        description="Run jobs in-process or via the SQLite queue and app.worker",
+    )
+    job_store_path: str = Field(
+        default=".cache/jobs.sqlite3", description="SQLite job queue database file"
+    )
+    job_lease_seconds: float = Field(
+        default=60.0, description="Visibility timeout for a leased job"
+    )
+    job_max_attempts: int = Field(
+        default=3, description="Attempts before a job is dead-lettered"
+    )
+    job_retry_delay_seconds: float = Field(
+        default=5.0, description="Delay before a failed job is retried"
+    )
+    job_poll_interval_seconds: float = Field(
+        default=1.0, description="Seconds between lease attempts on an empty queue"
+    )
+
+    # Textract Concurrency Configuration
+    textract_max_concurrency: int = Field(
+        default=8,
+        description="Maximum concurrent Textract/S3 calls per worker process",
+    )
+
+    # Textract Asynchronous Job Configuration
+    textract_async_multipage: bool = Field(
+        default=True,
+        description="Use asynchronous Textract jobs for PDF/TIFF documents",
+    )
+    textract_poll_initial_seconds: float = Field(
+        default=1.0, description="Initial delay before polling a Textract job"
+    )
+    textract_poll_max_seconds: float = Field(
+        default=10.0, description="Maximum backoff between Textract job polls"
+    )
+
+    # Page-Parallel OCR Configuration
+    ocr_page_parallel_enabled: bool = Field(
+        default=True, description="Split PDFs and OCR their pages concurrently"
+    )
+    ocr_page_concurrency: int = Field(
+        default=4, description="Pages of one document OCR'd at once"
+    )
+    ocr_page_parallel_max_pages: int = Field(
+        default=50,
+        description="Longest PDF split into pages (longer ones use an async job)",
+    )
+
+    # Image Preprocessing Configuration
+    image_preprocess_enabled: bool = Field(
+        default=True,
+        description="Rotate, crop, downsample and recompress photos before OCR",
+    )
+    image_preprocess_workers: int = Field(
+        default=2, description="Worker processes for image preprocessing"
+    )
+    image_preprocess_min_kb: int = Field(
+        default=1024, description="Smallest photo worth preprocessing"
+    )
+    image_preprocess_max_source_mb: int = Field(
+        default=50, description="Largest photo downloaded for preprocessing"
+    )
+    image_preprocess_max_edge_px: int = Field(
+        default=2400, description="Longest edge of a preprocessed photo"
+    )
+    image_preprocess_jpeg_quality: int = Field(
+        default=80, description="JPEG quality of a preprocessed photo"
+    )
+
+    # Embedded PDF Text Configuration
+    embedded_text_enabled: bool = Field(
+        default=True,
+        description="Read born-digital PDFs from their text layer, skipping Textract",
+    )
+    embedded_text_min_chars_per_page: int = Field(
+        default=20,
+        description="Embedded characters a PDF page needs to skip Textract",
+    )
+
+    # OCR Cache Configuration
+    ocr_cache_enabled: bool = Field(
+        default=True, description="Cache Textract results by S3 object version"
+    )
+    ocr_cache_max_entries: int = Field(
+        default=256, description="Maximum OCR results held in memory"
+    )
+    ocr_cache_dir: str = Field(
+        default=".cache/ocr",
+        description="Directory for the on-disk OCR cache (empty to disable)",
+    )
+    ocr_etag_ttl_seconds: float = Field(
+        default=30.0,
+        description="How long an S3 ETag is reused before re-checking the object",
+    )
 
     @field_validator("cors_origins", mode="before")
     @classmethod
@@ -0,0 +1,120 @@
+"""Micro-batching of concurrent async requests."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, field
+from typing import Generic, TypeVar
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass
+class _PendingBatch(Generic[T, R]):
+    """Items collected for one key while its window is open."""
+
+    items: list[T] = field(default_factory=list)
+    futures: list[asyncio.Future[R]] = field(default_factory=list)
+    timer: asyncio.TimerHandle | None = None
+
+
+class MicroBatcher(Generic[K, T, R]):
+    """
+    Collects requests with the same key over a short window.
+
+    The first request for a key opens a window of ``window_seconds``; the
+    batch is handed to ``handler`` when the window closes or the batch
+    reaches ``max_batch_size``, whichever comes first. The handler returns
+    one result per item, in order; an exception in place of a result fails
+    only that item, while an exception raised by the handler, or a result
+    count that does not match the batch, fails the whole batch. A caller that is cancelled while waiting does not affect
+    the rest of its batch.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[K, list[T]], Awaitable[list[R | BaseException]]],
+        window_seconds: float,
+        max_batch_size: int,
+    ) -> None:
+        """
+        Initialize the batcher.
+
+        Args:
+            name: Name used in logs
+            handler: Processes one batch of items sharing a key
+            window_seconds: How long a batch stays open for more items
+            max_batch_size: Items that close a batch immediately
+        """
+        self.name = name
+        self.handler = handler
+        self.window_seconds = window_seconds
+        self.max_batch_size = max_batch_size
+        self._pending: dict[K, _PendingBatch[T, R]] = {}
+        self._running: set[asyncio.Task[None]] = set()
+
+    async def submit(self, key: K, item: T) -> R:
+        """
+        Add an item to the open batch for its key and wait for its result.
+
+        Args:
+            key: Items with equal keys may be batched together
+            item: Request to process
+
+        Returns:
+            The handler's result for this item
+        """
+        loop = asyncio.get_running_loop()
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = self._pending[key] = _PendingBatch()
+            batch.timer = loop.call_later(self.window_seconds, self._flush, key)
+        future: asyncio.Future[R] = loop.create_future()
+        batch.items.append(item)
+        batch.futures.append(future)
+        if len(batch.items) >= self.max_batch_size:
+            self._flush(key)
+        return await future
+
+    def _flush(self, key: K) -> None:
+        """Close the batch for a key and start processing it."""
+        batch = self._pending.pop(key, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        task = asyncio.create_task(self._run(key, batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, key: K, batch: _PendingBatch[T, R]) -> None:
+        """Process a batch and resolve its futures."""
+        logger.info(
+            "Processing micro-batch",
+            extra={"batcher": self.name, "key": str(key), "size": len(batch.items)},
+        )
+        try:
+            results = await self.handler(key, batch.items)
+            if len(results) != len(batch.items):
+                raise ValueError(
+                    f"Batch handler returned {len(results)} results "
+                    f"for {len(batch.items)} items"
+                )
+        except Exception as e:
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for future, result in zip(batch.futures, results, strict=True):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
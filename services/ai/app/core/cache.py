@@ -0,0 +1,246 @@
+"""In-memory and on-disk caches shared by the service layer."""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss/eviction counters for a cache."""
+
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        """Return the counters as a plain dictionary."""
+        return asdict(self)
+
+
+def make_cache_key(*parts: str) -> str:
+    """
+    Build a stable content-addressed key from string parts.
+
+    Args:
+        *parts: Components identifying the cached value
+
+    Returns:
+        Hex SHA-256 digest of the joined parts
+    """
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class LRUCache:
+    """Bounded, thread-safe least-recently-used cache with optional expiry."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float | None = None) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries
+            ttl_seconds: Lifetime of an entry, or None for no expiry
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+        # key -> (expires_at or None, value)
+        self._entries: OrderedDict[str, tuple[float | None, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Any | None:
+        """Return the cached value for key, or None on a miss or expiry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is not None:
+                if entry[0] <= time.monotonic():
+                    del self._entries[key]
+                    entry = None
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return entry[1]
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entries if full."""
+        if self.max_entries <= 0:
+            return
+        expires_at = None
+        if self.ttl_seconds is not None:
+            expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def delete(self, key: str) -> None:
+        """Remove a key if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskCache:
+    """JSON file store with one file per key."""
+
+    def __init__(self, directory: str | Path, ttl_seconds: float | None = None) -> None:
+        """
+        Initialize the store; the directory is created on first write.
+
+        Args:
+            directory: Directory holding the entries
+            ttl_seconds: Lifetime of an entry (by file age), or None for no expiry
+        """
+        self.directory = Path(directory)
+        self.ttl_seconds = ttl_seconds
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Any | None:
+        """Return the stored value for key, or None if absent, stale or unreadable."""
+        path = self._path(key)
+        try:
+            if (
+                self.ttl_seconds is not None
+                and path.stat().st_mtime + self.ttl_seconds <= time.time()
+            ):
+                path.unlink(missing_ok=True)
+                return None
+            with path.open("r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(
+                "Discarding unreadable cache entry",
+                extra={"path": str(path), "error": str(e)},
+            )
+            path.unlink(missing_ok=True)
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        """Atomically write a JSON-serializable value for key."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(value, f, default=str)
+            os.replace(tmp_path, self._path(key))
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(
+                "Failed to write cache entry", extra={"key": key, "error": str(e)}
+            )
+            Path(tmp_path).unlink(missing_ok=True)
+
+    def delete(self, key: str) -> None:
+        """Remove a key if present."""
+        self._path(key).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        if not self.directory.exists():
+            return
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
+
+
+class TwoTierCache:
+    """
+    Memory LRU backed by an optional disk store.
+
+    Reads check memory first, then disk (promoting disk hits into memory).
+    Writes go to both tiers; the memory tier may hold a packed form of the
+    value while the disk tier keeps plain JSON.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        directory: str | Path | None = None,
+        ttl_seconds: float | None = None,
+        pack: Callable[[Any], Any] | None = None,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries held in memory
+            directory: Directory for the disk tier, or None to disable it
+            ttl_seconds: Lifetime of an entry in each tier, or None for no expiry
+            pack: Converts a value into the form held in memory (e.g. a more
+                compact equivalent); memory reads return the packed form
+        """
+        self.memory = LRUCache(max_entries, ttl_seconds)
+        self.disk = DiskCache(directory, ttl_seconds) if directory else None
+        self.pack = pack
+
+    @property
+    def stats(self) -> CacheStats:
+        """Counters for the cache; misses count lookups absent from both tiers."""
+        return self.memory.stats
+
+    def get(self, key: str) -> Any | None:
+        """Return the cached value for key, or None on a miss."""
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+
+        if self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                # Memory counted a miss; reclassify it as a disk hit
+                self.stats.misses -= 1
+                self.stats.disk_hits += 1
+                value = self._packed(value)
+                self.memory.set(key, value)
+                return value
+
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value in both tiers."""
+        self.memory.set(key, self._packed(value))
+        if self.disk is not None:
+            self.disk.set(key, value)
+
+    def _packed(self, value: Any) -> Any:
+        """Convert a value into its in-memory form."""
+        return self.pack(value) if self.pack is not None else value
+
+    def delete(self, key: str) -> None:
+        """Remove a key from both tiers."""
+        self.memory.delete(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def clear(self) -> None:
+        """Remove all entries from both tiers."""
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
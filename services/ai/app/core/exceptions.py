@@ -59,6 +59,12 @@ class DocumentTooLargeError(AIServiceException):
     pass
 
 
+class JobQueueFullError(AIServiceException):
+    """Raised when the processing queue cannot accept more jobs."""
+
+    pass
+
+
 class ConfigurationError(AIServiceException):
     """Raised when configuration is invalid or missing."""
 
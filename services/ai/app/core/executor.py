@@ -0,0 +1,120 @@
+"""Bounded worker pools for running blocking calls from async code."""
+
+import asyncio
+import contextvars
+import functools
+import multiprocessing
+import threading
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class BlockingExecutor:
+    """
+    Async adapter for blocking SDK calls.
+
+    Runs callables on a dedicated, bounded thread pool so that slow network
+    round trips (e.g. boto3) never block the event loop. The number of
+    workers caps how many calls are in flight at once; excess calls wait
+    in the pool's queue. Context variables (such as the request ID used in
+    logs) are propagated into the worker thread.
+    """
+
+    def __init__(self, max_workers: int, name: str) -> None:
+        """
+        Initialize the executor.
+
+        Args:
+            max_workers: Maximum number of concurrent blocking calls
+            name: Thread name prefix, used in logs and debugging
+        """
+        self.max_workers = max_workers
+        self.name = name
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+
+    def _create_pool(self) -> Executor:
+        """Create the underlying pool."""
+        return ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix=self.name
+        )
+
+    def _get_executor(self) -> Executor:
+        """Return the pool, creating it on first use."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._create_pool()
+            return self._executor
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a blocking callable on the pool and await its result.
+
+        Args:
+            func: Blocking callable
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            The callable's return value
+        """
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, func, *args, **kwargs)
+        return await loop.run_in_executor(self._get_executor(), call)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Shut down the pool; it is recreated lazily if used again.
+
+        Args:
+            wait: Whether to wait for in-flight calls to finish
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            logger.info("Shutting down executor", extra={"executor": self.name})
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+class ProcessExecutor(BlockingExecutor):
+    """
+    Async adapter for CPU-bound work.
+
+    Runs callables on a bounded process pool so that heavy pure-Python or
+    C-extension work (such as image decoding) neither blocks the event loop
+    nor contends for the GIL with request handling. Callables and their
+    arguments must be picklable, and context variables are not propagated.
+    Workers are spawned rather than forked: forking a process that already
+    runs SDK threads can deadlock the child.
+    """
+
+    def _create_pool(self) -> Executor:
+        """Create a process pool of spawned workers."""
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a callable in a worker process and await its result.
+
+        Args:
+            func: Picklable module-level callable
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            The callable's return value
+        """
+        loop = asyncio.get_running_loop()
+        call = functools.partial(func, *args, **kwargs)
+        return await loop.run_in_executor(self._get_executor(), call)
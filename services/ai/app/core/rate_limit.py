@@ -0,0 +1,148 @@
+"""Token-bucket rate limiting for calls to rate-limited APIs."""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class TokenBucket:
+    """
+    Continuously refilling token bucket.
+
+    The level may go negative when actual usage exceeds what was reserved;
+    the debt is paid back by the refill before new reservations succeed.
+    """
+
+    def __init__(self, per_minute: float) -> None:
+        """
+        Initialize a full bucket.
+
+        Args:
+            per_minute: Refill rate and capacity (a minute's worth of tokens)
+        """
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self._level = per_minute
+        self._updated = time.monotonic()
+
+    @property
+    def level(self) -> float:
+        """Tokens currently available."""
+        self._refill()
+        return self._level
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        refilled = self._level + (now - self._updated) * self.rate
+        self._level = min(self.capacity, refilled)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` tokens are available (0 if they are now)."""
+        shortfall = min(amount, self.capacity) - self.level
+        return max(shortfall / self.rate, 0.0)
+
+    def consume(self, amount: float) -> None:
+        """Take tokens from the bucket (negative amounts give tokens back)."""
+        self._refill()
+        self._level = min(self.capacity, self._level - amount)
+
+    def drain(self) -> None:
+        """Empty the bucket, e.g. after the provider reports a rate limit."""
+        self._refill()
+        self._level = min(self._level, 0.0)
+
+
+class Reservation:
+    """Tokens reserved for one call, corrected once actual usage is known."""
+
+    __slots__ = ("tokens", "used")
+
+    def __init__(self, tokens: int) -> None:
+        self.tokens = tokens
+        self.used: int | None = None
+
+
+class RateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute limiter for one provider.
+
+    Callers reserve an estimated token count up front and wait, in FIFO
+    order, until both budgets allow the call; a large request at the head
+    of the queue is not starved by smaller ones behind it. Once the
+    response reports its usage, the estimate is corrected so the budget
+    tracks what the provider actually counted. A limit of 0 disables that
+    budget.
+    """
+
+    def __init__(
+        self, name: str, requests_per_minute: int, tokens_per_minute: int
+    ) -> None:
+        """
+        Initialize the limiter.
+
+        Args:
+            name: Provider name, used in logs
+            requests_per_minute: Request budget (0 for unlimited)
+            tokens_per_minute: Prompt + completion token budget (0 for unlimited)
+        """
+        self.name = name
+        self.requests = (
+            TokenBucket(requests_per_minute) if requests_per_minute else None
+        )
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._turn = asyncio.Lock()
+
+    def _wait_time(self, tokens: int) -> float:
+        wait = 0.0
+        if self.requests is not None:
+            wait = self.requests.wait_time(1)
+        if self.tokens is not None:
+            wait = max(wait, self.tokens.wait_time(tokens))
+        return wait
+
+    @asynccontextmanager
+    async def reserve(self, tokens: int) -> AsyncIterator[Reservation]:
+        """
+        Wait for budget, then hold a reservation for the duration of a call.
+
+        Set ``used`` on the yielded reservation to the tokens the provider
+        reported; if the provider answers with a rate-limit error, callers
+        should call ``throttle`` so queued requests back off.
+
+        Args:
+            tokens: Estimated prompt + completion tokens
+
+        Yields:
+            The reservation
+        """
+        async with self._turn:
+            waited = 0.0
+            while (wait := self._wait_time(tokens)) > 0:
+                await asyncio.sleep(wait)
+                waited += wait
+            if self.requests is not None:
+                self.requests.consume(1)
+            if self.tokens is not None:
+                self.tokens.consume(tokens)
+        if waited:
+            logger.info(
+                "AI request delayed by rate limiter",
+                extra={"provider": self.name, "waited_seconds": round(waited, 3)},
+            )
+
+        reservation = Reservation(tokens)
+        yield reservation
+        if reservation.used is not None and self.tokens is not None:
+            self.tokens.consume(reservation.used - reservation.tokens)
+
+    def throttle(self) -> None:
+        """Empty both budgets after the provider rejected a call for rate."""
+        for bucket in (self.requests, self.tokens):
+            if bucket is not None:
+                bucket.drain()
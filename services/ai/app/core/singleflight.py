@@ -0,0 +1,69 @@
+"""Coalescing of concurrent identical async calls."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import TypeVar
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time.
+
+    Callers arriving while a call for the same key is in flight wait for
+    that call and share its result (or exception) instead of starting their
+    own. The call runs as its own task, so a caller that disconnects does
+    not cancel the work the other callers are waiting on. Nothing is kept
+    once the call finishes: results are cached elsewhere, this only
+    removes concurrent duplicates.
+    """
+
+    def __init__(self, name: str) -> None:
+        """
+        Initialize the coalescer.
+
+        Args:
+            name: Name used in logs
+        """
+        self.name = name
+        self._calls: dict[Hashable, asyncio.Task] = {}
+
+    @property
+    def in_flight(self) -> int:
+        """Number of calls currently running."""
+        return len(self._calls)
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run ``func`` unless a call for ``key`` is already in flight.
+
+        Args:
+            key: Identity of the work; equal keys must produce equal results
+            func: Zero-argument coroutine function performing the work
+
+        Returns:
+            Result of the in-flight or newly started call
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            logger.info(
+                "Joined in-flight call", extra={"coalescer": self.name, "key": key}
+            )
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        """Drop a finished call, unless the key has been reused since."""
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark the exception retrieved when every caller has gone away
+            task.exception()
@@ -12,6 +12,9 @@ from app.api.routes import documents, extraction, health
 from app.config import settings
 from app.core.exceptions import AIServiceException
 from app.core.logging import get_logger, setup_logging
+from app.services.jobs import job_manager
+from app.services.local_classifier import local_classifier
+from app.services.textract import textract_service
 
 # Setup logging
 setup_logging()
@@ -43,12 +46,21 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         if settings.environment == "production":
             raise
 
+    if settings.local_classifier_enabled:
+        await local_classifier.warm_up()
+    job_manager.start()
+
     logger.info("AI Service startup complete")
 
     yield
 
     # Shutdown
     logger.info("Shutting down CombatID AI Service")
+    await job_manager.shutdown()
+    await textract_service.job_poller.shutdown()
+    textract_service.executor.shutdown(wait=False)
+    if textract_service.image_executor is not None:
+        textract_service.image_executor.shutdown(wait=False)
 
 
 # Create FastAPI application
@@ -29,6 +29,18 @@ class ProcessingStatus(str, Enum):
     FAILED = "failed"
 
 
+class ProcessingStage(str, Enum):
+    """Last pipeline stage reached by a processing job."""
+
+    QUEUED = "queued"
+    STARTED = "started"
+    OCR = "ocr"
+    CLASSIFIED = "classified"
+    EXTRACTED = "extracted"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
 class DocumentProcessRequest(BaseModel):
     """Request to process a document."""
 
@@ -57,6 +69,9 @@ class DocumentStatusResponse(BaseModel):
 
     document_id: str = Field(..., description="Document identifier")
     status: ProcessingStatus = Field(..., description="Processing status")
+    stage: ProcessingStage | None = Field(
+        None, description="Last pipeline stage reached"
+    )
     progress: int = Field(default=0, ge=0, le=100, description="Progress percentage")
     document_type: DocumentType | None = Field(
         None, description="Classified document type"
@@ -72,6 +87,53 @@ class DocumentStatusResponse(BaseModel):
     )
 
 
+class BatchProcessRequest(BaseModel):
+    """Request to process many documents in one call."""
+
+    documents: list[DocumentProcessRequest] = Field(
+        ..., description="Documents to process (duplicates are ignored)"
+    )
+
+
+class BatchProcessResponse(BaseModel):
+    """Response from a batch processing request."""
+
+    batch_id: str = Field(..., description="Batch identifier")
+    accepted: int = Field(..., description="Number of new jobs queued")
+    jobs: dict[str, str] = Field(
+        default_factory=dict, description="Job ID of each queued document"
+    )
+    existing_jobs: dict[str, str] = Field(
+        default_factory=dict,
+        description="Job ID of documents already queued or processing",
+    )
+    duplicates: list[str] = Field(
+        default_factory=list, description="Document IDs repeated within the batch"
+    )
+    message: str | None = Field(None, description="Status message")
+    created_at: datetime = Field(
+        default_factory=datetime.utcnow, description="Batch creation timestamp"
+    )
+
+
+class BatchStatusResponse(BaseModel):
+    """Aggregate progress of a batch."""
+
+    batch_id: str = Field(..., description="Batch identifier")
+    total: int = Field(..., description="Jobs in the batch")
+    pending: int = Field(default=0, description="Jobs waiting to start")
+    processing: int = Field(default=0, description="Jobs in progress")
+    completed: int = Field(default=0, description="Jobs completed")
+    failed: int = Field(default=0, description="Jobs failed")
+    progress: int = Field(
+        default=0, ge=0, le=100, description="Mean progress percentage"
+    )
+    finished: bool = Field(default=False, description="Whether every job finished")
+    failed_document_ids: list[str] = Field(
+        default_factory=list, description="Documents whose job failed"
+    )
+
+
 class ClassificationResult(BaseModel):
     """Result of document classification."""
 
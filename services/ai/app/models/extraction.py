@@ -26,6 +26,9 @@ class ClassificationRequest(BaseModel):
 
     document_id: str = Field(..., description="Document identifier")
     s3_key: str | None = Field(None, description="S3 object key if not stored")
+    force_reprocess: bool = Field(
+        default=False, description="Force reprocessing even if cached"
+    )
 
 
 class ExtractedField(BaseModel):
@@ -1,18 +1,46 @@
 """Document classification service."""
 
+from typing import Any
+
+from app.config import settings
+from app.core.exceptions import AIProviderError, ClassificationError
 from app.core.logging import get_logger
 from app.models.document import ClassificationResult, DocumentType
+from app.services.local_classifier import local_classifier
 from app.services.openai_client import ai_client
+from app.services.response_parsing import extract_json_object
 from app.services.textract import textract_service
 
 logger = get_logger(__name__)
 
+# Maximum characters of OCR text sent for classification; the document
+# type is almost always evident from the first page.
+MAX_CLASSIFICATION_TEXT_CHARS = 4000
+
+# Bump when the prompt or the parsing of its response changes meaning, so
+# cached completions from the previous version are not reused
+CLASSIFICATION_PROMPT_VERSION = "classification-v1"
+
+CLASSIFICATION_SYSTEM_PROMPT = (
+    "You are a document classifier for combat sports compliance documents. "
+    "Respond with a single JSON object and nothing else."
+)
+
 
 class DocumentClassifier:
-    """Service for classifying documents using AI."""
+    """
+    Service for classifying documents using AI.
+
+    Documents the local classifier is confident about are answered without
+    calling the LLM; only the remaining, ambiguous ones are sent to it.
+    """
 
     async def classify(
-        self, document_id: str, s3_key: str
+        self,
+        document_id: str,
+        s3_key: str,
+        ocr_result: dict[str, Any] | None = None,
+        force_reprocess: bool = False,
     ) -> ClassificationResult:
         """
         Classify a document type.
@@ -20,6 +48,9 @@ class DocumentClassifier:
         Args:
             document_id: Unique identifier for the document
             s3_key: S3 object key for the document
+            ocr_result: Textract result already produced for this document;
+                if omitted the document is analyzed (or read from the OCR cache)
+            force_reprocess: Bypass cached OCR results
 
         Returns:
             Classification result with document type and confidence
@@ -32,34 +63,58 @@ class DocumentClassifier:
             extra={"document_id": document_id, "s3_key": s3_key},
         )
 
-        # TODO: Implement actual classification
-        # 1. Extract text using Textract
-        # textract_result = await textract_service.extract_text(s3_key)
-        # extracted_text = textract_result.get("text", "")
-        #
-        # 2. Use AI to classify based on text content
-        # classification_prompt = self._build_classification_prompt(extracted_text)
-        # ai_response = await ai_client.complete(
-        #     prompt=classification_prompt,
-        #     system_prompt="You are a document classifier...",
-        #     temperature=0.0,
-        # )
-        #
-        # 3. Parse AI response and determine document type
-        # document_type, confidence = self._parse_classification(ai_response)
-
-        # Stub implementation
+        if ocr_result is None:
+            ocr_result = await textract_service.analyze_document(
+                s3_key, force_reprocess=force_reprocess
+            )
+        extracted_text = ocr_result.get("text", "")
+
+        if not extracted_text.strip():
+            return ClassificationResult(
+                document_type=DocumentType.UNKNOWN,
+                confidence=0.0,
+                alternative_types=[],
+                reasoning="No text could be extracted from the document",
+            )
+
+        if settings.local_classifier_enabled:
+            result = local_classifier.classify(extracted_text)
+            if result is not None:
+                logger.info(
+                    "Document classified locally",
+                    extra={
+                        "document_id": document_id,
+                        "document_type": result.document_type,
+                        "confidence": result.confidence,
+                    },
+                )
+                return result
+
+        try:
+            ai_response = await ai_client.complete(
+                prompt=self._build_classification_prompt(extracted_text),
+                system_prompt=CLASSIFICATION_SYSTEM_PROMPT,
+                temperature=0.0,
+                prompt_version=CLASSIFICATION_PROMPT_VERSION,
+            )
+        except AIProviderError as e:
+            raise ClassificationError(
+                f"Document classification failed: {e.message}",
+                details={"document_id": document_id},
+            ) from e
+
+        result = self._parse_classification(ai_response)
+
         logger.info(
-            "Document classification completed (stub)",
-            extra={"document_id": document_id},
+            "Document classification completed",
+            extra={
+                "document_id": document_id,
+                "document_type": result.document_type,
+                "confidence": result.confidence,
+            },
         )
 
-        return ClassificationResult(
-            document_type=DocumentType.UNKNOWN,
-            confidence=0.0,
-            alternative_types=[],
-            reasoning="Stub implementation - actual classification not implemented",
-        )
+        return result
 
     def _build_classification_prompt(self, text: str) -> str:
         """
@@ -71,23 +126,65 @@ class DocumentClassifier:
         Returns:
             Formatted prompt for classification
         """
-        # TODO: Implement actual prompt building
-        return f"Classify this document:\n\n{text}"
+        types = ", ".join(
+            t.value for t in DocumentType if t is not DocumentType.UNKNOWN
+        )
+        return (
+            f"Classify this document as one of: {types}.\n"
+            'Respond as {"document_type": "<type>", "confidence": <0-1>, '
+            '"alternatives": [{"document_type": "<type>", "confidence": <0-1>}], '
+            '"reasoning": "<one sentence>"}.\n\n'
+            f"Document text:\n{text[:MAX_CLASSIFICATION_TEXT_CHARS]}"
+        )
 
-    def _parse_classification(
-        self, ai_response: str
-    ) -> tuple[DocumentType, float]:
+    def _parse_classification(self, ai_response: str) -> ClassificationResult:
         """
-        Parse AI response to extract document type and confidence.
+        Parse AI response into a classification result.
+
+        Unparseable responses classify as UNKNOWN with zero confidence.
 
         Args:
             ai_response: Raw AI response
 
         Returns:
-            Tuple of (document_type, confidence_score)
+            Classification result
         """
-        # TODO: Implement actual response parsing
-        return DocumentType.UNKNOWN, 0.0
+        data = extract_json_object(ai_response)
+        if data is None:
+            logger.warning("Unparseable classification response")
+            return ClassificationResult(
+                document_type=DocumentType.UNKNOWN,
+                confidence=0.0,
+                alternative_types=[],
+                reasoning="AI response could not be parsed",
+            )
+
+        document_type, confidence = self._parse_type(data)
+
+        alternatives: list[tuple[DocumentType, float]] = []
+        for alternative in data.get("alternatives") or []:
+            if isinstance(alternative, dict):
+                alternatives.append(self._parse_type(alternative))
+
+        return ClassificationResult(
+            document_type=document_type,
+            confidence=confidence,
+            alternative_types=alternatives,
+            reasoning=data.get("reasoning"),
+        )
+
+    @staticmethod
+    def _parse_type(data: dict[str, Any]) -> tuple[DocumentType, float]:
+        """Read a (document_type, confidence) pair, clamping bad values."""
+        try:
+            document_type = DocumentType(str(data.get("document_type", "")).lower())
+        except ValueError:
+            return DocumentType.UNKNOWN, 0.0
+        try:
+            confidence = float(data.get("confidence", 0.0))
+        except (TypeError, ValueError):
+            confidence = 0.0
+        return document_type, min(max(confidence, 0.0), 1.0)
 
 
 # Global classifier instance
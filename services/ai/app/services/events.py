@@ -0,0 +1,106 @@
+"""Fan-out of document processing status events to streaming clients."""
+
+import asyncio
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+
+from app.core.logging import get_logger
+from app.models.document import DocumentStatusResponse
+
+logger = get_logger(__name__)
+
+
+class Subscription:
+    """Event buffer for one streaming connection."""
+
+    __slots__ = ("document_ids", "_queue")
+
+    def __init__(self, document_ids: frozenset[str], buffer_size: int) -> None:
+        """
+        Initialize the subscription.
+
+        Args:
+            document_ids: Documents whose events are delivered
+            buffer_size: Events held before the oldest is dropped
+        """
+        self.document_ids = document_ids
+        self._queue: asyncio.Queue[DocumentStatusResponse] = asyncio.Queue(
+            maxsize=buffer_size
+        )
+
+    async def get(self) -> DocumentStatusResponse:
+        """Wait for the next event."""
+        return await self._queue.get()
+
+    def deliver(self, event: DocumentStatusResponse) -> None:
+        """Buffer an event, dropping the oldest if the client is slow."""
+        if self._queue.full():
+            # Status events are snapshots, so a newer one supersedes the oldest
+            self._queue.get_nowait()
+        self._queue.put_nowait(event)
+
+
+class JobEventBroadcaster:
+    """
+    Single publisher multiplexing job status events onto subscriptions.
+
+    Stage transitions are published once and routed by document ID to the
+    small per-connection buffers of interested subscribers, so an idle
+    connection costs one registry entry and an empty queue.
+    """
+
+    def __init__(self, buffer_size: int = 16) -> None:
+        """
+        Initialize the broadcaster.
+
+        Args:
+            buffer_size: Events buffered per subscription
+        """
+        self.buffer_size = buffer_size
+        self._subscribers: dict[str, set[Subscription]] = {}
+        self._count = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        """Number of open subscriptions."""
+        return self._count
+
+    def has_subscribers(self, document_id: str) -> bool:
+        """Whether any subscription is interested in a document."""
+        return document_id in self._subscribers
+
+    @contextmanager
+    def subscribe(self, document_ids: Iterable[str]) -> Iterator[Subscription]:
+        """
+        Register interest in documents for the duration of the block.
+
+        Args:
+            document_ids: Documents whose events should be delivered
+
+        Yields:
+            Subscription receiving the documents' events
+        """
+        subscription = Subscription(frozenset(document_ids), self.buffer_size)
+        for document_id in subscription.document_ids:
+            self._subscribers.setdefault(document_id, set()).add(subscription)
+        self._count += 1
+        try:
+            yield subscription
+        finally:
+            self._count -= 1
+            for document_id in subscription.document_ids:
+                subscribers = self._subscribers.get(document_id)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscribers[document_id]
+
+    def publish(self, event: DocumentStatusResponse) -> None:
+        """
+        Deliver an event to every subscription for its document.
+
+        Args:
+            event: Status snapshot to deliver
+        """
+        for subscription in self._subscribers.get(event.document_id, ()):
+            subscription.deliver(event)
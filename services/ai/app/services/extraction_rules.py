@@ -0,0 +1,495 @@
+"""Deterministic per-document-type field extraction rules."""
+
+import re
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any
+
+from app.core.logging import get_logger
+from app.models.document import DocumentType
+
+logger = get_logger(__name__)
+
+# Date spellings found on compliance documents: ISO, US numeric, "12 MAR 1993"
+# and "March 12, 1993"
+DATE = (
+    r"(\d{4}-\d{2}-\d{2}"
+    r"|\d{1,2}[/.-]\d{1,2}[/.-]\d{2,4}"
+    r"|\d{1,2}\s+[A-Za-z]{3,9}\.?\s+\d{4}"
+    r"|[A-Za-z]{3,9}\.?\s+\d{1,2},?\s+\d{4})"
+)
+
+DATE_FORMATS = (
+    "%Y-%m-%d",
+    "%m/%d/%Y",
+    "%m-%d-%Y",
+    "%m.%d.%Y",
+    "%m/%d/%y",
+    "%d %b %Y",
+    "%d %B %Y",
+    "%b %d %Y",
+    "%B %d %Y",
+)
+
+# Capitalised words on the same line, e.g. "Jane Doe" or "Dr. Alan Reed"
+NAME = r"((?:Dr\.?[ \t]+)?[A-Z][A-Za-z'.\-]+(?:[ \t]+[A-Z][A-Za-z'.\-]+){0,3})"
+
+KG_TO_LBS = 2.20462
+
+# A bare form value such as "170.5 lbs"
+FORM_WEIGHT = re.compile(r"\s*(\d{2,3}(?:\.\d{1,2})?)\s*(lbs?|kgs?)?\b", re.I)
+
+WEIGHT_CLASSES = (
+    "light heavyweight",
+    "super heavyweight",
+    "super middleweight",
+    "super welterweight",
+    "super lightweight",
+    "super featherweight",
+    "super bantamweight",
+    "super flyweight",
+    "light welterweight",
+    "light middleweight",
+    "light flyweight",
+    "strawweight",
+    "minimumweight",
+    "flyweight",
+    "bantamweight",
+    "featherweight",
+    "lightweight",
+    "welterweight",
+    "middleweight",
+    "cruiserweight",
+    "heavyweight",
+    "catchweight",
+)
+
+
+@dataclass(frozen=True)
+class FieldMatch:
+    """A field value produced by a rule."""
+
+    value: Any
+    confidence: float
+    rule: str
+
+
+def parse_date(text: str) -> date | None:
+    """Parse a date in any of the supported spellings."""
+    cleaned = re.sub(r"[,.](?=\s)|(?<=[A-Za-z])\.", "", text.strip())
+    cleaned = re.sub(r"\s+", " ", cleaned)
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(cleaned, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def parse_bool(text: str) -> bool | None:
+    """Parse a yes/no answer."""
+    answer = text.strip().lower()
+    if answer in {"yes", "y", "true", "cleared", "selected"}:
+        return True
+    if answer in {"no", "n", "false", "not cleared", "not_selected"}:
+        return False
+    return None
+
+
+def parse_weight(match: re.Match[str]) -> float | None:
+    """Weight in pounds from a (number, unit) match, converting kilograms."""
+    weight = float(match.group(1))
+    unit = (match.group(2) or "").lower()
+    if unit.startswith("k"):
+        weight = round(weight * KG_TO_LBS, 1)
+    return weight
+
+
+def normalize_key(key: str) -> str:
+    """Lowercase a form key and strip punctuation for comparison."""
+    return re.sub(r"[^a-z0-9]+", " ", key.lower()).strip()
+
+
+class ExtractionRule(ABC):
+    """Base class for rules that fill fields from an OCR result."""
+
+    name = "rule"
+
+    @abstractmethod
+    def apply(self, ocr_result: dict[str, Any]) -> dict[str, FieldMatch]:
+        """
+        Extract field values.
+
+        Args:
+            ocr_result: Textract result with ``text``, ``confidence`` and ``forms``
+
+        Returns:
+            Matched fields by name (empty when the rule does not apply)
+        """
+
+
+class PatternRule(ExtractionRule):
+    """Fills one field from the first match of a compiled pattern."""
+
+    name = "pattern"
+
+    def __init__(
+        self,
+        field: str,
+        pattern: str,
+        confidence: float,
+        parse: Callable[[re.Match[str]], Any] | None = None,
+        flags: int = re.IGNORECASE,
+    ) -> None:
+        """
+        Initialize the rule.
+
+        Args:
+            field: Field the rule fills
+            pattern: Regular expression; group 1 is the value unless ``parse``
+                is given
+            confidence: Confidence of a match before OCR confidence is applied
+            parse: Converts the match into the field value (None rejects it)
+            flags: Regular expression flags
+        """
+        self.field = field
+        self.pattern = re.compile(pattern, flags)
+        self.confidence = confidence
+        self.parse = parse or (lambda match: match.group(1).strip())
+
+    def apply(self, ocr_result: dict[str, Any]) -> dict[str, FieldMatch]:
+        """Fill the field from the first parseable match in the text."""
+        ocr_confidence = ocr_result.get("confidence") or 1.0
+        for match in self.pattern.finditer(ocr_result.get("text", "")):
+            value = self.parse(match)
+            if value is not None and value != "":
+                return {
+                    self.field: FieldMatch(
+                        value, self.confidence * ocr_confidence, self.name
+                    )
+                }
+        return {}
+
+
+class FormFieldRule(ExtractionRule):
+    """Fills one field from a Textract form key-value pair."""
+
+    name = "form"
+
+    def __init__(
+        self,
+        field: str,
+        keys: Iterable[str],
+        confidence: float,
+        parse: Callable[[str], Any] | None = None,
+    ) -> None:
+        """
+        Initialize the rule.
+
+        Args:
+            field: Field the rule fills
+            keys: Form keys holding the value, compared case-insensitively
+                without punctuation
+            confidence: Confidence of a match before key-value confidence
+                is applied
+            parse: Converts the form value into the field value (None
+                rejects it)
+        """
+        self.field = field
+        self.keys = {normalize_key(key) for key in keys}
+        self.confidence = confidence
+        self.parse = parse or str.strip
+
+    def apply(self, ocr_result: dict[str, Any]) -> dict[str, FieldMatch]:
+        """Fill the field from the first form pair with a matching key."""
+        for pair in ocr_result.get("forms") or []:
+            if normalize_key(pair.get("key", "")) not in self.keys:
+                continue
+            value = self.parse(pair.get("value", ""))
+            if value is not None and value != "":
+                confidence = self.confidence * pair.get("confidence", 1.0)
+                return {self.field: FieldMatch(value, confidence, self.name)}
+        return {}
+
+
+class MRZRule(ExtractionRule):
+    """
+    Reads the machine-readable zone of passports (TD3) and ID cards (TD1).
+
+    Check digits are verified, so a decoded field is near-certain; fields
+    whose check digit fails are skipped rather than guessed.
+    """
+
+    name = "mrz"
+
+    TD3 = re.compile(
+        r"^(P[A-Z<])([A-Z<]{3})([A-Z<]{39})\s*\n\s*"
+        r"([A-Z0-9<]{9})(\d)([A-Z<]{3})(\d{6})(\d)([MF<])(\d{6})(\d)",
+        re.MULTILINE,
+    )
+    TD1 = re.compile(
+        r"^([AIC][A-Z<])([A-Z<]{3})([A-Z0-9<]{9})(\d)[A-Z0-9<]{15}\s*\n\s*"
+        r"(\d{6})(\d)([MF<])(\d{6})(\d)[A-Z<]{3}[A-Z0-9<]{11}\d\s*\n\s*"
+        r"([A-Z<]{30})",
+        re.MULTILINE,
+    )
+
+    def __init__(self, confidence: float = 0.98) -> None:
+        """
+        Initialize the rule.
+
+        Args:
+            confidence: Confidence of a field whose check digit verifies
+        """
+        self.confidence = confidence
+
+    @staticmethod
+    def check_digit(value: str) -> int:
+        """ICAO 9303 check digit (weights 7, 3, 1)."""
+        total = 0
+        for index, char in enumerate(value):
+            if char.isdigit():
+                number = int(char)
+            elif char.isalpha():
+                number = ord(char) - ord("A") + 10
+            else:
+                number = 0
+            total += number * (7, 3, 1)[index % 3]
+        return total % 10
+
+    @staticmethod
+    def _date(value: str, future: bool) -> date | None:
+        """Decode YYMMDD, choosing the century by whether it may be future."""
+        try:
+            parsed = datetime.strptime(value, "%y%m%d").date()
+        except ValueError:
+            return None
+        today = date.today()
+        year = 2000 + parsed.year % 100
+        if not future and year > today.year:
+            year -= 100
+        return parsed.replace(year=year)
+
+    @staticmethod
+    def _name(value: str) -> str:
+        """Convert ``SURNAME<<GIVEN<NAMES`` to ``Given Names Surname``."""
+        surname, _, given = value.strip("<").partition("<<")
+        parts = [*given.split("<"), *surname.split("<")]
+        return " ".join(part.title() for part in parts if part)
+
+    def apply(self, ocr_result: dict[str, Any]) -> dict[str, FieldMatch]:
+        """Decode the first MRZ found in the text."""
+        text = ocr_result.get("text", "").upper().replace(" ", "")
+        if match := self.TD3.search(text):
+            kind, issuer, names, number, number_check = match.groups()[:5]
+            birth, birth_check, _, expiry, expiry_check = match.groups()[6:]
+            id_type = "passport"
+        elif match := self.TD1.search(text):
+            kind, issuer, number, number_check = match.groups()[:4]
+            birth, birth_check, _, expiry, expiry_check, names = match.groups()[4:]
+            id_type = "id_card"
+        else:
+            return {}
+
+        fields: dict[str, Any] = {
+            "id_type": id_type,
+            "issuing_authority": issuer.replace("<", ""),
+            "full_name": self._name(names),
+        }
+        if self.check_digit(number) == int(number_check):
+            fields["id_number"] = number.replace("<", "")
+        if self.check_digit(birth) == int(birth_check):
+            fields["date_of_birth"] = self._date(birth, future=False)
+        if self.check_digit(expiry) == int(expiry_check):
+            fields["expiration_date"] = self._date(expiry, future=True)
+        return {
+            field: FieldMatch(value, self.confidence, self.name)
+            for field, value in fields.items()
+            if value
+        }
+
+
+class RuleEngine:
+    """
+    Registry of extraction rules per document type.
+
+    Every rule registered for a document type runs against the OCR result;
+    when several rules fill the same field, the most confident match wins.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._rules: dict[DocumentType, list[ExtractionRule]] = {}
+
+    def register(self, document_type: DocumentType, *rules: ExtractionRule) -> None:
+        """
+        Add rules for a document type.
+
+        Args:
+            document_type: Document type the rules apply to
+            *rules: Rules to add
+        """
+        self._rules.setdefault(document_type, []).extend(rules)
+
+    def rules(self, document_type: DocumentType) -> list[ExtractionRule]:
+        """Rules registered for a document type."""
+        return list(self._rules.get(document_type, []))
+
+    def extract(
+        self, document_type: DocumentType, ocr_result: dict[str, Any]
+    ) -> dict[str, FieldMatch]:
+        """
+        Fill every field the registered rules can.
+
+        Args:
+            document_type: Type of document
+            ocr_result: Textract result for the document
+
+        Returns:
+            Matched fields by name
+        """
+        matches: dict[str, FieldMatch] = {}
+        for rule in self._rules.get(document_type, []):
+            try:
+                found = rule.apply(ocr_result)
+            except (ValueError, IndexError) as e:
+                logger.warning(
+                    "Extraction rule failed",
+                    extra={"rule": rule.name, "error": str(e)},
+                )
+                continue
+            for field, match in found.items():
+                current = matches.get(field)
+                if current is None or match.confidence > current.confidence:
+                    matches[field] = match
+        return matches
+
+
+def _date_group(match: re.Match[str]) -> date | None:
+    return parse_date(match.group(1))
+
+
+def _bool_group(match: re.Match[str]) -> bool | None:
+    return parse_bool(match.group(1))
+
+
+def _form_weight(value: str) -> float | None:
+    match = FORM_WEIGHT.match(value)
+    return parse_weight(match) if match else None
+
+
+def _weight_class(match: re.Match[str]) -> str:
+    return match.group(1).title()
+
+
+def _id_type(match: re.Match[str]) -> str:
+    keyword = match.group(1).lower()
+    if keyword.startswith("passport"):
+        return "passport"
+    if keyword.startswith("driv"):
+        return "driver_license"
+    return "id_card"
+
+
+def _date_rule(field: str, labels: str, confidence: float = 0.9) -> PatternRule:
+    """Date that follows one of the ``labels`` alternatives."""
+    pattern = rf"\b(?:{labels})\b\.?[ \t]*[:\-]?[ \t]*{DATE}"
+    return PatternRule(field, pattern, confidence, _date_group)
+
+
+def _name_rule(field: str, labels: str, confidence: float = 0.75) -> PatternRule:
+    """Capitalised name after ``Label:`` on the same line."""
+    return PatternRule(
+        field,
+        rf"\b(?i:(?:{labels})(?:[ \t]+name)?)[ \t]*:[ \t]*{NAME}",
+        confidence,
+        flags=0,
+    )
+
+
+def default_rule_engine() -> RuleEngine:
+    """Rule engine with the built-in rules for the structured document types."""
+    engine = RuleEngine()
+    weight_classes = "|".join(WEIGHT_CLASSES)
+
+    engine.register(
+        DocumentType.WEIGH_IN_RECORD,
+        PatternRule(
+            "weight",
+            r"\bweight\b[ \t]*[:\-]?[ \t]*(\d{2,3}(?:\.\d{1,2})?)[ \t]*"
+            r"(lbs?|pounds|kgs?|kilograms)?\b",
+            0.9,
+            parse_weight,
+        ),
+        FormFieldRule(
+            "weight", ["weight", "scale weight", "official weight"], 0.9, _form_weight
+        ),
+        PatternRule("weight_class", rf"\b({weight_classes})\b", 0.85, _weight_class),
+        _date_rule("weigh_in_date", "weigh-in date|weigh in date|date"),
+        PatternRule(
+            "weigh_in_time",
+            r"\btime\b[ \t]*[:\-]?[ \t]*(\d{1,2}:\d{2}(?:[ \t]*[ap]\.?m\.?)?)",
+            0.85,
+        ),
+        PatternRule(
+            "made_weight",
+            r"\bmade weight\b[ \t]*[:\-]?[ \t]*(yes|no)\b",
+            0.9,
+            _bool_group,
+        ),
+        _name_rule("fighter_name", "fighter|boxer|athlete"),
+        _name_rule("official_name", "official|inspector"),
+    )
+
+    engine.register(
+        DocumentType.PHOTO_ID,
+        MRZRule(),
+        _date_rule("date_of_birth", "DOB|date of birth|birth date"),
+        _date_rule("expiration_date", "EXP|expires|expiration date|date of expiry"),
+        _date_rule("issue_date", "ISS|issued|issue date|date of issue"),
+        PatternRule(
+            "id_number",
+            r"\b(?:DL|DLN|ID|license no|licence no|id no|passport no)\b\.?"
+            r"[ \t]*[:#]?[ \t]*((?=[A-Z0-9\-]*\d)[A-Z0-9][A-Z0-9\-]{4,})\b",
+            0.8,
+        ),
+        PatternRule(
+            "id_type",
+            r"\b(passport|driver'?s? licen[cs]e|driving licen[cs]e"
+            r"|identification card)",
+            0.85,
+            _id_type,
+        ),
+    )
+
+    engine.register(
+        DocumentType.MEDICAL_CLEARANCE,
+        _date_rule("date_of_birth", "DOB|date of birth|birth date"),
+        _date_rule(
+            "clearance_date",
+            "date of exam|date of examination|exam date|clearance date",
+        ),
+        _date_rule("expiration_date", "expires|expiration date|valid until"),
+        PatternRule(
+            "physician_license",
+            r"\b(?:license|lic)\b\.?[ \t]*(?:no|number|#)\.?[ \t]*[:#]?[ \t]*"
+            r"((?=[A-Z0-9\-]*\d)[A-Z0-9][A-Z0-9\-]{3,})\b",
+            0.8,
+        ),
+        PatternRule(
+            "cleared_for_competition",
+            r"\bcleared for (?:full contact )?competition\b[ \t]*[:\-]?[ \t]*"
+            r"(yes|no)\b",
+            0.9,
+            _bool_group,
+        ),
+        _name_rule("physician_name", "examining physician|physician|doctor"),
+        _name_rule("fighter_name", "fighter|athlete|boxer|patient"),
+    )
+    return engine
+
+
+# Global rule engine instance
+rule_engine = default_rule_engine()
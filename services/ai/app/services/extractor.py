@@ -1,7 +1,17 @@
 """Data extraction service."""
 
+import asyncio
+import json
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from datetime import date
 from typing import Any
 
+from pydantic import BaseModel, ValidationError
+
+from app.config import settings
+from app.core.batching import MicroBatcher
+from app.core.exceptions import AIProviderError, ExtractionError
 from app.core.logging import get_logger
 from app.models.document import DocumentType
 from app.models.extraction import (
@@ -10,17 +20,74 @@ from app.models.extraction import (
     PhotoIDData,
     WeighInData,
 )
-from app.services.openai_client import ai_client
+from app.services.extraction_rules import FieldMatch, rule_engine
+from app.services.openai_client import CHARS_PER_TOKEN, ai_client
+from app.services.prompt_compaction import PageChunk, chunk_pages, compact_text
+from app.services.response_parsing import IncrementalJSONParser, extract_json_object
 from app.services.textract import textract_service
 
 logger = get_logger(__name__)
 
+# Structured schema for each document type with a dedicated model
+EXTRACTION_MODELS: dict[DocumentType, type[BaseModel]] = {
+    DocumentType.MEDICAL_CLEARANCE: MedicalClearanceData,
+    DocumentType.PHOTO_ID: PhotoIDData,
+    DocumentType.WEIGH_IN_RECORD: WeighInData,
+}
+
+# Bump when the prompts or the parsing of their responses change meaning, so
+# cached completions from the previous version are not reused
+EXTRACTION_PROMPT_VERSION = "extraction-v1"
+
+# Confidence assigned to AI-extracted fields when OCR confidence is unknown
+DEFAULT_FIELD_CONFIDENCE = 0.8
+
+
+@dataclass
+class BatchItem:
+    """One document's share of a multi-document extraction prompt."""
+
+    document_id: str
+    text: str
+    fields: list[str] | None
+
 
 class DataExtractor:
-    """Service for extracting structured data from documents."""
+    """
+    Service for extracting structured data from documents.
+
+    Fields the rule engine can fill deterministically (patterns, form
+    key-value pairs, MRZ lines) are taken from it; the AI is only asked for
+    the fields that remain empty, and not called at all when none do.
+
+    With micro-batching enabled, short documents of the same type that
+    arrive within a few milliseconds of each other share one prompt, which
+    pays for the system prompt and the schema once instead of per document.
+
+    Multi-page documents too long for one prompt are extracted map/reduce
+    style: page chunks are extracted concurrently and each field is taken
+    from the chunk whose OCR was most confident.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the extractor."""
+        self.batcher: MicroBatcher[DocumentType, BatchItem, dict[str, Any]] = (
+            MicroBatcher(
+                "extraction",
+                self._complete_batch,
+                settings.extraction_batch_window_ms / 1000,
+                settings.extraction_batch_max_documents,
+            )
+        )
 
     async def extract(
-        self, document_id: str, s3_key: str, document_type: DocumentType
+        self,
+        document_id: str,
+        s3_key: str,
+        document_type: DocumentType,
+        force_reprocess: bool = False,
+        ocr_result: dict[str, Any] | None = None,
+        on_field: Callable[[ExtractedField], None] | None = None,
     ) -> tuple[dict[str, Any], list[ExtractedField], str]:
         """
         Extract structured data from a document.
@@ -29,6 +96,11 @@ class DataExtractor:
             document_id: Unique identifier for the document
             s3_key: S3 object key for the document
             document_type: Type of document to extract from
+            force_reprocess: Bypass cached OCR results
+            ocr_result: Textract result already produced for this document;
+                if omitted the document is analyzed (or read from the OCR cache)
+            on_field: Called with each field as soon as it is known: rule
+                fields first, then AI fields as their values stream in
 
         Returns:
             Tuple of (structured_data, extracted_fields, raw_text)
@@ -45,38 +117,359 @@ class DataExtractor:
             },
         )
 
-        # TODO: Implement actual extraction
-        # 1. Extract text using Textract
-        # textract_result = await textract_service.analyze_document(s3_key)
-        # extracted_text = textract_result.get("text", "")
-        #
-        # 2. Use AI to extract structured data based on document type
-        # extraction_prompt = self._build_extraction_prompt(
-        #     extracted_text, document_type
-        # )
-        # ai_response = await ai_client.complete(
-        #     prompt=extraction_prompt,
-        #     system_prompt=self._get_system_prompt(document_type),
-        #     temperature=0.0,
-        # )
-        #
-        # 3. Parse AI response and structure data
-        # structured_data = self._parse_extraction(ai_response, document_type)
-        # extracted_fields = self._build_fields(structured_data)
-
-        # Stub implementation
-        logger.info(
-            "Data extraction completed (stub)", extra={"document_id": document_id}
+        if ocr_result is None:
+            ocr_result = await textract_service.analyze_document(
+                s3_key, force_reprocess=force_reprocess
+            )
+        extracted_text = ocr_result.get("text", "")
+
+        if not extracted_text.strip():
+            logger.warning(
+                "No text available for extraction", extra={"document_id": document_id}
+            )
+            return {}, [], extracted_text
+
+        rule_matches = rule_engine.extract(document_type, ocr_result)
+        model = EXTRACTION_MODELS.get(document_type)
+        missing = (
+            [name for name in model.model_fields if name not in rule_matches]
+            if model is not None
+            else None
         )
 
+        confidence = ocr_result.get("confidence") or DEFAULT_FIELD_CONFIDENCE
+        if on_field is not None and rule_matches:
+            rule_data = {name: match.value for name, match in rule_matches.items()}
+            for field in self._build_fields(rule_data, confidence, rule_matches):
+                on_field(field)
+
         structured_data: dict[str, Any] = {}
-        extracted_fields: list[ExtractedField] = []
-        raw_text = ""
+        sources: dict[str, PageChunk] = {}
+        chunks = self._page_chunks(ocr_result) if on_field is None else []
+        if (missing is None or missing) and chunks:
+            structured_data, sources = await self._map_reduce(
+                document_id, chunks, document_type, missing
+            )
+        elif missing is None or missing:
+            emitter = None
+            if on_field is not None:
+                emitter = self._field_emitter(
+                    document_type, confidence, missing, on_field
+                )
+            structured_data = await self._complete(
+                document_id, extracted_text, document_type, missing, emitter
+            )
+        else:
+            logger.info(
+                "All fields filled by extraction rules",
+                extra={"document_id": document_id},
+            )
+
+        if rule_matches:
+            structured_data.update(
+                {name: match.value for name, match in rule_matches.items()}
+            )
+            structured_data = self._validate(structured_data, document_type)
+        extracted_fields = self._build_fields(
+            structured_data, confidence, rule_matches, sources
+        )
+
+        logger.info(
+            "Data extraction completed",
+            extra={
+                "document_id": document_id,
+                "field_count": len(extracted_fields),
+                "rule_field_count": len(rule_matches),
+            },
+        )
+
+        return structured_data, extracted_fields, extracted_text
+
+    def _page_chunks(self, ocr_result: dict[str, Any]) -> list[PageChunk]:
+        """
+        Page chunks for a map/reduce extraction.
+
+        Args:
+            ocr_result: Textract result with per-page text
+
+        Returns:
+            Two or more chunks, or an empty list when the document fits in
+            one prompt (or map/reduce is disabled)
+        """
+        max_chars = settings.extraction_prompt_max_tokens * CHARS_PER_TOKEN
+        pages = ocr_result.get("pages") or []
+        if (
+            not settings.extraction_map_reduce_enabled
+            or not max_chars
+            or len(pages) < 2
+            or len(ocr_result.get("text", "")) <= max_chars
+        ):
+            return []
+        chunks = chunk_pages(pages, max_chars, settings.extraction_map_max_chunks)
+        return chunks if len(chunks) > 1 else []
+
+    async def _map_reduce(
+        self,
+        document_id: str,
+        chunks: list[PageChunk],
+        document_type: DocumentType,
+        fields: list[str] | None,
+    ) -> tuple[dict[str, Any], dict[str, PageChunk]]:
+        """
+        Extract page chunks concurrently and merge the results.
+
+        Each field is taken from the chunk with the highest OCR confidence
+        that found a value for it; ties go to the earlier pages, where
+        identity and clearance details usually sit.
+
+        Args:
+            document_id: Unique identifier for the document
+            chunks: Page chunks in page order
+            document_type: Type of document
+            fields: Schema fields to request (None for the whole schema)
+
+        Returns:
+            Tuple of (merged structured data, chunk each field came from)
+
+        Raises:
+            ExtractionError: If the AI providers fail for any chunk
+        """
+        logger.info(
+            "Extracting document in page chunks",
+            extra={
+                "document_id": document_id,
+                "chunks": [chunk.pages for chunk in chunks],
+            },
+        )
+        results = await asyncio.gather(
+            *(
+                self._complete(document_id, chunk.text, document_type, fields)
+                for chunk in chunks
+            )
+        )
+
+        merged: dict[str, Any] = {}
+        sources: dict[str, PageChunk] = {}
+        for chunk, data in zip(chunks, results, strict=True):
+            for name, value in data.items():
+                if value is None or value == [] or value == "":
+                    continue
+                if name not in sources or chunk.confidence > sources[name].confidence:
+                    merged[name] = value
+                    sources[name] = chunk
+        return self._validate(merged, document_type), sources
+
+    async def _complete(
+        self,
+        document_id: str,
+        text: str,
+        document_type: DocumentType,
+        fields: list[str] | None,
+        on_field: Callable[[str, Any], None] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Ask the AI for the fields the rules could not fill.
+
+        Args:
+            document_id: Unique identifier for the document
+            text: Extracted document text
+            document_type: Type of document
+            fields: Schema fields to request (None for the whole schema)
+            on_field: When given, the completion is streamed and this is
+                called with each (name, value) as soon as it is parsed
+
+        Returns:
+            Structured data parsed from the AI response
+
+        Raises:
+            ExtractionError: If the AI providers fail
+        """
+        compacted = compact_text(
+            text,
+            self._field_descriptions(document_type, fields),
+            settings.extraction_prompt_max_tokens,
+        )
+        if compacted.dropped:
+            logger.info(
+                "Extraction prompt compacted",
+                extra={
+                    "document_id": document_id,
+                    "kept_chunks": [chunk.index for chunk in compacted.kept],
+                    "dropped_chunks": [chunk.index for chunk in compacted.dropped],
+                    "dropped_chars": compacted.dropped_chars,
+                },
+            )
+
+        try:
+            if (
+                on_field is None
+                and settings.extraction_batch_enabled
+                and document_type in EXTRACTION_MODELS
+                and len(compacted.text) <= settings.extraction_batch_max_chars
+            ):
+                return await self.batcher.submit(
+                    document_type, BatchItem(document_id, compacted.text, fields)
+                )
+            return await self._request(compacted.text, document_type, fields, on_field)
+        except AIProviderError as e:
+            raise ExtractionError(
+                f"Data extraction failed: {e.message}",
+                details={"document_id": document_id, "document_type": document_type},
+            ) from e
+
+    async def _request(
+        self,
+        text: str,
+        document_type: DocumentType,
+        fields: list[str] | None,
+        on_field: Callable[[str, Any], None] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Run a single-document extraction prompt.
+
+        Args:
+            text: Document text to send
+            document_type: Type of document
+            fields: Schema fields to request (None for the whole schema)
+            on_field: When given, the completion is streamed and this is
+                called with each (name, value) as soon as it is parsed
+
+        Returns:
+            Structured data parsed from the AI response
+
+        Raises:
+            AIProviderError: If the AI providers fail
+        """
+        request: dict[str, Any] = {
+            "prompt": self._build_extraction_prompt(text, document_type, fields),
+            "system_prompt": self._get_system_prompt(document_type),
+            "temperature": 0.0,
+            "prompt_version": EXTRACTION_PROMPT_VERSION,
+        }
+        if on_field is None:
+            ai_response = await ai_client.complete(**request)
+        else:
+            parser = IncrementalJSONParser()
+            parts = []
+            async for text_part in ai_client.stream(**request):
+                parts.append(text_part)
+                for name, value in parser.feed(text_part):
+                    on_field(name, value)
+            ai_response = "".join(parts)
+        return self._parse_extraction(ai_response, document_type)
+
+    async def _complete_batch(
+        self, document_type: DocumentType, items: list[BatchItem]
+    ) -> list[dict[str, Any] | BaseException]:
+        """
+        Extract several documents of one type with a single prompt.
+
+        The response is split back per document ID. Documents missing from
+        the response, or the whole batch if the response cannot be parsed,
+        fall back to single-document prompts.
+
+        Args:
+            document_type: Type shared by the documents
+            items: Documents to extract
+
+        Returns:
+            Structured data (or the failure) per item, in order
 
-        return structured_data, extracted_fields, raw_text
+        Raises:
+            AIProviderError: If the AI providers fail for the batch
+        """
+        if len(items) == 1:
+            item = items[0]
+            return [await self._request(item.text, document_type, item.fields)]
+
+        requested = {
+            name
+            for item in items
+            for name in (item.fields or EXTRACTION_MODELS[document_type].model_fields)
+        }
+        ai_response = await ai_client.complete(
+            prompt=self._build_batch_prompt(items, document_type, requested),
+            system_prompt=self._get_batch_system_prompt(document_type),
+            temperature=0.0,
+            prompt_version=EXTRACTION_PROMPT_VERSION,
+        )
+        data = extract_json_object(ai_response) or {}
+
+        batched: list[dict[str, Any] | None] = []
+        for item in items:
+            document = data.get(item.document_id)
+            if not isinstance(document, dict):
+                batched.append(None)
+                continue
+            if item.fields is not None:
+                document = {k: v for k, v in document.items() if k in item.fields}
+            batched.append(self._validate(document, document_type))
+
+        retry = [
+            item for item, result in zip(items, batched, strict=True) if result is None
+        ]
+        retried: Iterator[dict[str, Any] | BaseException] = iter([])
+        if retry:
+            logger.warning(
+                "Batched extraction incomplete; retrying documents singly",
+                extra={
+                    "document_type": document_type,
+                    "document_ids": [item.document_id for item in retry],
+                },
+            )
+            retried = iter(
+                await asyncio.gather(
+                    *(
+                        self._request(item.text, document_type, item.fields)
+                        for item in retry
+                    ),
+                    return_exceptions=True,
+                )
+            )
+        return [next(retried) if result is None else result for result in batched]
+
+    def _field_emitter(
+        self,
+        document_type: DocumentType,
+        confidence: float,
+        fields: list[str] | None,
+        on_field: Callable[[ExtractedField], None],
+    ) -> Callable[[str, Any], None]:
+        """
+        Adapt streamed (name, value) pairs into validated extracted fields.
+
+        Pairs for fields that were not requested, or whose value fails the
+        schema, are not emitted.
+        """
+
+        def emit(name: str, value: Any) -> None:
+            if fields is not None and name not in fields:
+                return
+            validated = self._validate({name: value}, document_type)
+            for field in self._build_fields({name: validated.get(name)}, confidence):
+                on_field(field)
+
+        return emit
+
+    @staticmethod
+    def _field_descriptions(
+        document_type: DocumentType, fields: list[str] | None
+    ) -> list[str]:
+        """Names and descriptions of the fields requested from the AI."""
+        model = EXTRACTION_MODELS.get(document_type)
+        if model is None:
+            return [document_type.value]
+        return [
+            f"{name} {info.description}"
+            for name, info in model.model_fields.items()
+            if fields is None or name in fields
+        ]
 
     def _build_extraction_prompt(
-        self, text: str, document_type: DocumentType
+        self,
+        text: str,
+        document_type: DocumentType,
+        fields: list[str] | None = None,
     ) -> str:
         """
         Build extraction prompt based on document type.
@@ -84,11 +477,11 @@ class DataExtractor:
         Args:
             text: Extracted document text
             document_type: Type of document
+            fields: Schema fields to request (None for the whole schema)
 
         Returns:
             Formatted extraction prompt
         """
-        # TODO: Implement document-type-specific prompts
         prompts = {
             DocumentType.MEDICAL_CLEARANCE: (
                 "Extract medical clearance information including fighter name, "
@@ -105,8 +498,73 @@ class DataExtractor:
         }
 
         prompt_template = prompts.get(document_type, "Extract relevant information")
+
+        model = EXTRACTION_MODELS.get(document_type)
+        if model is not None:
+            field_lines = "\n".join(
+                f"- {name}: {info.description}"
+                for name, info in model.model_fields.items()
+                if fields is None or name in fields
+            )
+            prompt_template += (
+                "\nRespond with a JSON object containing these fields "
+                "(use null when a value is not present, dates as YYYY-MM-DD):\n"
+                f"{field_lines}"
+            )
+        else:
+            prompt_template += "\nRespond with a flat JSON object of field values."
+
         return f"{prompt_template}\n\nDocument text:\n{text}"
 
+    def _build_batch_prompt(
+        self, items: list[BatchItem], document_type: DocumentType, fields: set[str]
+    ) -> str:
+        """
+        Build one extraction prompt covering several documents.
+
+        Args:
+            items: Documents to extract
+            document_type: Type shared by the documents
+            fields: Schema fields to request for every document
+
+        Returns:
+            Formatted multi-document prompt
+        """
+        model = EXTRACTION_MODELS[document_type]
+        field_lines = "\n".join(
+            f"- {name}: {info.description}"
+            for name, info in model.model_fields.items()
+            if name in fields
+        )
+        documents = "\n\n".join(
+            f"### Document {json.dumps(item.document_id)}\n{item.text}"
+            for item in items
+        )
+        return (
+            f"Extract these fields from each of the {len(items)} documents below "
+            "(use null when a value is not present, dates as YYYY-MM-DD):\n"
+            f"{field_lines}\n"
+            "Respond with a JSON object mapping each document ID to an object "
+            "of its fields.\n\n"
+            f"{documents}"
+        )
+
+    def _get_batch_system_prompt(self, document_type: DocumentType) -> str:
+        """
+        Get system prompt for multi-document extraction.
+
+        Args:
+            document_type: Type shared by the documents
+
+        Returns:
+            System prompt for AI
+        """
+        return (
+            self._get_system_prompt(document_type)
+            + " Each document is extracted independently: never copy a value "
+            "from one document to another."
+        )
+
     def _get_system_prompt(self, document_type: DocumentType) -> str:
         """
         Get system prompt for extraction based on document type.
@@ -117,8 +575,12 @@ class DataExtractor:
         Returns:
             System prompt for AI
         """
-        # TODO: Implement document-type-specific system prompts
-        return "You are a data extraction assistant for combat sports documents."
+        return (
+            "You are a data extraction assistant for combat sports documents. "
+            f"You extract fields from {document_type.value.replace('_', ' ')} "
+            "documents and respond with a single JSON object and nothing else. "
+            "Never guess values that are not present in the text."
+        )
 
     def _parse_extraction(
         self, ai_response: str, document_type: DocumentType
@@ -126,6 +588,9 @@ class DataExtractor:
         """
         Parse AI response into structured data.
 
+        Values that fail schema validation are dropped rather than failing
+        the whole extraction.
+
         Args:
             ai_response: Raw AI response
             document_type: Type of document
@@ -133,23 +598,95 @@ class DataExtractor:
         Returns:
             Structured data dictionary
         """
-        # TODO: Implement actual parsing logic
-        return {}
+        data = extract_json_object(ai_response)
+        if data is None:
+            logger.warning(
+                "Unparseable extraction response",
+                extra={"document_type": document_type},
+            )
+            return {}
+
+        return self._validate(data, document_type)
+
+    def _validate(
+        self, data: dict[str, Any], document_type: DocumentType
+    ) -> dict[str, Any]:
+        """
+        Validate data against the document type's schema.
+
+        Args:
+            data: Field values
+            document_type: Type of document
+
+        Returns:
+            Schema-conformant data (unchanged for types without a schema)
+        """
+        model = EXTRACTION_MODELS.get(document_type)
+        if model is None:
+            return data
+
+        data = {k: v for k, v in data.items() if k in model.model_fields}
+        try:
+            return model.model_validate(data).model_dump()
+        except ValidationError as e:
+            invalid = {str(error["loc"][0]) for error in e.errors() if error["loc"]}
+            logger.warning(
+                "Dropping invalid extracted values",
+                extra={"document_type": document_type, "fields": sorted(invalid)},
+            )
+            data = {k: v for k, v in data.items() if k not in invalid}
+            return model.model_validate(data).model_dump()
 
     def _build_fields(
-        self, structured_data: dict[str, Any]
+        self,
+        structured_data: dict[str, Any],
+        confidence: float,
+        rule_matches: dict[str, FieldMatch] | None = None,
+        sources: dict[str, PageChunk] | None = None,
     ) -> list[ExtractedField]:
         """
         Build extracted fields list from structured data.
 
         Args:
             structured_data: Structured data dictionary
+            confidence: Confidence assigned to AI-extracted fields
+            rule_matches: Fields filled by extraction rules, which carry
+                their own confidence
+            sources: Page chunk each AI field came from in a map/reduce
+                extraction, whose confidence replaces the document's
 
         Returns:
             List of extracted fields with metadata
         """
-        # TODO: Implement field building
-        return []
+        rule_matches = rule_matches or {}
+        sources = sources or {}
+        fields = []
+        for name, value in structured_data.items():
+            if value is None or value == [] or value == "":
+                continue
+            if isinstance(value, list):
+                value = "; ".join(str(item) for item in value)
+            elif not isinstance(value, str | int | float | bool | date):
+                value = str(value)
+            match = rule_matches.get(name)
+            source = sources.get(name)
+            field_confidence = confidence
+            source_location: dict[str, Any] | None = None
+            if match:
+                field_confidence = match.confidence
+                source_location = {"rule": match.rule}
+            elif source:
+                field_confidence = source.confidence or confidence
+                source_location = {"pages": source.pages}
+            fields.append(
+                ExtractedField(
+                    field_name=name,
+                    value=value,
+                    confidence=min(max(field_confidence, 0.0), 1.0),
+                    source_location=source_location,
+                )
+            )
+        return fields
 
 
 # Global extractor instance
@@ -0,0 +1,105 @@
+"""Pre-OCR clean-up of photographed documents."""
+
+import io
+from typing import cast
+
+try:
+    from PIL import Image, ImageChops, ImageOps, UnidentifiedImageError
+
+    HAS_PILLOW = True
+except ImportError:  # Pillow is optional; without it images go to Textract as-is
+    HAS_PILLOW = False
+
+try:  # the optional "heic" extra lets Pillow decode HEIC photos
+    from pillow_heif import register_heif_opener
+except ImportError:
+    pass
+else:
+    register_heif_opener()
+
+# Extensions treated as single photographed pages
+IMAGE_EXTENSIONS: tuple[str, ...] = (".jpg", ".jpeg", ".png", ".heic", ".heif")
+
+# Formats Textract cannot read, which must be converted whatever their size
+UNSUPPORTED_EXTENSIONS: tuple[str, ...] = (".heic", ".heif")
+
+# Grey-level difference from the background that counts as page content
+CROP_THRESHOLD = 40
+
+# Margin kept around the detected page, as a fraction of its size
+CROP_MARGIN = 0.02
+
+# Crops keeping more than this fraction of the area are not worth doing
+MIN_CROP_GAIN = 0.9
+
+
+def is_available() -> bool:
+    """Whether Pillow is installed."""
+    return HAS_PILLOW
+
+
+def preprocess_image(
+    content: bytes, max_edge_px: int, jpeg_quality: int
+) -> bytes | None:
+    """
+    Shrink a photographed document to what OCR needs.
+
+    Applies the EXIF orientation, downsamples so the long edge is at most
+    ``max_edge_px`` (about 200 DPI for a letter page at 2400 px), crops a
+    uniform background around the page, converts to greyscale and
+    recompresses as JPEG. Runs in a worker process.
+
+    Args:
+        content: Original image bytes (JPEG, PNG, or HEIC with pillow-heif)
+        max_edge_px: Longest edge of the output
+        jpeg_quality: JPEG quality of the output (1-95)
+
+    Returns:
+        JPEG bytes, or None if the image cannot be decoded
+    """
+    try:
+        image: Image.Image = Image.open(io.BytesIO(content))
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((max_edge_px, max_edge_px), Image.Resampling.LANCZOS)
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError, ValueError):
+        return None
+
+    image = _crop_background(image.convert("L"))
+    output = io.BytesIO()
+    image.save(output, format="JPEG", quality=jpeg_quality, optimize=True)
+    return output.getvalue()
+
+
+def _crop_background(image: "Image.Image") -> "Image.Image":
+    """
+    Crop to the region that differs from the background.
+
+    The background grey is taken from the image corners, which for a phone
+    photo of a document are the table or hand around it. The image must be
+    greyscale ("L"), so each pixel is a single int.
+    """
+    width, height = image.size
+    corners = sorted(
+        cast(int, image.getpixel((x, y)))
+        for x in (0, width - 1)
+        for y in (0, height - 1)
+    )
+    background = Image.new("L", image.size, (corners[1] + corners[2]) // 2)
+    mask = ImageChops.difference(image, background).point(
+        lambda value: 255 if value > CROP_THRESHOLD else 0
+    )
+    box = mask.getbbox()
+    if box is None:
+        return image
+
+    left, top, right, bottom = box
+    margin_x, margin_y = int(width * CROP_MARGIN), int(height * CROP_MARGIN)
+    box = (
+        max(left - margin_x, 0),
+        max(top - margin_y, 0),
+        min(right + margin_x, width),
+        min(bottom + margin_y, height),
+    )
+    if (box[2] - box[0]) * (box[3] - box[1]) > MIN_CROP_GAIN * width * height:
+        return image
+    return image.crop(box)
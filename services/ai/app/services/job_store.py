@@ -0,0 +1,532 @@
+"""Durable SQLite-backed job queue with leases, retries and dead-lettering."""
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from app.core.logging import get_logger
+from app.models.document import (
+    DocumentStatusResponse,
+    DocumentType,
+    ProcessingStage,
+    ProcessingStatus,
+)
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    document_id TEXT NOT NULL,
+    s3_key TEXT NOT NULL,
+    user_id TEXT,
+    batch_id TEXT,
+    metadata TEXT NOT NULL DEFAULT '{}',
+    status TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    progress INTEGER NOT NULL DEFAULT 0,
+    document_type TEXT,
+    extraction_complete INTEGER NOT NULL DEFAULT 0,
+    error_message TEXT,
+    result TEXT NOT NULL DEFAULT '{}',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    dead_lettered INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires_at REAL,
+    available_at REAL NOT NULL,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    completed_at TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, available_at);
+CREATE INDEX IF NOT EXISTS jobs_document ON jobs (document_id, created_at);
+CREATE INDEX IF NOT EXISTS jobs_updated ON jobs (updated_at);
+CREATE INDEX IF NOT EXISTS jobs_batch ON jobs (batch_id);
+"""
+
+
+@dataclass
+class JobRecord:
+    """State of one document processing job."""
+
+    job_id: str
+    document_id: str
+    s3_key: str
+    user_id: str | None = None
+    batch_id: str | None = None
+    metadata: dict[str, Any] = field(default_factory=dict)
+    status: ProcessingStatus = ProcessingStatus.PENDING
+    stage: ProcessingStage = ProcessingStage.QUEUED
+    progress: int = 0
+    document_type: DocumentType | None = None
+    extraction_complete: bool = False
+    error_message: str | None = None
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: datetime | None = None
+    completed_at: datetime | None = None
+    result: dict[str, Any] = field(default_factory=dict)
+    attempts: int = 0
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job has reached a terminal status."""
+        return self.status in (ProcessingStatus.COMPLETED, ProcessingStatus.FAILED)
+
+    def to_status_response(self) -> DocumentStatusResponse:
+        """Convert the record into the public status response."""
+        return DocumentStatusResponse(
+            document_id=self.document_id,
+            status=self.status,
+            stage=self.stage,
+            progress=self.progress,
+            document_type=self.document_type,
+            extraction_complete=self.extraction_complete,
+            error_message=self.error_message,
+            started_at=self.started_at,
+            completed_at=self.completed_at,
+            metadata={"job_id": self.job_id, **self.result},
+        )
+
+
+class SQLiteJobQueue:
+    """
+    File-backed job queue shared between the API and worker processes.
+
+    Workers lease a job for ``lease_seconds``; a worker that dies without
+    completing or renewing its lease lets the job become visible again
+    once the lease expires. Failed attempts are retried with a delay until
+    ``max_attempts`` is reached, after which the job is dead-lettered.
+    All methods are blocking and thread-safe.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        lease_seconds: float,
+        max_attempts: int,
+        retry_delay_seconds: float = 5.0,
+    ) -> None:
+        """
+        Initialize the queue, creating the database if needed.
+
+        Args:
+            path: SQLite database file
+            lease_seconds: Visibility timeout for a leased job
+            max_attempts: Attempts before a job is dead-lettered
+            retry_delay_seconds: Delay before a failed attempt is retried
+        """
+        self.path = Path(path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay_seconds = retry_delay_seconds
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None, timeout=30
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def enqueue(self, job: JobRecord) -> None:
+        """Add a new pending job."""
+        self.enqueue_many([job])
+
+    def enqueue_many(self, jobs: list[JobRecord]) -> None:
+        """Add new pending jobs in a single transaction."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    """
+                    INSERT INTO jobs (
+                        job_id, document_id, s3_key, user_id, batch_id, metadata,
+                        status, stage, progress, available_at, created_at, updated_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    [
+                        (
+                            job.job_id,
+                            job.document_id,
+                            job.s3_key,
+                            job.user_id,
+                            job.batch_id,
+                            json.dumps(job.metadata, default=str),
+                            job.status.value,
+                            job.stage.value,
+                            job.progress,
+                            now,
+                            job.created_at.isoformat(),
+                            now,
+                        )
+                        for job in jobs
+                    ],
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def pending_count(self) -> int:
+        """Number of jobs waiting to be leased."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = ?",
+                (ProcessingStatus.PENDING.value,),
+            ).fetchone()
+        return int(row[0])
+
+    def lease(self, worker_id: str) -> JobRecord | None:
+        """
+        Lease the oldest available job.
+
+        Pending jobs and processing jobs whose lease has expired are
+        eligible. Expired jobs that have used up their attempts are
+        dead-lettered instead of being handed out again.
+
+        Args:
+            worker_id: Identifier of the leasing worker
+
+        Returns:
+            The leased job, or None if nothing is available
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                while True:
+                    row = self._conn.execute(
+                        """
+                        SELECT * FROM jobs
+                        WHERE (status = ? AND available_at <= ?)
+                           OR (status = ? AND lease_expires_at < ?)
+                        ORDER BY available_at
+                        LIMIT 1
+                        """,
+                        (
+                            ProcessingStatus.PENDING.value,
+                            now,
+                            ProcessingStatus.PROCESSING.value,
+                            now,
+                        ),
+                    ).fetchone()
+                    if row is None:
+                        self._conn.execute("COMMIT")
+                        return None
+
+                    if row["attempts"] >= self.max_attempts:
+                        self._dead_letter(row["job_id"], "Lease expired too many times")
+                        continue
+
+                    self._conn.execute(
+                        """
+                        UPDATE jobs SET status = ?, attempts = attempts + 1,
+                            lease_owner = ?, lease_expires_at = ?, updated_at = ?
+                        WHERE job_id = ?
+                        """,
+                        (
+                            ProcessingStatus.PROCESSING.value,
+                            worker_id,
+                            now + self.lease_seconds,
+                            now,
+                            row["job_id"],
+                        ),
+                    )
+                    self._conn.execute("COMMIT")
+                    job = self._to_record(row)
+                    job.status = ProcessingStatus.PROCESSING
+                    job.attempts += 1
+                    return job
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        """
+        Extend a job's lease.
+
+        Returns:
+            False if the lease was lost to another worker
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                """
+                UPDATE jobs SET lease_expires_at = ?
+                WHERE job_id = ? AND lease_owner = ? AND status = ?
+                """,
+                (
+                    now + self.lease_seconds,
+                    job_id,
+                    worker_id,
+                    ProcessingStatus.PROCESSING.value,
+                ),
+            )
+        return cursor.rowcount == 1
+
+    def save(self, job: JobRecord, worker_id: str) -> bool:
+        """
+        Persist a job's progress fields.
+
+        Args:
+            job: The leased job
+            worker_id: Worker holding the lease
+
+        Returns:
+            False if the lease was lost, in which case nothing is written
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                """
+                UPDATE jobs SET status = ?, stage = ?, progress = ?,
+                    document_type = ?, extraction_complete = ?, error_message = ?,
+                    result = ?, started_at = ?, completed_at = ?, updated_at = ?
+                WHERE job_id = ? AND lease_owner = ?
+                """,
+                (
+                    job.status.value,
+                    job.stage.value,
+                    job.progress,
+                    job.document_type.value if job.document_type else None,
+                    int(job.extraction_complete),
+                    job.error_message,
+                    json.dumps(job.result, default=str),
+                    job.started_at.isoformat() if job.started_at else None,
+                    job.completed_at.isoformat() if job.completed_at else None,
+                    time.time(),
+                    job.job_id,
+                    worker_id,
+                ),
+            )
+        return cursor.rowcount == 1
+
+    def release(
+        self,
+        job: JobRecord,
+        worker_id: str,
+        retry: bool,
+        error_message: str | None = None,
+    ) -> bool:
+        """
+        Give up a leased job after a failed or interrupted attempt.
+
+        Args:
+            job: The leased job
+            worker_id: Worker holding the lease
+            retry: Whether the attempt may be retried
+            error_message: Error recorded on the job
+
+        Returns:
+            True if the job was re-queued (or already belongs to another
+            worker, which leaves it untouched), False if it was dead-lettered
+        """
+        with self._lock:
+            owner = self._conn.execute(
+                "SELECT lease_owner FROM jobs WHERE job_id = ?", (job.job_id,)
+            ).fetchone()
+            if owner is None or owner["lease_owner"] != worker_id:
+                return True
+            if retry and job.attempts < self.max_attempts:
+                now = time.time()
+                self._conn.execute(
+                    """
+                    UPDATE jobs SET status = ?, stage = ?, progress = 0,
+                        error_message = ?, lease_owner = NULL,
+                        lease_expires_at = NULL, available_at = ?, updated_at = ?
+                    WHERE job_id = ?
+                    """,
+                    (
+                        ProcessingStatus.PENDING.value,
+                        ProcessingStage.QUEUED.value,
+                        error_message,
+                        now + self.retry_delay_seconds,
+                        now,
+                        job.job_id,
+                    ),
+                )
+                return True
+            self._dead_letter(job.job_id, error_message or "Processing failed")
+            return False
+
+    def requeue(self, job: JobRecord, worker_id: str) -> None:
+        """
+        Return an interrupted job to the queue without using up an attempt.
+
+        Does nothing if ``worker_id`` no longer holds the job's lease.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """
+                UPDATE jobs SET status = ?, stage = ?, progress = 0,
+                    attempts = MAX(attempts - 1, 0), lease_owner = NULL,
+                    lease_expires_at = NULL, started_at = NULL,
+                    available_at = ?, updated_at = ?
+                WHERE job_id = ? AND status = ? AND lease_owner = ?
+                """,
+                (
+                    ProcessingStatus.PENDING.value,
+                    ProcessingStage.QUEUED.value,
+                    now,
+                    now,
+                    job.job_id,
+                    ProcessingStatus.PROCESSING.value,
+                    worker_id,
+                ),
+            )
+
+    def get(self, job_id: str) -> JobRecord | None:
+        """Get a job by ID."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return self._to_record(row) if row else None
+
+    def get_latest(self, document_id: str) -> JobRecord | None:
+        """Get the most recently created job for a document."""
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT * FROM jobs WHERE document_id = ?
+                ORDER BY created_at DESC LIMIT 1
+                """,
+                (document_id,),
+            ).fetchone()
+        return self._to_record(row) if row else None
+
+    def active_jobs(self, document_ids: list[str]) -> dict[str, JobRecord]:
+        """
+        Get unfinished jobs for documents.
+
+        Args:
+            document_ids: Documents to look up
+
+        Returns:
+            Mapping of document ID to its pending or processing job
+        """
+        active: dict[str, JobRecord] = {}
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(document_ids), 500):
+            chunk = document_ids[start : start + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            with self._lock:
+                rows = self._conn.execute(
+                    f"""
+                    SELECT * FROM jobs
+                    WHERE document_id IN ({placeholders}) AND status IN (?, ?)
+                    """,
+                    (
+                        *chunk,
+                        ProcessingStatus.PENDING.value,
+                        ProcessingStatus.PROCESSING.value,
+                    ),
+                ).fetchall()
+            active.update((row["document_id"], self._to_record(row)) for row in rows)
+        return active
+
+    def batch_jobs(self, batch_id: str) -> list[JobRecord]:
+        """Get every job submitted as part of a batch."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM jobs WHERE batch_id = ? ORDER BY created_at",
+                (batch_id,),
+            ).fetchall()
+        return [self._to_record(row) for row in rows]
+
+    def updated_since(self, since: float) -> tuple[float, list[JobRecord]]:
+        """
+        Get jobs updated after a point in time.
+
+        Args:
+            since: Cursor returned by the previous call (epoch seconds)
+
+        Returns:
+            Tuple of (new cursor, updated jobs in update order)
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM jobs WHERE updated_at > ? ORDER BY updated_at",
+                (since,),
+            ).fetchall()
+        if not rows:
+            return since, []
+        return rows[-1]["updated_at"], [self._to_record(row) for row in rows]
+
+    def dead_letters(self, limit: int = 100) -> list[JobRecord]:
+        """List dead-lettered jobs, most recent first."""
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT * FROM jobs WHERE dead_lettered = 1
+                ORDER BY updated_at DESC LIMIT ?
+                """,
+                (limit,),
+            ).fetchall()
+        return [self._to_record(row) for row in rows]
+
+    def _dead_letter(self, job_id: str, error_message: str) -> None:
+        """Mark a job as permanently failed (caller holds the lock)."""
+        logger.warning(
+            "Job dead-lettered", extra={"job_id": job_id, "error": error_message}
+        )
+        now = time.time()
+        self._conn.execute(
+            """
+            UPDATE jobs SET status = ?, stage = ?, dead_lettered = 1,
+                error_message = ?, lease_owner = NULL, lease_expires_at = NULL,
+                completed_at = ?, updated_at = ?
+            WHERE job_id = ?
+            """,
+            (
+                ProcessingStatus.FAILED.value,
+                ProcessingStage.FAILED.value,
+                error_message,
+                datetime.utcnow().isoformat(),
+                now,
+                job_id,
+            ),
+        )
+
+    @staticmethod
+    def _to_record(row: sqlite3.Row) -> JobRecord:
+        """Convert a database row into a job record."""
+
+        def parse_time(value: str | None) -> datetime | None:
+            return datetime.fromisoformat(value) if value else None
+
+        result: dict[str, Any] = json.loads(row["result"])
+        return JobRecord(
+            job_id=row["job_id"],
+            document_id=row["document_id"],
+            s3_key=row["s3_key"],
+            user_id=row["user_id"],
+            batch_id=row["batch_id"],
+            metadata=json.loads(row["metadata"]),
+            status=ProcessingStatus(row["status"]),
+            stage=ProcessingStage(row["stage"]),
+            progress=row["progress"],
+            document_type=(
+                DocumentType(row["document_type"]) if row["document_type"] else None
+            ),
+            extraction_complete=bool(row["extraction_complete"]),
+            error_message=row["error_message"],
+            created_at=datetime.fromisoformat(row["created_at"]),
+            started_at=parse_time(row["started_at"]),
+            completed_at=parse_time(row["completed_at"]),
+            result=result,
+            attempts=row["attempts"],
+        )
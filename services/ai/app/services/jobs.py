@@ -0,0 +1,792 @@
+"""Document processing job engine (in-process or SQLite-backed)."""
+
+import asyncio
+import os
+import socket
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+from typing import Any
+
+from app.config import settings
+from app.core.exceptions import (
+    AIProviderError,
+    AIServiceException,
+    JobQueueFullError,
+    TextractError,
+)
+from app.core.executor import BlockingExecutor
+from app.core.logging import get_logger
+from app.models.document import (
+    BatchStatusResponse,
+    DocumentProcessRequest,
+    DocumentType,
+    ProcessingStage,
+    ProcessingStatus,
+)
+from app.services.events import JobEventBroadcaster
+from app.services.job_store import JobRecord, SQLiteJobQueue
+from app.services.pipeline import DocumentPipeline
+
+logger = get_logger(__name__)
+
+# Maximum seconds to wait for workers to stop during shutdown
+SHUTDOWN_GRACE_SECONDS = 5.0
+
+# Progress percentage reported once each stage has been reached
+STAGE_PROGRESS: dict[ProcessingStage, int] = {
+    ProcessingStage.QUEUED: 0,
+    ProcessingStage.STARTED: 5,
+    ProcessingStage.OCR: 40,
+    ProcessingStage.CLASSIFIED: 60,
+    ProcessingStage.EXTRACTED: 90,
+    ProcessingStage.COMPLETED: 100,
+}
+
+# Maximum batches whose membership is remembered for status queries
+BATCH_HISTORY_SIZE = 1000
+
+# Failures worth another attempt: upstream outages rather than bad documents
+RETRYABLE_ERRORS = (TextractError, AIProviderError)
+
+
+@dataclass
+class BatchSubmission:
+    """Outcome of submitting a batch of documents."""
+
+    batch_id: str
+    jobs: list[JobRecord] = field(default_factory=list)
+    existing: dict[str, JobRecord] = field(default_factory=dict)
+    duplicates: list[str] = field(default_factory=list)
+
+
+@dataclass
+class _Batch:
+    """Membership and fan-out limit of one in-process batch."""
+
+    job_ids: list[str]
+    slots: asyncio.Semaphore
+
+
+def summarize_batch(batch_id: str, jobs: Iterable[JobRecord]) -> BatchStatusResponse:
+    """
+    Aggregate the progress of a batch's jobs.
+
+    Args:
+        batch_id: Batch identifier
+        jobs: Jobs belonging to the batch
+
+    Returns:
+        Aggregate batch status
+    """
+    counts = dict.fromkeys(ProcessingStatus, 0)
+    total = progress = 0
+    failed_ids = []
+    for job in jobs:
+        total += 1
+        counts[job.status] += 1
+        progress += 100 if job.finished else job.progress
+        if job.status == ProcessingStatus.FAILED:
+            failed_ids.append(job.document_id)
+    done = counts[ProcessingStatus.COMPLETED] + counts[ProcessingStatus.FAILED]
+    return BatchStatusResponse(
+        batch_id=batch_id,
+        total=total,
+        pending=counts[ProcessingStatus.PENDING],
+        processing=counts[ProcessingStatus.PROCESSING],
+        completed=counts[ProcessingStatus.COMPLETED],
+        failed=counts[ProcessingStatus.FAILED],
+        progress=progress // total if total else 0,
+        finished=done == total,
+        failed_document_ids=failed_ids,
+    )
+
+
+def _dedupe(
+    requests: list[DocumentProcessRequest],
+) -> tuple[list[DocumentProcessRequest], list[str]]:
+    """Keep the first request per document ID, returning repeated IDs."""
+    unique: dict[str, DocumentProcessRequest] = {}
+    duplicates = []
+    for request in requests:
+        if request.document_id in unique:
+            duplicates.append(request.document_id)
+        else:
+            unique[request.document_id] = request
+    return list(unique.values()), duplicates
+
+
+class JobManager:
+    """
+    Asyncio worker pool that runs OCR, classification and extraction.
+
+    Jobs are placed on a bounded queue and processed by a fixed number of
+    worker tasks. Each job's record is updated as it passes through the
+    pipeline stages so status queries report live progress.
+    """
+
+    def __init__(
+        self,
+        worker_count: int,
+        queue_size: int,
+        history_size: int,
+        pipeline_factory: Callable[..., DocumentPipeline] = DocumentPipeline,
+        batch_concurrency: int = 2,
+    ) -> None:
+        """
+        Initialize the job manager.
+
+        Args:
+            worker_count: Number of concurrent worker tasks
+            queue_size: Maximum number of queued (not yet started) jobs
+            history_size: Number of finished jobs retained for status queries
+            pipeline_factory: Callable building a pipeline for one document
+            batch_concurrency: Maximum jobs of one batch queued or running
+                at once, so large batches leave workers for other requests
+        """
+        self.worker_count = worker_count
+        self.queue_size = queue_size
+        self.history_size = history_size
+        self.pipeline_factory = pipeline_factory
+        self.batch_concurrency = batch_concurrency
+        self._jobs: OrderedDict[str, JobRecord] = OrderedDict()
+        self._latest_by_document: dict[str, str] = {}
+        self._queue: asyncio.Queue[JobRecord] | None = None
+        self._workers: list[asyncio.Task[None]] = []
+        self._active: dict[str, JobRecord] = {}
+        self._batches: OrderedDict[str, _Batch] = OrderedDict()
+        self._feeders: set[asyncio.Task[None]] = set()
+        self.events = JobEventBroadcaster()
+
+    @property
+    def running(self) -> bool:
+        """Whether worker tasks are running."""
+        return any(not worker.done() for worker in self._workers)
+
+    def start(self) -> None:
+        """Start the worker tasks in the running event loop (idempotent)."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"document-worker-{i}")
+            for i in range(self.worker_count)
+        ]
+        # Re-queue jobs accepted or interrupted while the workers were stopped
+        batched: dict[str, list[JobRecord]] = {}
+        for job in self._jobs.values():
+            if job.status != ProcessingStatus.PENDING:
+                continue
+            if job.batch_id is not None and job.batch_id in self._batches:
+                batched.setdefault(job.batch_id, []).append(job)
+                continue
+            try:
+                self._queue.put_nowait(job)
+            except asyncio.QueueFull:
+                self._fail(job, "Document processing queue is full")
+        for batch_id, jobs in batched.items():
+            self._start_feeder(batch_id, jobs)
+        logger.info("Job workers started", extra={"worker_count": self.worker_count})
+
+    async def shutdown(self) -> None:
+        """
+        Stop the worker tasks.
+
+        Jobs interrupted mid-flight are returned to PENDING so they are
+        re-queued the next time the workers start. The wait is bounded so a
+        stuck worker cannot block process exit.
+        """
+        for task in (*self._workers, *self._feeders):
+            task.cancel()
+        if self._workers or self._feeders:
+            _, stuck = await asyncio.wait(
+                [*self._workers, *self._feeders], timeout=SHUTDOWN_GRACE_SECONDS
+            )
+            if stuck:
+                logger.warning(
+                    "Job workers did not stop in time", extra={"stuck": len(stuck)}
+                )
+        for job in self._active.values():
+            self._requeue(job)
+        self._active.clear()
+        self._workers = []
+        self._feeders.clear()
+        self._queue = None
+        logger.info("Job workers stopped")
+
+    async def submit(self, request: DocumentProcessRequest) -> JobRecord:
+        """
+        Queue a document for processing.
+
+        Args:
+            request: Document processing request
+
+        Returns:
+            The newly created job record
+
+        Raises:
+            JobQueueFullError: If the queue is at capacity or not running
+        """
+        job = self._new_job(request)
+        if self._queue is None:
+            raise JobQueueFullError("Document processing workers are not running")
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull as e:
+            raise JobQueueFullError(
+                "Document processing queue is full",
+                details={"queue_size": self.queue_size},
+            ) from e
+
+        self._jobs[job.job_id] = job
+        self._latest_by_document[job.document_id] = job.job_id
+        self._prune()
+        return job
+
+    async def submit_batch(
+        self, requests: list[DocumentProcessRequest]
+    ) -> BatchSubmission:
+        """
+        Accept a batch of documents for processing.
+
+        Requests are de-duplicated by document ID, and documents that
+        already have an unfinished job are not queued again. Accepted jobs
+        are fed to the shared queue by a per-batch feeder that keeps at
+        most ``batch_concurrency`` of them queued or running at once.
+
+        Args:
+            requests: Document processing requests
+
+        Returns:
+            The batch ID with its new, existing and duplicate documents
+
+        Raises:
+            JobQueueFullError: If the workers are not running
+        """
+        if self._queue is None:
+            raise JobQueueFullError("Document processing workers are not running")
+
+        unique, duplicates = _dedupe(requests)
+        submission = BatchSubmission(batch_id=str(uuid.uuid4()), duplicates=duplicates)
+        for request in unique:
+            current = await self.get_status(request.document_id)
+            if current is not None and not current.finished:
+                submission.existing[request.document_id] = current
+                continue
+            job = self._new_job(request, batch_id=submission.batch_id)
+            self._jobs[job.job_id] = job
+            self._latest_by_document[job.document_id] = job.job_id
+            submission.jobs.append(job)
+
+        self._start_feeder(submission.batch_id, submission.jobs)
+        while len(self._batches) > BATCH_HISTORY_SIZE:
+            self._batches.popitem(last=False)
+        self._prune()
+
+        logger.info(
+            "Document batch accepted",
+            extra={
+                "batch_id": submission.batch_id,
+                "accepted": len(submission.jobs),
+                "existing": len(submission.existing),
+                "duplicates": len(duplicates),
+            },
+        )
+        return submission
+
+    async def get_batch(self, batch_id: str) -> BatchStatusResponse | None:
+        """Get the aggregate progress of a batch."""
+        batch = self._batches.get(batch_id)
+        if batch is None:
+            return None
+        jobs = (self._jobs[job_id] for job_id in batch.job_ids if job_id in self._jobs)
+        return summarize_batch(batch_id, jobs)
+
+    async def get_job(self, job_id: str) -> JobRecord | None:
+        """Get a job record by job ID."""
+        return self._jobs.get(job_id)
+
+    async def get_status(self, document_id: str) -> JobRecord | None:
+        """Get the most recent job record for a document."""
+        job_id = self._latest_by_document.get(document_id)
+        return self._jobs.get(job_id) if job_id else None
+
+    @staticmethod
+    def _new_job(
+        request: DocumentProcessRequest, batch_id: str | None = None
+    ) -> JobRecord:
+        """Create the job record for a processing request."""
+        return JobRecord(
+            job_id=str(uuid.uuid4()),
+            document_id=request.document_id,
+            s3_key=request.s3_key,
+            user_id=request.user_id,
+            batch_id=batch_id,
+            metadata=request.metadata,
+        )
+
+    def _start_feeder(self, batch_id: str, jobs: list[JobRecord]) -> None:
+        """Start feeding a batch's pending jobs to the queue."""
+        slots = asyncio.Semaphore(self.batch_concurrency)
+        batch = self._batches.get(batch_id)
+        if batch is None:
+            self._batches[batch_id] = _Batch([job.job_id for job in jobs], slots)
+        else:
+            # Permits held by jobs interrupted at shutdown are gone with them
+            batch.slots = slots
+        task = asyncio.create_task(
+            self._feed(jobs, slots), name=f"batch-feeder-{batch_id}"
+        )
+        self._feeders.add(task)
+        task.add_done_callback(self._feeders.discard)
+
+    async def _feed(self, jobs: list[JobRecord], slots: asyncio.Semaphore) -> None:
+        """Queue a batch's jobs one fan-out slot at a time."""
+        assert self._queue is not None
+        queue = self._queue
+        for job in jobs:
+            await slots.acquire()
+            await queue.put(job)
+
+    def _prune(self) -> None:
+        """Drop the oldest finished jobs beyond the history size."""
+        excess = len(self._jobs) - self.history_size
+        if excess <= 0:
+            return
+        stale = list(
+            islice((j.job_id for j in self._jobs.values() if j.finished), excess)
+        )
+        for job_id in stale:
+            job = self._jobs.pop(job_id)
+            if self._latest_by_document.get(job.document_id) == job_id:
+                del self._latest_by_document[job.document_id]
+
+    def _advance(self, job: JobRecord, stage: ProcessingStage, **changes: Any) -> None:
+        """Move a job to a new stage, updating progress and other fields."""
+        job.stage = stage
+        if stage in STAGE_PROGRESS:
+            job.progress = STAGE_PROGRESS[stage]
+        for name, value in changes.items():
+            setattr(job, name, value)
+        logger.info(
+            "Job stage reached",
+            extra={
+                "job_id": job.job_id,
+                "document_id": job.document_id,
+                "stage": stage,
+                "progress": job.progress,
+            },
+        )
+        if self.events.has_subscribers(job.document_id):
+            self.events.publish(job.to_status_response())
+
+    async def _worker(self) -> None:
+        """Process queued jobs until cancelled."""
+        assert self._queue is not None
+        queue = self._queue
+        while True:
+            job = await queue.get()
+            try:
+                await self._run_job(job)
+            finally:
+                queue.task_done()
+
+    async def _run_job(self, job: JobRecord) -> None:
+        """Run one job with the processing timeout, recording any failure."""
+        self._active[job.job_id] = job
+        try:
+            # asyncio.timeout (unlike wait_for) never swallows a cancel
+            # that races with the job finishing.
+            async with asyncio.timeout(settings.processing_timeout_seconds):
+                await self._process(job)
+        except TimeoutError:
+            self._fail(job, "Processing timed out", retryable=True)
+        except AIServiceException as e:
+            retryable = isinstance(e, RETRYABLE_ERRORS) or isinstance(
+                e.__cause__, RETRYABLE_ERRORS
+            )
+            self._fail(job, e.message, retryable=retryable)
+        except Exception as e:
+            logger.error(
+                "Unexpected job failure",
+                extra={"job_id": job.job_id, "error": str(e)},
+                exc_info=True,
+            )
+            self._fail(job, "Unexpected processing error", retryable=True)
+        finally:
+            self._active.pop(job.job_id, None)
+            batch = self._batches.get(job.batch_id) if job.batch_id else None
+            if batch is not None:
+                batch.slots.release()
+            task = asyncio.current_task()
+            if task is not None and task.cancelling():
+                self._requeue(job)
+
+    async def _process(self, job: JobRecord) -> None:
+        """Run one job through the pipeline."""
+        self._advance(
+            job,
+            ProcessingStage.STARTED,
+            status=ProcessingStatus.PROCESSING,
+            started_at=datetime.utcnow(),
+        )
+        pipeline = self.pipeline_factory(job.document_id, job.s3_key)
+
+        await pipeline.ocr()
+        self._advance(job, ProcessingStage.OCR)
+
+        classification = await pipeline.classify()
+        self._advance(
+            job,
+            ProcessingStage.CLASSIFIED,
+            document_type=classification.document_type,
+            result={"classification_confidence": classification.confidence},
+        )
+
+        if classification.document_type == DocumentType.UNKNOWN:
+            self._fail(job, "Document type could not be determined")
+            return
+
+        data, fields, _ = await pipeline.extract(classification.document_type)
+        self._advance(
+            job,
+            ProcessingStage.EXTRACTED,
+            extraction_complete=True,
+            result={
+                **job.result,
+                "extracted_data": data,
+                "extracted_fields": [f.model_dump() for f in fields],
+            },
+        )
+
+        self._advance(
+            job,
+            ProcessingStage.COMPLETED,
+            status=ProcessingStatus.COMPLETED,
+            completed_at=datetime.utcnow(),
+            result={**job.result, "warnings": pipeline.validate(data)},
+        )
+
+    def _requeue(self, job: JobRecord) -> None:
+        """Return an interrupted job to PENDING so it runs again on restart."""
+        if job.finished:
+            return
+        logger.info("Job interrupted; re-queued", extra={"job_id": job.job_id})
+        job.status = ProcessingStatus.PENDING
+        job.stage = ProcessingStage.QUEUED
+        job.progress = STAGE_PROGRESS[ProcessingStage.QUEUED]
+        job.started_at = None
+
+    def _fail(self, job: JobRecord, message: str, retryable: bool = False) -> None:
+        """
+        Mark a job as failed.
+
+        In-process jobs are not retried, so ``retryable`` is ignored here.
+
+        Args:
+            job: The failed job
+            message: Error message recorded on the job
+            retryable: Whether the failure is transient
+        """
+        logger.warning(
+            "Document processing failed",
+            extra={"job_id": job.job_id, "document_id": job.document_id, "error": message},
+        )
+        self._advance(
+            job,
+            ProcessingStage.FAILED,
+            status=ProcessingStatus.FAILED,
+            error_message=message,
+            completed_at=datetime.utcnow(),
+        )
+
+
+class DurableJobManager(JobManager):
+    """
+    Job manager backed by a shared SQLite lease queue.
+
+    API processes create it with ``consume=False``: they only enqueue jobs
+    and read status. Worker processes (``python -m app.worker``) create it
+    with ``consume=True`` and run lease loops that pull jobs from the
+    queue, keep their leases alive while processing, and write every stage
+    transition back to the store. A worker that crashes simply lets its
+    leases expire so another worker picks the jobs up; jobs that keep
+    failing transiently are dead-lettered after the configured attempts.
+    """
+
+    def __init__(
+        self,
+        store: SQLiteJobQueue,
+        worker_count: int,
+        queue_size: int,
+        consume: bool,
+        poll_interval: float = 1.0,
+        pipeline_factory: Callable[..., DocumentPipeline] = DocumentPipeline,
+        worker_id: str | None = None,
+    ) -> None:
+        """
+        Initialize the durable job manager.
+
+        Args:
+            store: Shared job queue
+            worker_count: Number of concurrent lease loops when consuming
+            queue_size: Maximum number of pending jobs accepted
+            consume: Whether this process runs jobs or only enqueues them
+            poll_interval: Seconds between lease attempts on an empty queue
+            pipeline_factory: Callable building a pipeline for one document
+            worker_id: Lease owner name (defaults to host:pid)
+        """
+        super().__init__(
+            worker_count=worker_count,
+            queue_size=queue_size,
+            history_size=0,
+            pipeline_factory=pipeline_factory,
+        )
+        self.store = store
+        self.consume = consume
+        self.poll_interval = poll_interval
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._db = BlockingExecutor(max_workers=1, name="job-store")
+        self._watcher: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """
+        Start background tasks (idempotent).
+
+        Consuming processes run the lease loops; API processes run a single
+        watcher that relays stage transitions written by workers to
+        streaming subscribers.
+        """
+        if not self.consume:
+            if self._watcher is None or self._watcher.done():
+                self._watcher = asyncio.create_task(
+                    self._watch(), name="job-store-watcher"
+                )
+            return
+        if self.running:
+            return
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"document-worker-{i}")
+            for i in range(self.worker_count)
+        ]
+        logger.info(
+            "Durable job workers started",
+            extra={"worker_count": self.worker_count, "worker_id": self.worker_id},
+        )
+
+    async def shutdown(self) -> None:
+        """Stop the lease loops, returning interrupted jobs to the queue."""
+        if self._watcher is not None:
+            self._watcher.cancel()
+            await asyncio.wait([self._watcher], timeout=SHUTDOWN_GRACE_SECONDS)
+            self._watcher = None
+        await super().shutdown()
+        self._db.shutdown(wait=True)
+
+    async def submit(self, request: DocumentProcessRequest) -> JobRecord:
+        """
+        Enqueue a document for processing by the worker fleet.
+
+        Args:
+            request: Document processing request
+
+        Returns:
+            The newly created job record
+
+        Raises:
+            JobQueueFullError: If the backlog of pending jobs is at capacity
+        """
+        if await self._db.run(self.store.pending_count) >= self.queue_size:
+            raise JobQueueFullError(
+                "Document processing queue is full",
+                details={"queue_size": self.queue_size},
+            )
+        job = self._new_job(request)
+        await self._db.run(self.store.enqueue, job)
+        return job
+
+    async def submit_batch(
+        self, requests: list[DocumentProcessRequest]
+    ) -> BatchSubmission:
+        """
+        Enqueue a batch of documents in a single transaction.
+
+        Fan-out is bounded by the worker fleet's lease loops, so every new
+        job is made visible to workers at once.
+
+        Args:
+            requests: Document processing requests
+
+        Returns:
+            The batch ID with its new, existing and duplicate documents
+
+        Raises:
+            JobQueueFullError: If the batch would exceed the pending backlog
+        """
+        unique, duplicates = _dedupe(requests)
+        submission = BatchSubmission(batch_id=str(uuid.uuid4()), duplicates=duplicates)
+        submission.existing = await self._db.run(
+            self.store.active_jobs, [r.document_id for r in unique]
+        )
+        submission.jobs = [
+            self._new_job(request, batch_id=submission.batch_id)
+            for request in unique
+            if request.document_id not in submission.existing
+        ]
+
+        pending = await self._db.run(self.store.pending_count)
+        if pending + len(submission.jobs) > self.queue_size:
+            raise JobQueueFullError(
+                "Document processing queue is full",
+                details={"queue_size": self.queue_size, "pending": pending},
+            )
+        await self._db.run(self.store.enqueue_many, submission.jobs)
+        return submission
+
+    async def get_batch(self, batch_id: str) -> BatchStatusResponse | None:
+        """Get the aggregate progress of a batch."""
+        jobs = await self._db.run(self.store.batch_jobs, batch_id)
+        return summarize_batch(batch_id, jobs) if jobs else None
+
+    async def get_job(self, job_id: str) -> JobRecord | None:
+        """Get a job record by job ID."""
+        return await self._db.run(self.store.get, job_id)
+
+    async def get_status(self, document_id: str) -> JobRecord | None:
+        """Get the most recent job record for a document."""
+        return await self._db.run(self.store.get_latest, document_id)
+
+    async def _worker(self) -> None:
+        """Lease and process jobs until cancelled."""
+        while True:
+            job = await self._db.run(self.store.lease, self.worker_id)
+            if job is None:
+                await asyncio.sleep(self.poll_interval)
+                continue
+
+            processing = asyncio.create_task(self._run_job(job))
+            heartbeat = asyncio.create_task(self._heartbeat(job, processing))
+            try:
+                await processing
+            except asyncio.CancelledError:
+                task = asyncio.current_task()
+                if task is not None and task.cancelling():
+                    raise
+                # The heartbeat lost the lease and abandoned the job
+            finally:
+                heartbeat.cancel()
+
+    async def _watch(self) -> None:
+        """Poll the store for updated jobs while anyone is subscribed."""
+        since = time.time()
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            if not self.events.subscriber_count:
+                since = time.time()
+                continue
+            try:
+                since, updated = await self._db.run(self.store.updated_since, since)
+            except Exception as e:
+                logger.error("Job store watch failed", extra={"error": str(e)})
+                continue
+            for job in updated:
+                if self.events.has_subscribers(job.document_id):
+                    self.events.publish(job.to_status_response())
+
+    async def _heartbeat(
+        self, job: JobRecord, processing: asyncio.Task[None]
+    ) -> None:
+        """
+        Renew a job's lease until cancelled.
+
+        If the lease is lost (the worker stalled past it and another worker
+        took the job), processing is cancelled so this worker stops
+        spending on a job whose results it can no longer write.
+        """
+        while True:
+            await asyncio.sleep(self.store.lease_seconds / 3)
+            if not await self._db.run(self.store.heartbeat, job.job_id, self.worker_id):
+                logger.warning(
+                    "Lost lease on job; abandoning it",
+                    extra={"job_id": job.job_id, "worker_id": self.worker_id},
+                )
+                processing.cancel()
+                return
+
+    def _advance(self, job: JobRecord, stage: ProcessingStage, **changes: Any) -> None:
+        """
+        Move a job to a new stage and persist it.
+
+        The write is synchronous: worker processes serve no HTTP traffic and
+        a single-row WAL update is far cheaper than the stage it records.
+        """
+        super()._advance(job, stage, **changes)
+        if not self.store.save(job, self.worker_id):
+            logger.warning(
+                "Progress not saved; lease lost",
+                extra={"job_id": job.job_id, "worker_id": self.worker_id},
+            )
+
+    def _requeue(self, job: JobRecord) -> None:
+        """Hand an interrupted job back to the queue for another worker."""
+        if job.finished:
+            return
+        logger.info("Job interrupted; re-queued", extra={"job_id": job.job_id})
+        self.store.requeue(job, self.worker_id)
+
+    def _fail(self, job: JobRecord, message: str, retryable: bool = False) -> None:
+        """
+        Fail the current attempt, retrying transient failures.
+
+        Args:
+            job: The failed job
+            message: Error message recorded on the job
+            retryable: Whether the failure is transient
+        """
+        if not retryable:
+            super()._fail(job, message)
+            return
+
+        if self.store.release(
+            job, self.worker_id, retry=True, error_message=message
+        ):
+            logger.warning(
+                "Document processing attempt failed; will retry",
+                extra={"job_id": job.job_id, "attempt": job.attempts, "error": message},
+            )
+            job.status = ProcessingStatus.PENDING
+        else:
+            job.status = ProcessingStatus.FAILED
+            job.stage = ProcessingStage.FAILED
+        job.error_message = message
+
+
+def create_job_manager() -> JobManager:
+    """Build the API process's job manager for the configured backend."""
+    if settings.job_backend == "sqlite":
+        return DurableJobManager(
+            store=SQLiteJobQueue(
+                settings.job_store_path,
+                lease_seconds=settings.job_lease_seconds,
+                max_attempts=settings.job_max_attempts,
+                retry_delay_seconds=settings.job_retry_delay_seconds,
+            ),
+            worker_count=settings.job_worker_count,
+            queue_size=settings.job_queue_size,
+            consume=False,
+            poll_interval=settings.job_poll_interval_seconds,
+        )
+    return JobManager(
+        worker_count=settings.job_worker_count,
+        queue_size=settings.job_queue_size,
+        history_size=settings.job_history_size,
+        batch_concurrency=settings.job_batch_concurrency,
+    )
+
+
+# Global job manager instance
+job_manager = create_job_manager()
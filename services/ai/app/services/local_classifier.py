@@ -0,0 +1,292 @@
+"""Local first-stage document classifier over OCR text."""
+
+import asyncio
+import json
+import math
+import re
+from collections import Counter
+from collections.abc import Iterable
+from pathlib import Path
+
+from app.config import settings
+from app.core.logging import get_logger
+from app.models.document import ClassificationResult, DocumentType
+
+logger = get_logger(__name__)
+
+# Labelled OCR snippets shipped with the service, used when no corpus is configured
+DEFAULT_CORPUS_PATH = (
+    Path(__file__).parent.parent / "data" / "classification_corpus.jsonl"
+)
+
+# Characters of OCR text featurized; the document type is evident early on
+MAX_FEATURE_TEXT_CHARS = 4000
+
+# Known features required before a local answer is trusted; short or
+# foreign texts produce confident-looking but meaningless probabilities
+MIN_MATCHED_FEATURES = 8
+
+TOKEN_PATTERN = re.compile(r"[a-z]{2,}")
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Split text into unigram and bigram features.
+
+    Bigrams keep phrases such as "weigh in" and "date birth" distinct from
+    their words, which carry far less signal on their own.
+    """
+    words = TOKEN_PATTERN.findall(text[:MAX_FEATURE_TEXT_CHARS].lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:], strict=False)]
+
+
+class TfidfVectorizer:
+    """Sublinear TF-IDF with L2 normalisation over sparse dict vectors."""
+
+    def __init__(self) -> None:
+        """Initialize an unfitted vectorizer."""
+        self.idf: dict[str, float] = {}
+
+    def fit(self, documents: list[list[str]]) -> "TfidfVectorizer":
+        """
+        Learn inverse document frequencies.
+
+        Args:
+            documents: Tokenized training documents
+
+        Returns:
+            The fitted vectorizer
+        """
+        frequency = Counter(term for tokens in documents for term in set(tokens))
+        count = len(documents)
+        self.idf = {
+            term: math.log((1 + count) / (1 + df)) + 1.0
+            for term, df in frequency.items()
+        }
+        return self
+
+    def transform(self, tokens: list[str]) -> dict[str, float]:
+        """
+        Vectorize one tokenized document; unseen terms are ignored.
+
+        Args:
+            tokens: Document tokens
+
+        Returns:
+            Sparse unit-length feature vector
+        """
+        vector = {
+            term: (1.0 + math.log(tf)) * self.idf[term]
+            for term, tf in Counter(tokens).items()
+            if term in self.idf
+        }
+        norm = math.sqrt(sum(value * value for value in vector.values()))
+        if norm:
+            vector = {term: value / norm for term, value in vector.items()}
+        return vector
+
+
+class SoftmaxModel:
+    """Multinomial logistic regression over sparse features."""
+
+    def __init__(self, labels: list[DocumentType]) -> None:
+        """
+        Initialize a zero model.
+
+        Args:
+            labels: Classes the model predicts
+        """
+        self.labels = labels
+        self.weights: dict[DocumentType, dict[str, float]] = {
+            label: {} for label in labels
+        }
+        self.bias: dict[DocumentType, float] = dict.fromkeys(labels, 0.0)
+
+    def scores(self, vector: dict[str, float]) -> dict[DocumentType, float]:
+        """Raw linear score per class."""
+        return {
+            label: self.bias[label]
+            + sum(
+                self.weights[label].get(term, 0.0) * value
+                for term, value in vector.items()
+            )
+            for label in self.labels
+        }
+
+    def probabilities(self, vector: dict[str, float]) -> dict[DocumentType, float]:
+        """Softmax class probabilities."""
+        scores = self.scores(vector)
+        top = max(scores.values())
+        exp = {label: math.exp(score - top) for label, score in scores.items()}
+        total = sum(exp.values())
+        return {label: value / total for label, value in exp.items()}
+
+    def fit(
+        self,
+        samples: list[tuple[dict[str, float], DocumentType]],
+        epochs: int = 60,
+        learning_rate: float = 1.0,
+        l2: float = 1e-4,
+    ) -> "SoftmaxModel":
+        """
+        Train with stochastic gradient descent.
+
+        Samples are visited in a fixed order so training is deterministic.
+
+        Args:
+            samples: (feature vector, label) pairs
+            epochs: Passes over the samples
+            learning_rate: Step size
+            l2: Weight decay applied to the touched weights
+
+        Returns:
+            The trained model
+        """
+        for _ in range(epochs):
+            for vector, label in samples:
+                probabilities = self.probabilities(vector)
+                for candidate in self.labels:
+                    gradient = probabilities[candidate] - (candidate == label)
+                    weights = self.weights[candidate]
+                    for term, value in vector.items():
+                        weight = weights.get(term, 0.0)
+                        weights[term] = weight - learning_rate * (
+                            gradient * value + l2 * weight
+                        )
+                    self.bias[candidate] -= learning_rate * gradient
+        return self
+
+
+class LocalClassifier:
+    """
+    TF-IDF + softmax classifier that answers obvious documents locally.
+
+    Trained from a labelled JSONL corpus (one ``{"document_type", "text"}``
+    object per line) at application startup, or the first time it is used
+    if it was not warmed up. Predictions below the
+    confidence threshold return None so the caller can fall back to the
+    LLM; everything above it skips the network round trip entirely.
+    """
+
+    def __init__(self, corpus_path: Path, min_confidence: float) -> None:
+        """
+        Initialize the classifier.
+
+        Args:
+            corpus_path: Labelled training corpus
+            min_confidence: Probability required to answer without the LLM
+        """
+        self.corpus_path = corpus_path
+        self.min_confidence = min_confidence
+        self._vectorizer: TfidfVectorizer | None = None
+        self._model: SoftmaxModel | None = None
+
+    def train(self, examples: Iterable[tuple[str, DocumentType]]) -> None:
+        """
+        Train on labelled texts, replacing any previous model.
+
+        Args:
+            examples: (text, document type) pairs
+        """
+        tokenized = [(tokenize(text), label) for text, label in examples]
+        labels = sorted({label for _, label in tokenized}, key=lambda t: t.value)
+        vectorizer = TfidfVectorizer().fit([tokens for tokens, _ in tokenized])
+        samples = [
+            (vectorizer.transform(tokens), label) for tokens, label in tokenized
+        ]
+        self._model = SoftmaxModel(labels).fit(samples)
+        self._vectorizer = vectorizer
+        logger.info(
+            "Local classifier trained",
+            extra={"examples": len(samples), "features": len(vectorizer.idf)},
+        )
+
+    async def warm_up(self) -> None:
+        """Train from the corpus off the event loop, if not trained yet."""
+        if self._vectorizer is None or self._model is None:
+            await asyncio.to_thread(self._ensure_trained)
+
+    def _ensure_trained(self) -> tuple[TfidfVectorizer, SoftmaxModel]:
+        """Train from the corpus on first use."""
+        if self._vectorizer is None or self._model is None:
+            self.train(self._load_corpus())
+        assert self._vectorizer is not None and self._model is not None
+        return self._vectorizer, self._model
+
+    def _load_corpus(self) -> list[tuple[str, DocumentType]]:
+        """Read the labelled corpus, skipping unknown labels."""
+        examples: list[tuple[str, DocumentType]] = []
+        with self.corpus_path.open(encoding="utf-8") as corpus:
+            for line in corpus:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                try:
+                    label = DocumentType(record["document_type"])
+                except ValueError:
+                    continue
+                if label is not DocumentType.UNKNOWN:
+                    examples.append((record["text"], label))
+        return examples
+
+    def predict(self, text: str) -> list[tuple[DocumentType, float]]:
+        """
+        Rank document types for OCR text.
+
+        Args:
+            text: Document text
+
+        Returns:
+            (document type, probability) pairs, most likely first; empty
+            when the text shares too few features with the corpus
+        """
+        vectorizer, model = self._ensure_trained()
+        vector = vectorizer.transform(tokenize(text))
+        if len(vector) < MIN_MATCHED_FEATURES:
+            return []
+        probabilities = model.probabilities(vector)
+        return sorted(probabilities.items(), key=lambda item: item[1], reverse=True)
+
+    def classify(self, text: str) -> ClassificationResult | None:
+        """
+        Classify text if the model is confident enough.
+
+        Args:
+            text: Document text
+
+        Returns:
+            Classification result, or None when the LLM should decide
+        """
+        ranked = self.predict(text)
+        if not ranked or ranked[0][1] < self.min_confidence:
+            return None
+        if ranked[0][0] is DocumentType.OTHER:
+            # The catch-all is the LLM's call: it may still spot a real type
+            return None
+        (document_type, confidence), alternatives = ranked[0], ranked[1:3]
+        evidence = ", ".join(self._evidence(text, document_type))
+        return ClassificationResult(
+            document_type=document_type,
+            confidence=round(confidence, 3),
+            alternative_types=[(t, round(p, 3)) for t, p in alternatives],
+            reasoning=f"Local classifier matched {evidence}",
+        )
+
+    def _evidence(self, text: str, document_type: DocumentType) -> list[str]:
+        """Features contributing most to the predicted type."""
+        vectorizer, model = self._ensure_trained()
+        weights = model.weights[document_type]
+        vector = vectorizer.transform(tokenize(text))
+        contributions = sorted(
+            vector,
+            key=lambda term: weights.get(term, 0.0) * vector[term],
+            reverse=True,
+        )
+        return [f'"{term}"' for term in contributions[:3]]
+
+
+# Global local classifier instance
+local_classifier = LocalClassifier(
+    Path(settings.local_classifier_corpus_path or DEFAULT_CORPUS_PATH),
+    settings.local_classifier_min_confidence,
+)
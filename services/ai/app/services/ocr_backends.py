@@ -0,0 +1,309 @@
+"""Local OCR backends that read documents without calling Textract."""
+
+import io
+import math
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.core.logging import get_logger
+
+try:
+    from pypdf import PdfReader, PdfWriter
+
+    HAS_PYPDF = True
+except ImportError:  # pypdf is optional; without it every PDF goes to Textract
+    HAS_PYPDF = False
+
+logger = get_logger(__name__)
+
+# Confidence reported for text read from a PDF text layer, which is exact
+EMBEDDED_TEXT_CONFIDENCE = 100.0
+
+# Average glyph width as a fraction of the font size, used to estimate
+# fragment widths without loading font metrics
+GLYPH_WIDTH_RATIO = 0.5
+
+
+def pdf_support() -> bool:
+    """Whether pypdf is installed."""
+    return HAS_PYPDF
+
+
+def split_pdf_pages(content: bytes, max_pages: int) -> list[bytes] | None:
+    """
+    Split a PDF into single-page PDFs.
+
+    Args:
+        content: PDF bytes
+        max_pages: Largest document worth splitting
+
+    Returns:
+        One PDF per page, or None if the PDF cannot be parsed or has more
+        than ``max_pages`` pages
+    """
+    if not content or not HAS_PYPDF:
+        return None
+    try:
+        reader = PdfReader(io.BytesIO(content))
+        if len(reader.pages) > max_pages:
+            return None
+        pages = []
+        for page in reader.pages:
+            writer = PdfWriter()
+            writer.add_page(page)
+            output = io.BytesIO()
+            writer.write(output)
+            pages.append(output.getvalue())
+    except Exception as e:
+        logger.info("PDF could not be split into pages", extra={"error": str(e)})
+        return None
+    return pages
+
+
+class OCRBackend(ABC):
+    """
+    Base class for engines that turn document bytes into Textract blocks.
+
+    Backends return blocks in Textract's shape (PAGE, LINE and WORD blocks
+    with normalized geometry), so everything downstream of OCR treats their
+    results exactly like Textract's. A backend returns None for documents
+    it cannot read faithfully, and the caller falls back to Textract.
+    """
+
+    name = "local"
+
+    @abstractmethod
+    def accepts(self, s3_key: str) -> bool:
+        """
+        Whether the backend may be able to read a document.
+
+        Args:
+            s3_key: S3 object key for the document
+
+        Returns:
+            True if the document should be downloaded and offered to ``read``
+        """
+
+    @abstractmethod
+    def read(self, content: bytes) -> list[dict[str, Any]] | None:
+        """
+        Read a document.
+
+        Runs in a worker thread; implementations may block.
+
+        Args:
+            content: Document bytes
+
+        Returns:
+            Textract-shaped blocks, or None to fall back to Textract
+        """
+
+
+@dataclass
+class _Fragment:
+    """A run of text drawn at one position on a PDF page."""
+
+    text: str
+    x: float
+    y: float
+    size: float
+
+    @property
+    def width(self) -> float:
+        """Estimated width in page units."""
+        return len(self.text) * self.size * GLYPH_WIDTH_RATIO
+
+
+@dataclass
+class _Line:
+    """Fragments sharing a baseline."""
+
+    fragments: list[_Fragment] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        """Fragments joined left to right with single spaces."""
+        return " ".join(" ".join(f.text for f in self.fragments).split())
+
+
+class EmbeddedTextBackend(OCRBackend):
+    """
+    Reads the text layer of born-digital PDFs.
+
+    Every page must carry at least ``min_chars_per_page`` characters of
+    embedded text; a single scanned or image-only page rejects the whole
+    document, so no page is silently left unread (the page splitter then
+    offers each page on its own). Word and line
+    positions come from the PDF's text matrices; widths are estimated from
+    the font size.
+    """
+
+    name = "embedded_text"
+
+    def __init__(self, min_chars_per_page: int) -> None:
+        """
+        Initialize the backend.
+
+        Args:
+            min_chars_per_page: Embedded characters a page needs to count
+                as having a text layer
+        """
+        self.min_chars_per_page = min_chars_per_page
+
+    def accepts(self, s3_key: str) -> bool:
+        """Only PDFs carry a text layer, and only with pypdf installed."""
+        return pdf_support() and s3_key.lower().endswith(".pdf")
+
+    def read(self, content: bytes) -> list[dict[str, Any]] | None:
+        """
+        Build Textract-shaped blocks from a PDF's text layer.
+
+        Args:
+            content: PDF bytes
+
+        Returns:
+            PAGE, LINE and WORD blocks, or None if the PDF cannot be parsed
+            or any page lacks a text layer
+        """
+        if not content:
+            return None
+        try:
+            reader = PdfReader(io.BytesIO(content))
+            pages = [self._page_lines(page) for page in reader.pages]
+        except Exception as e:
+            # Malformed or encrypted PDFs are Textract's problem, not a failure
+            logger.info("PDF text layer unreadable", extra={"error": str(e)})
+            return None
+
+        for number, (lines, _) in enumerate(pages, start=1):
+            if sum(len(line.text) for line in lines) < self.min_chars_per_page:
+                logger.info("PDF page has no text layer", extra={"page": number})
+                return None
+
+        blocks: list[dict[str, Any]] = []
+        for number, (lines, box) in enumerate(pages, start=1):
+            blocks.extend(_page_blocks(number, lines, box))
+        return blocks
+
+    def _page_lines(
+        self, page: Any
+    ) -> tuple[list[_Line], tuple[float, float, float, float]]:
+        """Group a page's text fragments into lines, top to bottom."""
+        fragments: list[_Fragment] = []
+
+        def visit(
+            text: str,
+            cm: list[float],
+            tm: list[float],
+            font_dict: Any,
+            font_size: float,
+        ) -> None:
+            for part in text.splitlines():
+                if not part.strip():
+                    continue
+                # Position and vertical scale of the text matrix in page space
+                x = tm[4] * cm[0] + tm[5] * cm[2] + cm[4]
+                y = tm[4] * cm[1] + tm[5] * cm[3] + cm[5]
+                scale = math.hypot(
+                    tm[2] * cm[0] + tm[3] * cm[2], tm[2] * cm[1] + tm[3] * cm[3]
+                )
+                fragments.append(_Fragment(part, x, y, (font_size or 1) * scale))
+
+        page.extract_text(visitor_text=visit)
+
+        lines: list[_Line] = []
+        for fragment in sorted(fragments, key=lambda f: (-f.y, f.x)):
+            last = lines[-1].fragments[0] if lines else None
+            if last is not None and abs(last.y - fragment.y) <= last.size / 2:
+                lines[-1].fragments.append(fragment)
+            else:
+                lines.append(_Line([fragment]))
+        for line in lines:
+            line.fragments.sort(key=lambda f: f.x)
+
+        box = page.mediabox
+        return lines, (
+            float(box.left),
+            float(box.bottom),
+            float(box.width) or 1.0,
+            float(box.height) or 1.0,
+        )
+
+
+def _geometry(left: float, top: float, width: float, height: float) -> dict[str, Any]:
+    """Textract geometry for a normalized box, clamped to the page."""
+    left, top = min(max(left, 0.0), 1.0), min(max(top, 0.0), 1.0)
+    width, height = min(max(width, 0.0), 1.0 - left), min(max(height, 0.0), 1.0 - top)
+    return {
+        "BoundingBox": {"Width": width, "Height": height, "Left": left, "Top": top},
+        "Polygon": [
+            {"X": left, "Y": top},
+            {"X": left + width, "Y": top},
+            {"X": left + width, "Y": top + height},
+            {"X": left, "Y": top + height},
+        ],
+    }
+
+
+def _page_blocks(
+    number: int, lines: list[_Line], box: tuple[float, float, float, float]
+) -> list[dict[str, Any]]:
+    """PAGE, LINE and WORD blocks for one page."""
+    page_left, page_bottom, page_width, page_height = box
+    page_block: dict[str, Any] = {
+        "BlockType": "PAGE",
+        "Id": f"embedded-{number}",
+        "Page": number,
+        "Geometry": _geometry(0.0, 0.0, 1.0, 1.0),
+    }
+    blocks = [page_block]
+    line_ids = []
+    for line_index, line in enumerate(lines):
+        text = line.text
+        first, last = line.fragments[0], line.fragments[-1]
+        size = max(f.size for f in line.fragments)
+        left = (first.x - page_left) / page_width
+        top = 1.0 - (first.y + size - page_bottom) / page_height
+        width = (last.x + last.width - first.x) / page_width
+        height = size / page_height
+
+        line_id = f"embedded-{number}-{line_index}"
+        line_ids.append(line_id)
+        words = text.split()
+        word_ids = [f"{line_id}-{i}" for i in range(len(words))]
+        blocks.append(
+            {
+                "BlockType": "LINE",
+                "Id": line_id,
+                "Page": number,
+                "Text": text,
+                "Confidence": EMBEDDED_TEXT_CONFIDENCE,
+                "Geometry": _geometry(left, top, width, height),
+                "Relationships": [{"Type": "CHILD", "Ids": word_ids}],
+            }
+        )
+        # Word boxes split the line box in proportion to character counts
+        offset = 0
+        for word_id, word in zip(word_ids, words, strict=True):
+            start = text.index(word, offset)
+            offset = start + len(word)
+            blocks.append(
+                {
+                    "BlockType": "WORD",
+                    "Id": word_id,
+                    "Page": number,
+                    "Text": word,
+                    "TextType": "PRINTED",
+                    "Confidence": EMBEDDED_TEXT_CONFIDENCE,
+                    "Geometry": _geometry(
+                        left + width * start / len(text),
+                        top,
+                        width * len(word) / len(text),
+                        height,
+                    ),
+                }
+            )
+    if line_ids:
+        page_block["Relationships"] = [{"Type": "CHILD", "Ids": line_ids}]
+    return blocks
@@ -0,0 +1,301 @@
+"""Compact array-backed storage for OCR blocks."""
+
+import math
+import sys
+from array import array
+from collections.abc import Iterator, Sequence
+from typing import Any
+
+# Block keys with a small vocabulary, stored as codes into a symbol table
+SYMBOL_KEYS: tuple[str, ...] = ("BlockType", "TextType", "SelectionStatus")
+
+BOUNDING_BOX_KEYS: tuple[str, ...] = ("Width", "Height", "Left", "Top")
+
+# Marks a missing string span, page or code in the columns
+ABSENT = -1
+
+
+class CompactBlocks(Sequence[dict[str, Any]]):
+    """
+    Textract blocks held as parallel arrays over one text buffer.
+
+    A 50-page result is tens of thousands of small dicts, each with nested
+    geometry dicts and boxed floats. Here every block is a row across typed
+    arrays: symbol codes for the block type, offsets into a shared string
+    buffer for the Id and text, doubles for confidence and bounding box,
+    and CSR-style offset arrays for polygons and relationships (which point
+    at block indexes instead of repeating Id strings).
+
+    The sequence rebuilds block dicts on access and compares equal to the
+    list it was built from. Values that do not fit the columns (unusual
+    keys, dangling relationship Ids) are kept verbatim in a sparse side
+    table, so the conversion is lossless for any input.
+    """
+
+    def __init__(self, blocks: Sequence[dict[str, Any]]) -> None:
+        """
+        Pack blocks into columns.
+
+        Args:
+            blocks: Blocks returned by Textract
+        """
+        self._symbols: list[str] = []
+        symbol_codes: dict[str, int] = {}
+        positions = {
+            block["Id"]: index
+            for index, block in enumerate(blocks)
+            if isinstance(block.get("Id"), str)
+        }
+        strings: list[str] = []
+        offset = 0
+
+        def intern(value: str) -> int:
+            if value not in symbol_codes:
+                symbol_codes[value] = len(self._symbols)
+                self._symbols.append(value)
+            return symbol_codes[value]
+
+        def span(value: str) -> tuple[int, int]:
+            nonlocal offset
+            strings.append(value)
+            offset += len(value)
+            return offset - len(value), offset
+
+        self._codes = {key: array("i") for key in SYMBOL_KEYS}
+        self._id_span = array("i")
+        self._text_span = array("i")
+        self._page = array("i")
+        self._confidence = array("d")
+        self._box = array("d")
+        self._polygon_start = array("i", [0])
+        self._points = array("d")
+        self._relationship_start = array("i", [0])
+        self._relationship_type = array("i")
+        self._target_start = array("i", [0])
+        self._targets = array("i")
+        self._extras: dict[int, dict[str, Any]] = {}
+
+        for index, block in enumerate(blocks):
+            extras = {}
+            for key, value in block.items():
+                if key in SYMBOL_KEYS or key in ("Id", "Text"):
+                    if not isinstance(value, str):
+                        extras[key] = value
+                elif key == "Page":
+                    if type(value) is not int or value < 0:
+                        extras[key] = value
+                elif key == "Confidence":
+                    if type(value) is not float or math.isnan(value):
+                        extras[key] = value
+                elif key == "Geometry":
+                    if not _is_plain_geometry(value):
+                        extras[key] = value
+                elif key == "Relationships":
+                    if not _is_plain_relationships(value, positions):
+                        extras[key] = value
+                else:
+                    extras[key] = value
+            if extras:
+                self._extras[index] = extras
+
+            for key in SYMBOL_KEYS:
+                value = block.get(key)
+                # Non-string values were moved to extras above
+                self._codes[key].append(
+                    intern(value) if isinstance(value, str) else ABSENT
+                )
+            for key, column in (("Id", self._id_span), ("Text", self._text_span)):
+                if key in block and key not in extras:
+                    column.extend(span(block[key]))
+                else:
+                    column.extend((ABSENT, ABSENT))
+
+            has_page = "Page" in block and "Page" not in extras
+            self._page.append(block["Page"] if has_page else ABSENT)
+            has_confidence = "Confidence" in block and "Confidence" not in extras
+            self._confidence.append(block["Confidence"] if has_confidence else math.nan)
+
+            if "Geometry" in block and "Geometry" not in extras:
+                box = block["Geometry"]["BoundingBox"]
+                self._box.extend(box[key] for key in BOUNDING_BOX_KEYS)
+                for point in block["Geometry"]["Polygon"]:
+                    self._points.extend((point["X"], point["Y"]))
+            else:
+                self._box.extend((math.nan,) * len(BOUNDING_BOX_KEYS))
+            self._polygon_start.append(len(self._points) // 2)
+
+            if "Relationships" in block and "Relationships" not in extras:
+                for relationship in block["Relationships"]:
+                    self._relationship_type.append(intern(relationship["Type"]))
+                    self._targets.extend(
+                        positions[block_id] for block_id in relationship["Ids"]
+                    )
+                    self._target_start.append(len(self._targets))
+            self._relationship_start.append(len(self._relationship_type))
+
+        self._text = "".join(strings)
+
+    def __len__(self) -> int:
+        return len(self._page)
+
+    def __getitem__(self, index: int | slice) -> Any:
+        if isinstance(index, slice):
+            return [self._block(i) for i in range(len(self))[index]]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("block index out of range")
+        return self._block(index)
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        return (self._block(i) for i in range(len(self)))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CompactBlocks):
+            other = other.to_list()
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            block == other_block
+            for block, other_block in zip(self, other, strict=True)
+        )
+
+    def to_list(self) -> list[dict[str, Any]]:
+        """
+        Rebuild the original block dicts.
+
+        Returns:
+            Blocks equal to those the instance was built from
+        """
+        return list(self)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the columns and text buffer."""
+        arrays: list[array[Any]] = [
+            *self._codes.values(),
+            self._id_span,
+            self._text_span,
+            self._page,
+            self._confidence,
+            self._box,
+            self._polygon_start,
+            self._points,
+            self._relationship_start,
+            self._relationship_type,
+            self._target_start,
+            self._targets,
+        ]
+        return (
+            sum(column.itemsize * len(column) for column in arrays)
+            + sys.getsizeof(self._text)
+            + sum(sys.getsizeof(symbol) for symbol in self._symbols)
+            + sys.getsizeof(self._extras)
+        )
+
+    def _string(self, column: array, index: int) -> str | None:
+        """Read a string from the text buffer, or None if absent."""
+        start = column[2 * index]
+        if start == ABSENT:
+            return None
+        return self._text[start : column[2 * index + 1]]
+
+    def _block(self, index: int) -> dict[str, Any]:
+        """Rebuild the block at a row."""
+        block: dict[str, Any] = {}
+        for key, codes in self._codes.items():
+            if codes[index] != ABSENT:
+                block[key] = self._symbols[codes[index]]
+        for key, column in (("Id", self._id_span), ("Text", self._text_span)):
+            value = self._string(column, index)
+            if value is not None:
+                block[key] = value
+        if self._page[index] != ABSENT:
+            block["Page"] = self._page[index]
+        if not math.isnan(self._confidence[index]):
+            block["Confidence"] = self._confidence[index]
+
+        box = self._box[4 * index : 4 * index + 4]
+        if not math.isnan(box[0]):
+            points = self._points[
+                2 * self._polygon_start[index] : 2 * self._polygon_start[index + 1]
+            ]
+            block["Geometry"] = {
+                "BoundingBox": dict(zip(BOUNDING_BOX_KEYS, box, strict=True)),
+                "Polygon": [
+                    {"X": points[i], "Y": points[i + 1]}
+                    for i in range(0, len(points), 2)
+                ],
+            }
+
+        first, last = self._relationship_start[index : index + 2]
+        if last > first:
+            block["Relationships"] = [
+                {
+                    "Type": self._symbols[self._relationship_type[r]],
+                    "Ids": [
+                        self._string(self._id_span, target)
+                        for target in self._targets[
+                            self._target_start[r] : self._target_start[r + 1]
+                        ]
+                    ],
+                }
+                for r in range(first, last)
+            ]
+
+        block.update(self._extras.get(index, {}))
+        return block
+
+
+def _is_plain_geometry(geometry: Any) -> bool:
+    """Whether geometry is exactly a float bounding box and X/Y polygon."""
+    if not isinstance(geometry, dict) or geometry.keys() != {"BoundingBox", "Polygon"}:
+        return False
+    box, polygon = geometry["BoundingBox"], geometry["Polygon"]
+    return (
+        isinstance(box, dict)
+        and box.keys() == set(BOUNDING_BOX_KEYS)
+        and all(
+            type(value) is float and not math.isnan(value) for value in box.values()
+        )
+        and isinstance(polygon, list)
+        and all(
+            isinstance(point, dict)
+            and point.keys() == {"X", "Y"}
+            and type(point["X"]) is float
+            and type(point["Y"]) is float
+            for point in polygon
+        )
+    )
+
+
+def _is_plain_relationships(relationships: Any, positions: dict[str, int]) -> bool:
+    """Whether relationships are a non-empty list linking only known blocks."""
+    return (
+        isinstance(relationships, list)
+        and bool(relationships)
+        and all(
+            isinstance(relationship, dict)
+            and relationship.keys() == {"Type", "Ids"}
+            and isinstance(relationship["Type"], str)
+            and isinstance(relationship["Ids"], list)
+            and all(block_id in positions for block_id in relationship["Ids"])
+            for relationship in relationships
+        )
+    )
+
+
+def compact_result(result: dict[str, Any]) -> dict[str, Any]:
+    """
+    Replace an OCR result's block list with its compact form.
+
+    Args:
+        result: ``extract_text`` or ``analyze_document`` result
+
+    Returns:
+        Result with the same keys whose ``blocks`` is a CompactBlocks
+    """
+    blocks = result.get("blocks")
+    if not isinstance(blocks, list):
+        return result
+    return {**result, "blocks": CompactBlocks(blocks)}
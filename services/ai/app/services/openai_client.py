@@ -1,37 +1,124 @@
 """OpenAI client with Anthropic fallback."""
 
+import asyncio
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
 from typing import Any
 
-from anthropic import Anthropic, APIError as AnthropicAPIError
-from openai import AsyncOpenAI, APIError as OpenAIAPIError
+from anthropic import (
+    AsyncAnthropic,
+    APIError as AnthropicAPIError,
+    RateLimitError as AnthropicRateLimitError,
+)
+from anthropic.types import TextBlock
+from openai import (
+    AsyncOpenAI,
+    APIError as OpenAIAPIError,
+    RateLimitError as OpenAIRateLimitError,
+)
+from openai.types.chat import ChatCompletionMessageParam
 
 from app.config import settings
+from app.core.cache import CacheStats, TwoTierCache, make_cache_key
 from app.core.exceptions import AIProviderError
 from app.core.logging import get_logger
+from app.core.rate_limit import RateLimiter
+from app.services.provider_health import ProviderHealth
 
 logger = get_logger(__name__)
 
+OPENAI = "openai"
+ANTHROPIC = "anthropic"
+
+# Display names used in error messages
+PROVIDER_LABELS = {OPENAI: "OpenAI", ANTHROPIC: "Anthropic"}
+
+# Rough characters per token for English text, used to estimate prompt size
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(prompt: str, system_prompt: str | None, max_tokens: int) -> int:
+    """
+    Estimate the tokens a call counts against a provider's TPM budget.
+
+    Providers charge the completion allowance (``max_tokens``) up front,
+    so it is included in full alongside the estimated prompt size.
+    """
+    prompt_chars = len(prompt) + len(system_prompt or "")
+    return prompt_chars // CHARS_PER_TOKEN + max_tokens
+
+
+def _is_provider_fault(error: OpenAIAPIError | AnthropicAPIError) -> bool:
+    """Whether an error reflects provider health rather than a bad request."""
+    status_code = getattr(error, "status_code", None)
+    return status_code is None or status_code == 429 or status_code >= 500
+
 
 class AIClient:
     """
     AI client with OpenAI as primary and Anthropic as fallback.
 
     Provides a unified interface for AI operations with automatic
-    fallback to Anthropic if OpenAI is unavailable.
+    fallback to Anthropic if OpenAI is unavailable. Both providers are
+    called through their async SDKs. With hedging enabled, the fallback
+    request is also started when the primary has not answered within its
+    recent latency percentile, and the first good answer wins.
+
+    Each provider has a circuit breaker and rolling error statistics:
+    providers with an open circuit are skipped outright, and the rest are
+    tried healthiest first, so an outage costs one round trip rather than
+    a timeout followed by the fallback.
+
+    Deterministic (temperature 0) completions are cached by model, prompts,
+    token limit and caller-supplied prompt version.
     """
 
     def __init__(self) -> None:
         """Initialize AI clients."""
         self.openai_client = (
-            AsyncOpenAI(api_key=settings.openai_api_key)
+            AsyncOpenAI(
+                api_key=settings.openai_api_key,
+                timeout=settings.ai_request_timeout_seconds,
+            )
             if settings.openai_api_key
             else None
         )
         self.anthropic_client = (
-            Anthropic(api_key=settings.anthropic_api_key)
+            AsyncAnthropic(
+                api_key=settings.anthropic_api_key,
+                timeout=settings.ai_request_timeout_seconds,
+            )
             if settings.anthropic_api_key
             else None
         )
+        self.health = {
+            name: ProviderHealth(
+                settings.ai_circuit_failure_threshold,
+                settings.ai_circuit_reset_seconds,
+            )
+            for name in (OPENAI, ANTHROPIC)
+        }
+        self.limiters = {
+            OPENAI: RateLimiter(
+                OPENAI,
+                settings.openai_requests_per_minute,
+                settings.openai_tokens_per_minute,
+            ),
+            ANTHROPIC: RateLimiter(
+                ANTHROPIC,
+                settings.anthropic_requests_per_minute,
+                settings.anthropic_tokens_per_minute,
+            ),
+        }
+        self.cache = (
+            TwoTierCache(
+                settings.ai_cache_max_entries,
+                settings.ai_cache_dir or None,
+                ttl_seconds=settings.ai_cache_ttl_seconds,
+            )
+            if settings.ai_cache_enabled
+            else None
+        )
 
         if not self.openai_client and not self.anthropic_client:
             logger.warning("No AI provider configured - both OpenAI and Anthropic keys are missing")
@@ -43,18 +130,23 @@ class AIClient:
         max_tokens: int | None = None,
         temperature: float | None = None,
         use_fallback: bool = True,
+        prompt_version: str | None = None,
     ) -> str:
         """
         Generate a completion using AI.
 
-        Tries OpenAI first, falls back to Anthropic if enabled and OpenAI fails.
+        Configured providers are tried healthiest first (OpenAI breaks
+        ties); the next one is used if enabled and the current one fails
+        (or, when hedging, is slower than usual).
 
         Args:
             prompt: User prompt
             system_prompt: Optional system prompt
             max_tokens: Maximum tokens to generate
             temperature: Sampling temperature
-            use_fallback: Whether to use Anthropic as fallback
+            use_fallback: Whether to fall back to the next provider
+            prompt_version: Version tag of the caller's prompt template;
+                changing it invalidates cached completions
 
         Returns:
             Generated completion text
@@ -63,39 +155,350 @@ class AIClient:
             AIProviderError: If completion fails on all providers
         """
         max_tokens = max_tokens or settings.openai_max_tokens
-        temperature = temperature or settings.openai_temperature
+        if temperature is None:
+            temperature = settings.openai_temperature
 
-        # Try OpenAI first
-        if self.openai_client:
-            try:
-                return await self._complete_openai(
-                    prompt, system_prompt, max_tokens, temperature
+        cache_key = self._cache_key(
+            prompt, system_prompt, max_tokens, temperature, prompt_version
+        )
+        cache = self.cache
+        if cache is not None and cache_key is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                logger.info(
+                    "AI completion served from cache",
+                    extra={"prompt_version": prompt_version},
                 )
-            except OpenAIAPIError as e:
-                logger.warning(
-                    "OpenAI completion failed",
-                    extra={"error": str(e), "use_fallback": use_fallback},
+                return str(cached)
+
+        if not self._configured():
+            raise AIProviderError("No AI provider available or configured")
+        providers = self._providers(use_fallback)
+        if not providers:
+            raise AIProviderError(
+                "All AI providers are unavailable (circuit open)",
+                details={"providers": self.provider_health()},
+            )
+
+        result = await self._race(
+            providers,
+            hedge=settings.ai_hedging_enabled,
+            prompt=prompt,
+            system_prompt=system_prompt,
+            max_tokens=max_tokens,
+            temperature=temperature,
+        )
+        if cache is not None and cache_key is not None and result:
+            cache.set(cache_key, result)
+        return result
+
+    async def stream(
+        self,
+        prompt: str,
+        system_prompt: str | None = None,
+        max_tokens: int | None = None,
+        temperature: float | None = None,
+        use_fallback: bool = True,
+        prompt_version: str | None = None,
+    ) -> AsyncIterator[str]:
+        """
+        Generate a completion, yielding text as the provider produces it.
+
+        Providers are tried in the same order as ``complete``. A provider
+        that fails before producing any text is skipped in favour of the
+        next one; once text has been yielded a failure is raised, since a
+        different provider's answer cannot be spliced onto it. Streams are
+        not hedged. A cached completion is yielded as a single chunk.
+
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature
+            use_fallback: Whether to fall back to the next provider
+            prompt_version: Version tag of the caller's prompt template;
+                changing it invalidates cached completions
+
+        Yields:
+            Completion text fragments
+
+        Raises:
+            AIProviderError: If streaming fails on all providers, or fails
+                after text has been yielded
+        """
+        max_tokens = max_tokens or settings.openai_max_tokens
+        if temperature is None:
+            temperature = settings.openai_temperature
+
+        cache_key = self._cache_key(
+            prompt, system_prompt, max_tokens, temperature, prompt_version
+        )
+        cache = self.cache
+        if cache is not None and cache_key is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                logger.info(
+                    "AI completion served from cache",
+                    extra={"prompt_version": prompt_version},
                 )
-                if not use_fallback:
-                    raise AIProviderError(
-                        f"OpenAI completion failed: {str(e)}"
-                    ) from e
+                yield str(cached)
+                return
 
-        # Try Anthropic as fallback
-        if self.anthropic_client and use_fallback:
+        if not self._configured():
+            raise AIProviderError("No AI provider available or configured")
+        providers = self._providers(use_fallback)
+        if not providers:
+            raise AIProviderError(
+                "All AI providers are unavailable (circuit open)",
+                details={"providers": self.provider_health()},
+            )
+
+        errors: list[AIProviderError] = []
+        for provider in providers:
+            parts: list[str] = []
             try:
-                return await self._complete_anthropic(
-                    prompt, system_prompt, max_tokens, temperature
-                )
-            except AnthropicAPIError as e:
-                logger.error(
-                    "Anthropic completion failed", extra={"error": str(e)}, exc_info=True
+                async for text in self._stream_call(
+                    provider,
+                    prompt=prompt,
+                    system_prompt=system_prompt,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                ):
+                    parts.append(text)
+                    yield text
+            except AIProviderError as e:
+                if parts:
+                    raise
+                errors.append(e)
+                continue
+            if cache is not None and cache_key is not None and parts:
+                cache.set(cache_key, "".join(parts))
+            return
+        raise errors[-1]
+
+    def _cache_key(
+        self,
+        prompt: str,
+        system_prompt: str | None,
+        max_tokens: int,
+        temperature: float,
+        prompt_version: str | None,
+    ) -> str | None:
+        """Cache key for a completion, or None if it must not be cached."""
+        if self.cache is None or temperature != 0.0:
+            return None
+        return make_cache_key(
+            settings.openai_model,
+            settings.anthropic_model,
+            prompt_version or "",
+            system_prompt or "",
+            prompt,
+            str(max_tokens),
+        )
+
+    def cache_stats(self) -> dict[str, int]:
+        """
+        Get completion cache counters.
+
+        Returns:
+            Hit, disk hit, miss and eviction counts (all zero if caching is off)
+        """
+        if self.cache is None:
+            return CacheStats().as_dict()
+        return self.cache.stats.as_dict()
+
+    def provider_health(self) -> dict[str, dict[str, Any]]:
+        """
+        Get circuit state and rolling statistics per provider.
+
+        Returns:
+            Mapping of provider name to its configuration and health snapshot
+        """
+        configured = self._configured()
+        return {
+            name: {"configured": name in configured, **health.snapshot()}
+            for name, health in self.health.items()
+        }
+
+    def _openai(self) -> AsyncOpenAI:
+        if self.openai_client is None:
+            raise AIProviderError("OpenAI client not configured")
+        return self.openai_client
+
+    def _anthropic(self) -> AsyncAnthropic:
+        if self.anthropic_client is None:
+            raise AIProviderError("Anthropic client not configured")
+        return self.anthropic_client
+
+    def _configured(self) -> list[str]:
+        """Providers with a client, in preference order."""
+        providers = []
+        if self.openai_client:
+            providers.append(OPENAI)
+        if self.anthropic_client:
+            providers.append(ANTHROPIC)
+        return providers
+
+    def _providers(self, use_fallback: bool) -> list[str]:
+        """Available providers in the order they should be tried."""
+        configured = self._configured()
+        if not use_fallback:
+            configured = configured[:1]
+        available = [p for p in configured if self.health[p].breaker.available()]
+        # sorted() is stable, so equally healthy providers keep their order
+        return sorted(available, key=lambda p: self.health[p].routing_key())
+
+    def _hedge_delay(self, provider: str) -> float:
+        """Seconds to wait on a provider before hedging to the next one."""
+        delay = self.health[provider].stats.latency_percentile(
+            settings.ai_hedge_percentile
+        )
+        if delay is None:
+            return settings.ai_hedge_default_delay_seconds
+        return max(delay, settings.ai_hedge_min_delay_seconds)
+
+    async def _race(self, providers: list[str], hedge: bool, **request: Any) -> str:
+        """
+        Run a completion across providers until one succeeds.
+
+        The next provider starts when the previous one fails or, when
+        hedging, when it has been outstanding longer than its hedge delay.
+        Requests still running once an answer arrives are cancelled.
+
+        Args:
+            providers: Providers in order of preference
+            hedge: Whether to start the next provider on slowness
+            **request: Arguments for the provider call
+
+        Returns:
+            The first successful completion
+
+        Raises:
+            AIProviderError: If every provider fails
+        """
+        remaining = list(providers)
+        pending: set[asyncio.Task[str]] = set()
+        errors: list[AIProviderError] = []
+
+        def launch() -> str:
+            name = remaining.pop(0)
+            pending.add(
+                asyncio.create_task(self._call(name, **request), name=f"ai-{name}")
+            )
+            return name
+
+        try:
+            current = launch()
+            while pending:
+                timeout = self._hedge_delay(current) if hedge and remaining else None
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
                 )
-                raise AIProviderError(
-                    f"Anthropic completion failed: {str(e)}"
-                ) from e
+                if not done:
+                    logger.info(
+                        "AI provider slow; hedging",
+                        extra={"provider": current, "hedge_to": remaining[0]},
+                    )
+                    current = launch()
+                    continue
+
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        return task.result()
+                    if not isinstance(error, AIProviderError):
+                        error = AIProviderError(str(error))
+                    errors.append(error)
+                if remaining and not pending:
+                    current = launch()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        raise errors[-1]
+
+    async def _call(self, provider: str, **request: Any) -> str:
+        """
+        Call one provider through its circuit breaker, recording the outcome.
 
-        raise AIProviderError("No AI provider available or configured")
+        Raises:
+            AIProviderError: If the circuit is open or the provider call fails
+        """
+        health = self.health[provider]
+        if not health.breaker.acquire():
+            raise AIProviderError(
+                f"{PROVIDER_LABELS[provider]} circuit is open",
+                details={"provider": provider},
+            )
+
+        complete: Callable[..., Awaitable[str]] = (
+            self._complete_openai if provider == OPENAI else self._complete_anthropic
+        )
+        started = time.monotonic()
+        try:
+            result = await complete(**request)
+        except (OpenAIAPIError, AnthropicAPIError) as e:
+            raise self._provider_error(provider, e) from e
+        except BaseException:
+            # Cancelled (e.g. a losing hedge) or unexpected: no verdict
+            health.breaker.release()
+            raise
+        health.stats.record_success(time.monotonic() - started)
+        health.breaker.record_success()
+        return result
+
+    async def _stream_call(self, provider: str, **request: Any) -> AsyncIterator[str]:
+        """
+        Stream from one provider through its circuit breaker.
+
+        Raises:
+            AIProviderError: If the circuit is open or the provider call fails
+        """
+        health = self.health[provider]
+        if not health.breaker.acquire():
+            raise AIProviderError(
+                f"{PROVIDER_LABELS[provider]} circuit is open",
+                details={"provider": provider},
+            )
+
+        stream: Callable[..., AsyncIterator[str]] = (
+            self._stream_openai if provider == OPENAI else self._stream_anthropic
+        )
+        started = time.monotonic()
+        try:
+            async for text in stream(**request):
+                yield text
+        except (OpenAIAPIError, AnthropicAPIError) as e:
+            raise self._provider_error(provider, e) from e
+        except BaseException:
+            # Cancelled, or the consumer stopped reading: no verdict
+            health.breaker.release()
+            raise
+        health.stats.record_success(time.monotonic() - started)
+        health.breaker.record_success()
+
+    def _provider_error(
+        self, provider: str, error: OpenAIAPIError | AnthropicAPIError
+    ) -> AIProviderError:
+        """Record a failed provider call and wrap its error."""
+        health = self.health[provider]
+        if _is_provider_fault(error):
+            health.stats.record_failure()
+            health.breaker.record_failure()
+        else:
+            health.breaker.release()
+        logger.warning(
+            f"{PROVIDER_LABELS[provider]} completion failed",
+            extra={
+                "provider": provider,
+                "error": str(error),
+                "circuit": health.breaker.state,
+            },
+        )
+        return AIProviderError(
+            f"{PROVIDER_LABELS[provider]} completion failed: {str(error)}",
+            details={"provider": provider},
+        )
 
     async def _complete_openai(
         self,
@@ -118,22 +521,28 @@ class AIClient:
         """
         logger.info("Generating OpenAI completion")
 
-        # TODO: Implement actual OpenAI API call
-        # messages = []
-        # if system_prompt:
-        #     messages.append({"role": "system", "content": system_prompt})
-        # messages.append({"role": "user", "content": prompt})
-        #
-        # response = await self.openai_client.chat.completions.create(
-        #     model=settings.openai_model,
-        #     messages=messages,
-        #     max_tokens=max_tokens,
-        #     temperature=temperature,
-        # )
-        # return response.choices[0].message.content
-
-        # Stub implementation
-        return "OpenAI completion (stub implementation)"
+        messages: list[ChatCompletionMessageParam] = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+
+        client = self._openai()
+        limiter = self.limiters[OPENAI]
+        estimate = estimate_tokens(prompt, system_prompt, max_tokens)
+        async with limiter.reserve(estimate) as reservation:
+            try:
+                response = await client.chat.completions.create(
+                    model=settings.openai_model,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                )
+            except OpenAIRateLimitError:
+                limiter.throttle()
+                raise
+            if response.usage is not None:
+                reservation.used = response.usage.total_tokens
+        return response.choices[0].message.content or ""
 
     async def _complete_anthropic(
         self,
@@ -156,18 +565,118 @@ class AIClient:
         """
         logger.info("Generating Anthropic completion (fallback)")
 
-        # TODO: Implement actual Anthropic API call
-        # response = self.anthropic_client.messages.create(
-        #     model=settings.anthropic_model,
-        #     max_tokens=max_tokens,
-        #     temperature=temperature,
-        #     system=system_prompt or "",
-        #     messages=[{"role": "user", "content": prompt}],
-        # )
-        # return response.content[0].text
-
-        # Stub implementation
-        return "Anthropic completion (stub implementation)"
+        max_tokens = min(max_tokens, settings.anthropic_max_tokens)
+        client = self._anthropic()
+        limiter = self.limiters[ANTHROPIC]
+        estimate = estimate_tokens(prompt, system_prompt, max_tokens)
+        async with limiter.reserve(estimate) as reservation:
+            try:
+                response = await client.messages.create(
+                    model=settings.anthropic_model,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    system=system_prompt or "",
+                    messages=[{"role": "user", "content": prompt}],
+                )
+            except AnthropicRateLimitError:
+                limiter.throttle()
+                raise
+            reservation.used = (
+                response.usage.input_tokens + response.usage.output_tokens
+            )
+        return "".join(
+            block.text for block in response.content if isinstance(block, TextBlock)
+        )
+
+    async def _stream_openai(
+        self,
+        prompt: str,
+        system_prompt: str | None,
+        max_tokens: int,
+        temperature: float,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a completion from OpenAI.
+
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature
+
+        Yields:
+            Completion text fragments
+        """
+        logger.info("Streaming OpenAI completion")
+
+        messages: list[ChatCompletionMessageParam] = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+
+        client = self._openai()
+        limiter = self.limiters[OPENAI]
+        estimate = estimate_tokens(prompt, system_prompt, max_tokens)
+        async with limiter.reserve(estimate) as reservation:
+            try:
+                stream = await client.chat.completions.create(
+                    model=settings.openai_model,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    stream=True,
+                    stream_options={"include_usage": True},
+                )
+            except OpenAIRateLimitError:
+                limiter.throttle()
+                raise
+            async for chunk in stream:
+                if chunk.usage is not None:
+                    reservation.used = chunk.usage.total_tokens
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+    async def _stream_anthropic(
+        self,
+        prompt: str,
+        system_prompt: str | None,
+        max_tokens: int,
+        temperature: float,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a completion from Anthropic.
+
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature
+
+        Yields:
+            Completion text fragments
+        """
+        logger.info("Streaming Anthropic completion (fallback)")
+
+        max_tokens = min(max_tokens, settings.anthropic_max_tokens)
+        client = self._anthropic()
+        limiter = self.limiters[ANTHROPIC]
+        estimate = estimate_tokens(prompt, system_prompt, max_tokens)
+        async with limiter.reserve(estimate) as reservation:
+            try:
+                async with client.messages.stream(
+                    model=settings.anthropic_model,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    system=system_prompt or "",
+                    messages=[{"role": "user", "content": prompt}],
+                ) as stream:
+                    async for text in stream.text_stream:
+                        yield text
+                    message = await stream.get_final_message()
+            except AnthropicRateLimitError:
+                limiter.throttle()
+                raise
+            reservation.used = message.usage.input_tokens + message.usage.output_tokens
 
 
 # Global AI client instance
@@ -0,0 +1,178 @@
+"""Single-pass document processing pipeline."""
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any
+
+from app.core.logging import get_logger
+from app.models.document import ClassificationResult, DocumentType
+from app.models.extraction import ExtractedField
+from app.services.classifier import DocumentClassifier, classifier
+from app.services.extractor import DataExtractor, extractor
+from app.services.textract import TextractService, textract_service
+
+logger = get_logger(__name__)
+
+# Fields whose dates must not lie in the future
+PAST_DATE_FIELDS = ("date_of_birth", "issue_date", "clearance_date", "weigh_in_date")
+
+# Fields whose dates must not lie in the past for the document to be current
+EXPIRY_DATE_FIELDS = ("expiration_date",)
+
+# Plausible range for a recorded fighter weight, in pounds
+MIN_PLAUSIBLE_WEIGHT_LBS = 90.0
+MAX_PLAUSIBLE_WEIGHT_LBS = 400.0
+
+
+@dataclass
+class PipelineResult:
+    """Outcome of running a document through the pipeline."""
+
+    document_id: str
+    s3_key: str
+    classification: ClassificationResult
+    extracted_data: dict[str, Any] = field(default_factory=dict)
+    extracted_fields: list[ExtractedField] = field(default_factory=list)
+    raw_text: str = ""
+    warnings: list[str] = field(default_factory=list)
+
+
+class DocumentPipeline:
+    """
+    Runs OCR once per document and shares the result across stages.
+
+    Classification, extraction and validation all read the same parsed
+    ``analyze_document`` result, so each document costs a single Textract
+    pass regardless of how many stages consume it.
+    """
+
+    def __init__(
+        self,
+        document_id: str,
+        s3_key: str,
+        force_reprocess: bool = False,
+        textract: TextractService = textract_service,
+        document_classifier: DocumentClassifier = classifier,
+        data_extractor: DataExtractor = extractor,
+    ) -> None:
+        """
+        Initialize the pipeline for one document.
+
+        Args:
+            document_id: Unique identifier for the document
+            s3_key: S3 object key for the document
+            force_reprocess: Bypass cached OCR results
+            textract: Textract service used for the OCR pass
+            document_classifier: Classifier used for the classify stage
+            data_extractor: Extractor used for the extract stage
+        """
+        self.document_id = document_id
+        self.s3_key = s3_key
+        self.force_reprocess = force_reprocess
+        self.textract = textract
+        self.classifier = document_classifier
+        self.extractor = data_extractor
+        self._ocr_task: asyncio.Task[dict[str, Any]] | None = None
+
+    async def ocr(self) -> dict[str, Any]:
+        """
+        Get the OCR result, running the single Textract pass on first use.
+
+        Concurrent callers share the same in-flight analysis.
+
+        Returns:
+            Textract analysis result
+        """
+        if self._ocr_task is None:
+            self._ocr_task = asyncio.ensure_future(
+                self.textract.analyze_document(
+                    self.s3_key, force_reprocess=self.force_reprocess
+                )
+            )
+        return await self._ocr_task
+
+    async def classify(self) -> ClassificationResult:
+        """Classify the document using the shared OCR result."""
+        return await self.classifier.classify(
+            self.document_id, self.s3_key, ocr_result=await self.ocr()
+        )
+
+    async def extract(
+        self, document_type: DocumentType
+    ) -> tuple[dict[str, Any], list[ExtractedField], str]:
+        """Extract structured data using the shared OCR result."""
+        return await self.extractor.extract(
+            self.document_id,
+            self.s3_key,
+            document_type,
+            ocr_result=await self.ocr(),
+        )
+
+    def validate(self, extracted_data: dict[str, Any]) -> list[str]:
+        """
+        Sanity-check extracted data.
+
+        Args:
+            extracted_data: Structured data produced by the extract stage
+
+        Returns:
+            Human-readable warnings (empty if nothing looks wrong)
+        """
+        warnings = []
+        today = date.today()
+
+        for name in PAST_DATE_FIELDS:
+            value = extracted_data.get(name)
+            if isinstance(value, date) and value > today:
+                warnings.append(f"{name} is in the future ({value.isoformat()})")
+
+        for name in EXPIRY_DATE_FIELDS:
+            value = extracted_data.get(name)
+            if isinstance(value, date) and value < today:
+                warnings.append(f"Document expired on {value.isoformat()}")
+
+        weight = extracted_data.get("weight")
+        if isinstance(weight, int | float) and not (
+            MIN_PLAUSIBLE_WEIGHT_LBS <= weight <= MAX_PLAUSIBLE_WEIGHT_LBS
+        ):
+            warnings.append(f"Weight {weight} lbs is outside the plausible range")
+
+        return warnings
+
+    async def run(self) -> PipelineResult:
+        """
+        Run OCR, classification, extraction and validation.
+
+        Extraction is skipped when the document cannot be classified.
+
+        Returns:
+            Combined pipeline result
+        """
+        classification = await self.classify()
+        result = PipelineResult(
+            document_id=self.document_id,
+            s3_key=self.s3_key,
+            classification=classification,
+        )
+
+        if classification.document_type == DocumentType.UNKNOWN:
+            result.warnings.append("Document type could not be determined")
+            return result
+
+        data, fields, raw_text = await self.extract(classification.document_type)
+        result.extracted_data = data
+        result.extracted_fields = fields
+        result.raw_text = raw_text
+        result.warnings.extend(self.validate(data))
+
+        logger.info(
+            "Document pipeline completed",
+            extra={
+                "document_id": self.document_id,
+                "document_type": classification.document_type,
+                "field_count": len(fields),
+                "warning_count": len(result.warnings),
+            },
+        )
+        return result
@@ -0,0 +1,222 @@
+"""Relevance-ranked compaction and page chunking of OCR text for prompts."""
+
+import math
+import re
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.services.openai_client import CHARS_PER_TOKEN
+
+# OCR lines per chunk; small enough that a relevant form section is not
+# diluted by the boilerplate around it
+CHUNK_LINES = 6
+
+# Words too common in field descriptions to indicate relevance
+STOPWORDS = frozenset(
+    "a an and by etc for if in is name number of on or the to type was whether "
+    "with".split()
+)
+
+WORD_PATTERN = re.compile(r"[a-z]{2,}")
+DATE_PATTERN = re.compile(r"\b\d{1,4}[/.-]\d{1,2}[/.-]\d{2,4}\b")
+LABEL_PATTERN = re.compile(r"^[^:\n]{2,40}:\s*\S", re.MULTILINE)
+
+
+@dataclass
+class Chunk:
+    """A run of consecutive OCR lines and its relevance score."""
+
+    index: int
+    text: str
+    score: float = 0.0
+
+
+@dataclass
+class CompactedText:
+    """Compaction outcome: the text to send and what was left out."""
+
+    text: str
+    kept: list[Chunk] = field(default_factory=list)
+    dropped: list[Chunk] = field(default_factory=list)
+
+    @property
+    def dropped_chars(self) -> int:
+        """Characters of OCR text omitted from the prompt."""
+        return sum(len(chunk.text) for chunk in self.dropped)
+
+
+@dataclass
+class PageChunk:
+    """Consecutive pages extracted together in one map step."""
+
+    pages: list[int]
+    text: str
+    confidence: float
+
+
+def schema_keywords(descriptions: Iterable[str]) -> set[str]:
+    """
+    Keywords describing the fields being extracted.
+
+    Args:
+        descriptions: Field names and descriptions
+
+    Returns:
+        Lowercase keywords with stopwords removed, including singular forms
+    """
+    keywords = set()
+    for description in descriptions:
+        for word in WORD_PATTERN.findall(description.replace("_", " ").lower()):
+            if word not in STOPWORDS:
+                keywords.add(word)
+                keywords.add(word.rstrip("s"))
+    return keywords
+
+
+def split_chunks(text: str, lines_per_chunk: int = CHUNK_LINES) -> list[Chunk]:
+    """Split OCR text into chunks of consecutive non-empty lines."""
+    lines = [line for line in text.splitlines() if line.strip()]
+    return [
+        Chunk(index, "\n".join(lines[start : start + lines_per_chunk]))
+        for index, start in enumerate(range(0, len(lines), lines_per_chunk))
+    ]
+
+
+def score_chunk(chunk: Chunk, keywords: set[str], total: int) -> float:
+    """
+    Relevance of a chunk to the requested fields.
+
+    Combines keyword hits with layout signals: ``Label: value`` lines and
+    dates are where form fields live, and the first chunks of a document
+    usually hold its header and identity block.
+
+    Args:
+        chunk: Chunk to score
+        keywords: Schema keywords
+        total: Number of chunks in the document
+
+    Returns:
+        Relevance score (higher is more relevant)
+    """
+    words = WORD_PATTERN.findall(chunk.text.lower())
+    hits = sum(
+        1 for word in words if word in keywords or word.rstrip("s") in keywords
+    )
+    labels = len(LABEL_PATTERN.findall(chunk.text))
+    dates = len(DATE_PATTERN.findall(chunk.text))
+    position = 1.0 - chunk.index / max(total, 1)
+    return 2.0 * hits + 1.0 * labels + 1.0 * dates + 2.0 * position
+
+
+def compact_text(
+    text: str, descriptions: Iterable[str], max_tokens: int
+) -> CompactedText:
+    """
+    Keep the chunks most relevant to the schema within a token budget.
+
+    Text already within the budget is returned unchanged. Otherwise chunks
+    are taken in order of relevance until the budget is spent, then
+    restored to document order with a marker where lines were omitted.
+
+    Args:
+        text: OCR text
+        descriptions: Names and descriptions of the fields being extracted
+        max_tokens: Token budget for the text (0 disables compaction)
+
+    Returns:
+        Compacted text with the kept and dropped chunks
+    """
+    chunks = split_chunks(text)
+    budget = max_tokens * CHARS_PER_TOKEN
+    if not max_tokens or len(text) <= budget:
+        return CompactedText(text, kept=chunks)
+
+    keywords = schema_keywords(descriptions)
+    for chunk in chunks:
+        chunk.score = score_chunk(chunk, keywords, len(chunks))
+
+    kept: list[Chunk] = []
+    dropped: list[Chunk] = []
+    used = 0
+    for chunk in sorted(chunks, key=lambda c: (-c.score, c.index)):
+        if used + len(chunk.text) <= budget:
+            kept.append(chunk)
+            used += len(chunk.text) + 1
+        else:
+            dropped.append(chunk)
+    kept.sort(key=lambda c: c.index)
+    dropped.sort(key=lambda c: c.index)
+
+    parts = []
+    previous = -1
+    for chunk in kept:
+        if chunk.index != previous + 1:
+            parts.append("[...]")
+        parts.append(chunk.text)
+        previous = chunk.index
+    if previous != len(chunks) - 1:
+        parts.append("[...]")
+    return CompactedText("\n".join(parts), kept=kept, dropped=dropped)
+
+
+def chunk_pages(
+    pages: Sequence[dict[str, Any]], max_chars: int, max_chunks: int
+) -> list[PageChunk]:
+    """
+    Group consecutive pages into chunks of about ``max_chars`` each.
+
+    The budget grows when needed so there are at most ``max_chunks``
+    chunks; a page longer than the budget is a chunk of its own. Chunk
+    confidence is the page confidences weighted by text length.
+
+    Args:
+        pages: ``{"page", "text", "confidence"}`` entries in page order
+        max_chars: Target characters per chunk
+        max_chunks: Most chunks to return
+
+    Returns:
+        Chunks in page order
+    """
+    pages = [page for page in pages if page.get("text", "").strip()]
+    if not pages:
+        return []
+    total = sum(len(page["text"]) for page in pages)
+    budget = max(max_chars, math.ceil(total / max(max_chunks, 1)))
+
+    groups: list[list[dict[str, Any]]] = []
+    size = 0
+    for page in pages:
+        if groups and size + len(page["text"]) <= budget:
+            groups[-1].append(page)
+            size += len(page["text"]) + 1
+        else:
+            groups.append([page])
+            size = len(page["text"])
+
+    # Greedy packing can leave up to twice the limit; merge the smallest
+    # neighbouring pair until it fits
+    def length(group: list[dict[str, Any]]) -> int:
+        return sum(len(page["text"]) for page in group)
+
+    while len(groups) > max(max_chunks, 1):
+        index = min(
+            range(len(groups) - 1),
+            key=lambda i: length(groups[i]) + length(groups[i + 1]),
+        )
+        groups[index : index + 2] = [groups[index] + groups[index + 1]]
+
+    chunks = []
+    for group in groups:
+        chars = length(group) or 1
+        chunks.append(
+            PageChunk(
+                pages=[page["page"] for page in group],
+                text="\n".join(page["text"] for page in group),
+                confidence=sum(
+                    page.get("confidence", 0.0) * len(page["text"]) for page in group
+                )
+                / chars,
+            )
+        )
+    return chunks
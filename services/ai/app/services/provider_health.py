@@ -0,0 +1,194 @@
+"""Rolling health statistics and circuit breakers for AI providers."""
+
+import math
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Any
+
+# Samples required before a latency percentile is trusted
+MIN_LATENCY_SAMPLES = 10
+
+
+class CircuitState(str, Enum):
+    """Circuit breaker state."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class ProviderStats:
+    """
+    Rolling window of recent call outcomes for one provider.
+
+    Only successful calls contribute latencies: a fast failure says
+    nothing about how long a good answer takes.
+    """
+
+    def __init__(self, window: int = 200) -> None:
+        """
+        Initialize the statistics.
+
+        Args:
+            window: Number of most recent calls retained
+        """
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record_success(self, seconds: float) -> None:
+        """Record a successful call and its latency."""
+        with self._lock:
+            self._latencies.append(seconds)
+            self._outcomes.append(True)
+
+    def record_failure(self) -> None:
+        """Record a failed call."""
+        with self._lock:
+            self._outcomes.append(False)
+
+    @property
+    def error_rate(self) -> float:
+        """Fraction of recent calls that failed (0 with no calls)."""
+        with self._lock:
+            if not self._outcomes:
+                return 0.0
+            return self._outcomes.count(False) / len(self._outcomes)
+
+    def latency_percentile(self, percentile: float) -> float | None:
+        """
+        Get a latency percentile over the window.
+
+        Args:
+            percentile: Percentile as a fraction (e.g. 0.95)
+
+        Returns:
+            Latency in seconds, or None until enough samples exist
+        """
+        with self._lock:
+            if len(self._latencies) < MIN_LATENCY_SAMPLES:
+                return None
+            ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, math.ceil(percentile * len(ordered)) - 1)
+        return ordered[max(index, 0)]
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open circuit breaker.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls are refused for ``reset_timeout`` seconds. It then half-opens and
+    admits a single probe call: success closes the circuit, failure opens
+    it again for another timeout.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        """
+        Initialize the breaker in the closed state.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before a probe
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state, moving from open to half-open once the timeout passes."""
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> CircuitState:
+        """Current state (caller holds the lock)."""
+        if self._opened_at is None:
+            return CircuitState.CLOSED
+        if time.monotonic() - self._opened_at < self.reset_timeout:
+            return CircuitState.OPEN
+        return CircuitState.HALF_OPEN
+
+    def available(self) -> bool:
+        """Whether a call would currently be admitted (without admitting it)."""
+        with self._lock:
+            state = self._state()
+            return state == CircuitState.CLOSED or (
+                state == CircuitState.HALF_OPEN and not self._probing
+            )
+
+    def acquire(self) -> bool:
+        """
+        Admit a call if the circuit allows it.
+
+        Returns:
+            False if the circuit is open or a half-open probe is in flight
+        """
+        with self._lock:
+            state = self._state()
+            if state == CircuitState.CLOSED:
+                return True
+            if state == CircuitState.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def release(self) -> None:
+        """Give back an admitted call that ended without an outcome."""
+        with self._lock:
+            self._probing = False
+
+    def record_success(self) -> None:
+        """Record a successful call, closing the circuit."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the circuit at the threshold."""
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+
+class ProviderHealth:
+    """Statistics and circuit breaker for one provider."""
+
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        """
+        Initialize provider health tracking.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before a probe
+        """
+        self.stats = ProviderStats()
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+
+    def routing_key(self) -> tuple[int, float]:
+        """
+        Sort key ranking providers from healthiest to least healthy.
+
+        Closed circuits come before half-open ones; within a state, the
+        error rate is compared in 10% steps so that small fluctuations do
+        not flip the configured preference order.
+        """
+        rank = 0 if self.breaker.state == CircuitState.CLOSED else 1
+        return rank, round(self.stats.error_rate, 1)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Current state and statistics for health reporting."""
+        return {
+            "state": self.breaker.state.value,
+            "error_rate": round(self.stats.error_rate, 3),
+            "latency_p50_seconds": self.stats.latency_percentile(0.5),
+            "latency_p95_seconds": self.stats.latency_percentile(0.95),
+        }
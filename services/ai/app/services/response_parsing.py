@@ -0,0 +1,157 @@
+"""Helpers for parsing structured AI responses."""
+
+import json
+import re
+from typing import Any
+
+# Matches a fenced code block such as ```json ... ```
+_FENCE_PATTERN = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+
+
+def extract_json_object(text: str) -> dict[str, Any] | None:
+    """
+    Extract the first JSON object from an AI response.
+
+    Handles bare JSON, JSON inside Markdown code fences, and JSON surrounded
+    by explanatory prose.
+
+    Args:
+        text: Raw AI response text
+
+    Returns:
+        Parsed JSON object, or None if no object could be parsed
+    """
+    candidates = [match.group(1) for match in _FENCE_PATTERN.finditer(text)]
+    candidates.append(text)
+
+    decoder = json.JSONDecoder()
+    for candidate in candidates:
+        start = candidate.find("{")
+        while start != -1:
+            try:
+                value, _ = decoder.raw_decode(candidate, start)
+            except ValueError:
+                start = candidate.find("{", start + 1)
+                continue
+            if isinstance(value, dict):
+                return value
+            start = candidate.find("{", start + 1)
+
+    return None
+
+
+class IncrementalJSONParser:
+    """
+    Streaming parser for the members of a single top-level JSON object.
+
+    Text is fed as it arrives; each ``key: value`` pair is returned as soon
+    as its value is complete (a closing quote or bracket, or the delimiter
+    after a number or literal). Anything before the first ``{``, such as
+    prose or a Markdown code fence, is ignored, as is anything after the
+    object closes. Values that are not valid JSON are skipped.
+    """
+
+    # Positions within the top-level object
+    _KEY, _IN_KEY, _COLON, _VALUE, _IN_VALUE, _AFTER_VALUE = range(6)
+
+    def __init__(self) -> None:
+        """Initialize the parser before the object has started."""
+        self._text = ""
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._state = self._KEY
+        self._key: str | None = None
+        self._start = 0
+        self.done = False
+
+    def feed(self, chunk: str) -> list[tuple[str, Any]]:
+        """
+        Consume the next fragment of the response.
+
+        Args:
+            chunk: Response text fragment
+
+        Returns:
+            Members completed by this fragment, in document order
+        """
+        completed: list[tuple[str, Any]] = []
+        offset = len(self._text)
+        self._text += chunk
+        for index in range(offset, len(self._text)):
+            if self.done:
+                break
+            self._step(self._text[index], index, completed)
+        return completed
+
+    def _step(self, char: str, index: int, completed: list[tuple[str, Any]]) -> None:
+        """Advance the state machine by one character."""
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif char == "\\":
+                self._escape = True
+            elif char == '"':
+                self._in_string = False
+                if self._depth == 1:
+                    self._string_closed(index, completed)
+            return
+
+        if self._depth == 0:
+            if char == "{":
+                self._depth = 1
+                self._state = self._KEY
+            return
+
+        if char == '"':
+            self._in_string = True
+            if self._depth == 1 and self._state == self._KEY:
+                self._start = index
+                self._state = self._IN_KEY
+            elif self._depth == 1 and self._state == self._VALUE:
+                self._start = index
+                self._state = self._IN_VALUE
+        elif char in "{[":
+            if self._depth == 1 and self._state == self._VALUE:
+                self._start = index
+                self._state = self._IN_VALUE
+            self._depth += 1
+        elif char in "}]":
+            self._depth -= 1
+            if self._depth == 1 and self._state == self._IN_VALUE:
+                self._emit(index + 1, completed)
+            elif self._depth == 0:
+                if self._state == self._IN_VALUE:
+                    self._emit(index, completed)
+                self.done = True
+        elif self._depth == 1:
+            if char == ":" and self._state == self._COLON:
+                self._state = self._VALUE
+            elif char == ",":
+                if self._state == self._IN_VALUE:
+                    self._emit(index, completed)
+                self._state = self._KEY
+            elif not char.isspace() and self._state == self._VALUE:
+                self._start = index
+                self._state = self._IN_VALUE
+
+    def _string_closed(self, index: int, completed: list[tuple[str, Any]]) -> None:
+        """Handle the end of a string directly inside the object."""
+        if self._state == self._IN_KEY:
+            try:
+                self._key = json.loads(self._text[self._start : index + 1])
+            except ValueError:
+                self._key = None
+            self._state = self._COLON
+        elif self._state == self._IN_VALUE and self._text[self._start] == '"':
+            self._emit(index + 1, completed)
+
+    def _emit(self, end: int, completed: list[tuple[str, Any]]) -> None:
+        """Decode the current value and record the member."""
+        self._state = self._AFTER_VALUE
+        try:
+            value = json.loads(self._text[self._start : end])
+        except ValueError:
+            return
+        if self._key is not None:
+            completed.append((self._key, value))
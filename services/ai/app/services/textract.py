@@ -1,68 +1,147 @@
 """AWS Textract service wrapper."""
 
+import asyncio
+import time
+from collections.abc import Callable, Sequence
 from typing import Any
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import BotoCoreError, ClientError
 
 from app.config import settings
-from app.core.exceptions import TextractError
+from app.core.cache import LRUCache, TwoTierCache, make_cache_key
+from app.core.exceptions import DocumentNotFoundException, TextractError
+from app.core.executor import BlockingExecutor, ProcessExecutor
 from app.core.logging import get_logger
+from app.services.image_preprocessing import (
+    IMAGE_EXTENSIONS,
+    UNSUPPORTED_EXTENSIONS,
+    is_available,
+    preprocess_image,
+)
+from app.services.ocr_backends import (
+    EmbeddedTextBackend,
+    OCRBackend,
+    pdf_support,
+    split_pdf_pages,
+)
+from app.services.ocr_blocks import compact_result
+from app.services.textract_blocks import parse_blocks
+from app.services.textract_jobs import TextractJobPoller
 
 logger = get_logger(__name__)
 
+# Feature types requested from analyze_document by default
+DEFAULT_FEATURE_TYPES: tuple[str, ...] = ("TABLES", "FORMS")
+
+# Cache feature tag for plain detect_document_text results
+DETECT_TEXT_FEATURE = "TEXT"
+
+# Extensions that may hold multiple pages and need asynchronous jobs
+MULTI_PAGE_EXTENSIONS: tuple[str, ...] = (".pdf", ".tif", ".tiff")
+
+# Engine name recorded on results produced by Textract itself
+TEXTRACT_ENGINE = "textract"
+
+# Largest document Textract's synchronous APIs accept
+TEXTRACT_MAX_BYTES = 10 * 1024 * 1024
+
 
 class TextractService:
-    """Service for AWS Textract OCR operations."""
+    """
+    Service for AWS Textract OCR operations.
+
+    Local backends (such as the embedded PDF text reader) are tried first;
+    Textract is only called for documents none of them can read. Results
+    are cached the same way whichever engine produced them. Large or HEIC
+    photos are shrunk in a process pool and sent to Textract as bytes.
+    """
 
     def __init__(self) -> None:
         """Initialize the Textract service."""
+        # boto3 clients are blocking; calls are dispatched to a bounded thread
+        # pool with a connection pool sized to match, so every in-flight call
+        # has a connection and none block the event loop.
+        client_config = Config(
+            max_pool_connections=settings.textract_max_concurrency,
+            retries={"mode": "standard"},
+        )
         self.client = boto3.client(
             "textract",
             region_name=settings.aws_region,
             aws_access_key_id=settings.aws_access_key_id or None,
             aws_secret_access_key=settings.aws_secret_access_key or None,
+            config=client_config,
+        )
+        self.s3_client = boto3.client(
+            "s3",
+            region_name=settings.aws_region,
+            aws_access_key_id=settings.aws_access_key_id or None,
+            aws_secret_access_key=settings.aws_secret_access_key or None,
+            config=client_config,
+        )
+        self.executor = BlockingExecutor(
+            settings.textract_max_concurrency, name="textract"
+        )
+        self.job_poller = TextractJobPoller(
+            self.executor,
+            initial_interval=settings.textract_poll_initial_seconds,
+            max_interval=settings.textract_poll_max_seconds,
+            timeout=settings.processing_timeout_seconds,
         )
         self.s3_bucket = settings.s3_bucket
+        self.cache = (
+            TwoTierCache(
+                settings.ocr_cache_max_entries,
+                settings.ocr_cache_dir or None,
+                pack=compact_result,
+            )
+            if settings.ocr_cache_enabled
+            else None
+        )
+        # s3_key -> (etag, expires_at); lets cache hits skip the S3 HEAD
+        self._etags = LRUCache(settings.ocr_cache_max_entries * 4)
+        self.image_executor = (
+            ProcessExecutor(settings.image_preprocess_workers, name="image")
+            if settings.image_preprocess_enabled and is_available()
+            else None
+        )
+        self.local_backends: list[OCRBackend] = (
+            [EmbeddedTextBackend(settings.embedded_text_min_chars_per_page)]
+            if settings.embedded_text_enabled
+            else []
+        )
 
-    async def extract_text(self, s3_key: str) -> dict[str, Any]:
+    async def extract_text(
+        self, s3_key: str, force_reprocess: bool = False
+    ) -> dict[str, Any]:
         """
         Extract text from a document using Textract.
 
         Args:
             s3_key: S3 object key for the document
+            force_reprocess: Bypass cached results and call Textract again
 
         Returns:
             Textract analysis result with extracted text and metadata
 
         Raises:
+            DocumentNotFoundException: If the S3 object does not exist
             TextractError: If text extraction fails
         """
         logger.info("Starting Textract text extraction", extra={"s3_key": s3_key})
 
-        try:
-            # TODO: Implement actual Textract call
-            # response = self.client.detect_document_text(
-            #     Document={
-            #         'S3Object': {
-            #             'Bucket': self.s3_bucket,
-            #             'Name': s3_key
-            #         }
-            #     }
-            # )
-
-            # Stub implementation
-            logger.info(
-                "Textract extraction completed (stub)", extra={"s3_key": s3_key}
-            )
-
-            return {
-                "blocks": [],
-                "text": "",
-                "confidence": 0.0,
-                "note": "Stub implementation",
-            }
+        cache_key = await self._cache_key(
+            s3_key, (DETECT_TEXT_FEATURE,), force_reprocess
+        )
+        cached = self._cache_get(cache_key, force_reprocess)
+        if cached is not None:
+            logger.info("Textract extraction served from cache", extra={"s3_key": s3_key})
+            return cached
 
+        try:
+            engine, blocks = await self._ocr(s3_key, None)
         except (BotoCoreError, ClientError) as e:
             logger.error(
                 "Textract extraction failed",
@@ -74,7 +153,28 @@ class TextractService:
                 details={"s3_key": s3_key},
             ) from e
 
-    async def analyze_document(self, s3_key: str) -> dict[str, Any]:
+        parsed = parse_blocks(blocks)
+        result = {
+            "blocks": blocks,
+            "text": parsed.text,
+            "pages": parsed.pages,
+            "confidence": parsed.confidence,
+            "ocr_engine": engine,
+        }
+
+        logger.info(
+            "Textract extraction completed",
+            extra={"s3_key": s3_key, "block_count": len(blocks), "engine": engine},
+        )
+        self._cache_set(cache_key, result)
+        return result
+
+    async def analyze_document(
+        self,
+        s3_key: str,
+        feature_types: Sequence[str] = DEFAULT_FEATURE_TYPES,
+        force_reprocess: bool = False,
+    ) -> dict[str, Any]:
         """
         Perform advanced document analysis using Textract.
 
@@ -82,40 +182,26 @@ class TextractService:
 
         Args:
             s3_key: S3 object key for the document
+            feature_types: Textract feature types to request
+            force_reprocess: Bypass cached results and call Textract again
 
         Returns:
             Textract analysis result with comprehensive document analysis
 
         Raises:
+            DocumentNotFoundException: If the S3 object does not exist
             TextractError: If document analysis fails
         """
         logger.info("Starting Textract document analysis", extra={"s3_key": s3_key})
 
-        try:
-            # TODO: Implement actual Textract analyze_document call
-            # response = self.client.analyze_document(
-            #     Document={
-            #         'S3Object': {
-            #             'Bucket': self.s3_bucket,
-            #             'Name': s3_key
-            #         }
-            #     },
-            #     FeatureTypes=['TABLES', 'FORMS']
-            # )
-
-            # Stub implementation
-            logger.info(
-                "Textract analysis completed (stub)", extra={"s3_key": s3_key}
-            )
-
-            return {
-                "blocks": [],
-                "forms": [],
-                "tables": [],
-                "text": "",
-                "note": "Stub implementation",
-            }
+        cache_key = await self._cache_key(s3_key, feature_types, force_reprocess)
+        cached = self._cache_get(cache_key, force_reprocess)
+        if cached is not None:
+            logger.info("Textract analysis served from cache", extra={"s3_key": s3_key})
+            return cached
 
+        try:
+            engine, blocks = await self._ocr(s3_key, feature_types)
         except (BotoCoreError, ClientError) as e:
             logger.error(
                 "Textract analysis failed",
@@ -127,6 +213,407 @@ class TextractService:
                 details={"s3_key": s3_key},
             ) from e
 
+        # Resolved once here so every consumer of the (cached) result reads
+        # forms and tables without walking the block graph again
+        parsed = parse_blocks(blocks)
+        result = {
+            "blocks": blocks,
+            "forms": parsed.forms,
+            "tables": parsed.tables,
+            "text": parsed.text,
+            "pages": parsed.pages,
+            "confidence": parsed.confidence,
+            "ocr_engine": engine,
+        }
+
+        logger.info(
+            "Textract analysis completed",
+            extra={"s3_key": s3_key, "block_count": len(blocks), "engine": engine},
+        )
+        self._cache_set(cache_key, result)
+        return result
+
+    def cache_stats(self) -> dict[str, int]:
+        """
+        Get OCR cache counters.
+
+        Returns:
+            Hit, disk hit, miss and eviction counts (all zero if caching is off)
+        """
+        if self.cache is None:
+            return {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        return self.cache.stats.as_dict()
+
+    def _document(self, s3_key: str) -> dict[str, Any]:
+        """Build the Textract Document parameter for an S3 object."""
+        return {"S3Object": {"Bucket": self.s3_bucket, "Name": s3_key}}
+
+    def _is_multi_page(self, s3_key: str) -> bool:
+        """Whether a document should go through an asynchronous Textract job."""
+        return settings.textract_async_multipage and s3_key.lower().endswith(
+            MULTI_PAGE_EXTENSIONS
+        )
+
+    async def _ocr(
+        self, s3_key: str, feature_types: Sequence[str] | None
+    ) -> tuple[str, list[dict[str, Any]]]:
+        """
+        Read a document with the cheapest engine that can.
+
+        PDFs are downloaded once and offered to the local backends whole;
+        failing that they are split and read page by page (local backends
+        per page, Textract's synchronous API for the rest), so a packet
+        takes as long as its slowest page. Everything else, and PDFs that
+        cannot be split, go to Textract directly.
+
+        Args:
+            s3_key: S3 object key for the document
+            feature_types: Textract feature types, or None for text detection
+
+        Returns:
+            (engine name, blocks)
+
+        Raises:
+            BotoCoreError, ClientError: If Textract fails
+        """
+        if feature_types is None:
+            sync_call = self.client.detect_document_text
+            start_job = self.client.start_document_text_detection
+            get_results = self.client.get_document_text_detection
+            params: dict[str, Any] = {}
+        else:
+            sync_call = self.client.analyze_document
+            start_job = self.client.start_document_analysis
+            get_results = self.client.get_document_analysis
+            params = {"FeatureTypes": list(feature_types)}
+
+        content = None
+        if self._splits_pages(s3_key) or any(
+            backend.accepts(s3_key) for backend in self.local_backends
+        ):
+            content = await self._download(
+                s3_key, settings.max_document_size_mb * 1024 * 1024
+            )
+        if content:
+            local = await self._read_locally(s3_key, content)
+            if local is not None:
+                return local
+            if self._splits_pages(s3_key):
+                pages = await self.executor.run(
+                    split_pdf_pages, content, settings.ocr_page_parallel_max_pages
+                )
+                if pages and max(len(page) for page in pages) <= TEXTRACT_MAX_BYTES:
+                    return await self._ocr_pages(s3_key, pages, sync_call, params)
+
+        if self._is_multi_page(s3_key):
+            blocks = await self._run_async_job(
+                start_job,
+                get_results,
+                DocumentLocation=self._document(s3_key),
+                **params,
+            )
+        else:
+            response = await self.executor.run(
+                sync_call, Document=await self._image_document(s3_key), **params
+            )
+            blocks = response.get("Blocks", [])
+        return TEXTRACT_ENGINE, blocks
+
+    async def _read_locally(
+        self, s3_key: str, content: bytes
+    ) -> tuple[str, list[dict[str, Any]]] | None:
+        """
+        Try the local backends before paying for a Textract call.
+
+        Args:
+            s3_key: S3 object key for the document
+            content: Document bytes
+
+        Returns:
+            (backend name, blocks), or None if Textract is needed
+        """
+        for backend in self.local_backends:
+            if not backend.accepts(s3_key):
+                continue
+            blocks = await self.executor.run(backend.read, content)
+            if blocks is not None:
+                logger.info(
+                    "Document read without Textract",
+                    extra={"s3_key": s3_key, "engine": backend.name},
+                )
+                return backend.name, blocks
+        return None
+
+    def _splits_pages(self, s3_key: str) -> bool:
+        """Whether a document should be read page by page."""
+        return (
+            settings.ocr_page_parallel_enabled
+            and pdf_support()
+            and s3_key.lower().endswith(".pdf")
+        )
+
+    async def _ocr_pages(
+        self,
+        s3_key: str,
+        pages: list[bytes],
+        sync_call: Callable[..., dict[str, Any]],
+        params: dict[str, Any],
+    ) -> tuple[str, list[dict[str, Any]]]:
+        """
+        Read single-page PDFs concurrently and stitch their blocks together.
+
+        At most OCR_PAGE_CONCURRENCY pages of one document are in flight at
+        once, so a long packet cannot monopolize the Textract pool.
+
+        Args:
+            s3_key: S3 object key for the document
+            pages: One PDF per page
+            sync_call: Synchronous Textract method for pages no local
+                backend can read
+            params: Extra parameters for sync_call
+
+        Returns:
+            (engine names joined with "+", blocks of every page in order)
+
+        Raises:
+            BotoCoreError, ClientError: If Textract fails for any page
+        """
+        semaphore = asyncio.Semaphore(settings.ocr_page_concurrency)
+
+        async def read_page(content: bytes) -> tuple[str, list[dict[str, Any]]]:
+            async with semaphore:
+                local = await self._read_locally(s3_key, content)
+                if local is not None:
+                    return local
+                response = await self.executor.run(
+                    sync_call, Document={"Bytes": content}, **params
+                )
+                return TEXTRACT_ENGINE, response.get("Blocks", [])
+
+        results = await asyncio.gather(*(read_page(page) for page in pages))
+        engines = sorted({engine for engine, _ in results})
+        logger.info(
+            "Document read page by page",
+            extra={"s3_key": s3_key, "pages": len(pages), "engines": engines},
+        )
+        blocks = [
+            block
+            for number, (_, page_blocks) in enumerate(results, start=1)
+            for block in _renumber(page_blocks, number)
+        ]
+        return "+".join(engines), blocks
+
+    async def _image_document(self, s3_key: str) -> dict[str, Any]:
+        """
+        Build the Document parameter for a synchronous Textract call.
+
+        Photos over IMAGE_PREPROCESS_MIN_KB (and every HEIC photo, which
+        Textract cannot read) are downloaded, preprocessed in the image
+        process pool and sent as bytes. Everything else, and any image the
+        preprocessing does not shrink, is read by Textract from S3.
+
+        Args:
+            s3_key: S3 object key for the document
+
+        Returns:
+            Textract Document parameter
+        """
+        key = s3_key.lower()
+        if self.image_executor is None or not key.endswith(IMAGE_EXTENSIONS):
+            return self._document(s3_key)
+
+        convert = key.endswith(UNSUPPORTED_EXTENSIONS)
+        content = await self._download(
+            s3_key,
+            settings.image_preprocess_max_source_mb * 1024 * 1024,
+            min_bytes=0 if convert else settings.image_preprocess_min_kb * 1024,
+        )
+        if content is None:
+            return self._document(s3_key)
+        processed = await self.image_executor.run(
+            preprocess_image,
+            content,
+            settings.image_preprocess_max_edge_px,
+            settings.image_preprocess_jpeg_quality,
+        )
+        if (
+            processed is None
+            or len(processed) > TEXTRACT_MAX_BYTES
+            or (len(processed) >= len(content) and not convert)
+        ):
+            return self._document(s3_key)
+
+        logger.info(
+            "Image preprocessed for OCR",
+            extra={
+                "s3_key": s3_key,
+                "original_bytes": len(content),
+                "processed_bytes": len(processed),
+            },
+        )
+        return {"Bytes": processed}
+
+    async def _download(
+        self, s3_key: str, max_bytes: int, min_bytes: int = 0
+    ) -> bytes | None:
+        """
+        Fetch a document's bytes for local processing.
+
+        Objects outside the size range, or that cannot be read, return None
+        and are left to Textract, which reports its own errors.
+
+        Args:
+            s3_key: S3 object key for the document
+            max_bytes: Largest object worth downloading
+            min_bytes: Smallest object worth downloading
+
+        Returns:
+            Object bytes, or None
+        """
+        try:
+            response = await self.executor.run(
+                self.s3_client.get_object, Bucket=self.s3_bucket, Key=s3_key
+            )
+            if not min_bytes <= response.get("ContentLength", 0) <= max_bytes:
+                response["Body"].close()
+                return None
+            return await self.executor.run(response["Body"].read)
+        except (BotoCoreError, ClientError) as e:
+            logger.info(
+                "Document download for local OCR failed",
+                extra={"s3_key": s3_key, "error": str(e)},
+            )
+            return None
+
+    async def _run_async_job(
+        self,
+        start_job: Callable[..., dict[str, Any]],
+        get_results: Callable[..., dict[str, Any]],
+        **params: Any,
+    ) -> list[dict[str, Any]]:
+        """
+        Start an asynchronous Textract job and wait for all of its blocks.
+
+        Args:
+            start_job: Start* client method
+            get_results: Matching Get* client method
+            **params: Parameters for the Start* call
+
+        Returns:
+            All blocks produced by the job
+        """
+        response = await self.executor.run(start_job, **params)
+        job_id = response["JobId"]
+        logger.info(
+            "Textract job started",
+            extra={"job_id": job_id, "outstanding": self.job_poller.outstanding},
+        )
+        return await self.job_poller.wait(job_id, get_results)
+
+    async def _cache_key(
+        self, s3_key: str, feature_types: Sequence[str], refresh: bool = False
+    ) -> str | None:
+        """
+        Build the content-addressed cache key for an S3 object.
+
+        The object's ETag is part of the key, so overwriting the object
+        naturally invalidates previous results.
+
+        Args:
+            s3_key: S3 object key for the document
+            feature_types: Textract feature types requested
+            refresh: Re-read the ETag even if a memoized one is still fresh
+
+        Returns:
+            Cache key, or None if caching is disabled
+
+        Raises:
+            DocumentNotFoundException: If the S3 object does not exist
+            TextractError: If the object metadata cannot be read
+        """
+        if self.cache is None:
+            return None
+
+        etag = await self._etag(s3_key, refresh)
+        return make_cache_key(
+            self.s3_bucket, s3_key, etag, ",".join(sorted(feature_types))
+        )
+
+    async def _etag(self, s3_key: str, refresh: bool) -> str:
+        """
+        Get an object's ETag, memoized for OCR_ETAG_TTL_SECONDS.
+
+        Within the TTL a cache hit costs no network round trip; an object
+        overwritten inside that window is picked up once the TTL lapses.
+        """
+        memo = None if refresh else self._etags.get(s3_key)
+        if memo is not None and memo[1] > time.monotonic():
+            return memo[0]
+
+        try:
+            head = await self.executor.run(
+                self.s3_client.head_object, Bucket=self.s3_bucket, Key=s3_key
+            )
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code", "")
+            if error_code in ("404", "NoSuchKey", "NotFound"):
+                raise DocumentNotFoundException(
+                    f"Document not found in S3: {s3_key}",
+                    details={"s3_key": s3_key, "bucket": self.s3_bucket},
+                ) from e
+            raise TextractError(
+                f"Failed to read document metadata: {str(e)}",
+                details={"s3_key": s3_key},
+            ) from e
+        except BotoCoreError as e:
+            raise TextractError(
+                f"Failed to read document metadata: {str(e)}",
+                details={"s3_key": s3_key},
+            ) from e
+
+        etag = head.get("ETag", "").strip('"')
+        expires_at = time.monotonic() + settings.ocr_etag_ttl_seconds
+        self._etags.set(s3_key, (etag, expires_at))
+        return etag
+
+    def _cache_get(
+        self, cache_key: str | None, force_reprocess: bool
+    ) -> dict[str, Any] | None:
+        """Look up a cached result unless reprocessing is forced."""
+        if self.cache is None or cache_key is None or force_reprocess:
+            return None
+        return self.cache.get(cache_key)
+
+    def _cache_set(self, cache_key: str | None, result: dict[str, Any]) -> None:
+        """Store a result in the cache if caching is enabled."""
+        if self.cache is not None and cache_key is not None:
+            self.cache.set(cache_key, result)
+
+
+def _renumber(blocks: list[dict[str, Any]], page: int) -> list[dict[str, Any]]:
+    """
+    Place a single-page result at its page in the whole document.
+
+    Ids are prefixed with the page number because engines number blocks per
+    call, and relationship Ids are rewritten to match.
+    """
+
+    def page_id(block_id: str) -> str:
+        return f"{page}-{block_id}"
+
+    renumbered = []
+    for block in blocks:
+        block = {**block, "Page": page}
+        if "Id" in block:
+            block["Id"] = page_id(block["Id"])
+        if "Relationships" in block:
+            block["Relationships"] = [
+                {**link, "Ids": [page_id(block_id) for block_id in link.get("Ids", [])]}
+                for link in block["Relationships"]
+            ]
+        renumbered.append(block)
+    return renumbered
+
 
 # Global service instance
 textract_service = TextractService()
@@ -0,0 +1,172 @@
+"""Parser for the Textract block graph."""
+
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+# Text used for checkbox and radio-button blocks, in Textract's own terms
+SELECTED = "SELECTED"
+NOT_SELECTED = "NOT_SELECTED"
+
+
+class BlockGraph:
+    """
+    Textract blocks indexed by Id.
+
+    Textract links blocks by Id (a LINE lists its WORD children, a KEY lists
+    its VALUE). Indexing once makes each relationship lookup a dict access
+    instead of a scan of every block on every page.
+    """
+
+    def __init__(self, blocks: Sequence[dict[str, Any]]) -> None:
+        """
+        Index the blocks.
+
+        Args:
+            blocks: Blocks returned by Textract
+        """
+        self.blocks = blocks
+        self.by_id = {block["Id"]: block for block in blocks if "Id" in block}
+
+    def related(
+        self, block: dict[str, Any], relationship: str = "CHILD"
+    ) -> list[dict[str, Any]]:
+        """
+        Blocks linked from a block by one relationship type.
+
+        Args:
+            block: Source block
+            relationship: Relationship type (CHILD, VALUE, MERGED_CELL, ...)
+
+        Returns:
+            Linked blocks in Textract's order; unknown Ids are skipped
+        """
+        return [
+            self.by_id[block_id]
+            for link in block.get("Relationships") or []
+            if link.get("Type") == relationship
+            for block_id in link.get("Ids", [])
+            if block_id in self.by_id
+        ]
+
+    def text(self, block: dict[str, Any]) -> str:
+        """
+        Text of a block assembled from its WORD and SELECTION_ELEMENT children.
+
+        Args:
+            block: KEY, VALUE or CELL block
+
+        Returns:
+            Space-separated words
+        """
+        words = []
+        for child in self.related(block):
+            if child.get("BlockType") == "WORD":
+                words.append(child.get("Text", ""))
+            elif child.get("BlockType") == "SELECTION_ELEMENT":
+                words.append(child.get("SelectionStatus", NOT_SELECTED))
+        return " ".join(word for word in words if word)
+
+
+@dataclass
+class ParsedBlocks:
+    """Text, form key-value pairs and tables recovered from Textract blocks."""
+
+    text: str
+    confidence: float
+    forms: list[dict[str, Any]] = field(default_factory=list)
+    tables: list[dict[str, Any]] = field(default_factory=list)
+    pages: list[dict[str, Any]] = field(default_factory=list)
+
+
+def parse_blocks(blocks: Sequence[dict[str, Any]]) -> ParsedBlocks:
+    """
+    Resolve a Textract block list into text, forms and tables in one pass.
+
+    Form pairs are ``{"key", "value", "confidence", "page"}`` with the lower
+    of the KEY and VALUE confidences on a 0-1 scale. Tables are
+    ``{"page", "rows", "confidence"}`` where ``rows`` is a grid of cell
+    text; a merged cell's text sits in its top-left position. Pages are
+    ``{"page", "text", "confidence"}`` in page order.
+
+    Args:
+        blocks: Blocks returned by Textract
+
+    Returns:
+        Parsed document
+    """
+    graph = BlockGraph(blocks)
+    lines: list[str] = []
+    page_lines: dict[int, list[str]] = {}
+    page_confidences: dict[int, list[float]] = {}
+    forms: list[dict[str, Any]] = []
+    tables: list[dict[str, Any]] = []
+
+    for block in blocks:
+        block_type = block.get("BlockType")
+        if block_type == "LINE":
+            page = block.get("Page", 1)
+            lines.append(block.get("Text", ""))
+            page_lines.setdefault(page, []).append(block.get("Text", ""))
+            confidences = page_confidences.setdefault(page, [])
+            if "Confidence" in block:
+                confidences.append(block["Confidence"])
+        elif block_type == "KEY_VALUE_SET" and "KEY" in block.get("EntityTypes", []):
+            forms.append(_form_pair(graph, block))
+        elif block_type == "TABLE":
+            tables.append(_table(graph, block))
+
+    pages = [
+        {
+            "page": page,
+            "text": "\n".join(page_lines[page]),
+            "confidence": _mean_confidence(page_confidences[page]),
+        }
+        for page in sorted(page_lines)
+    ]
+    confidence = _mean_confidence(
+        [value for values in page_confidences.values() for value in values]
+    )
+    return ParsedBlocks("\n".join(lines), confidence, forms, tables, pages)
+
+
+def _mean_confidence(confidences: list[float]) -> float:
+    """Average Textract confidence on a 0-1 scale."""
+    if not confidences:
+        return 0.0
+    return sum(confidences) / len(confidences) / 100.0
+
+
+def _form_pair(graph: BlockGraph, key_block: dict[str, Any]) -> dict[str, Any]:
+    """Build a form pair from a KEY block and its VALUE blocks."""
+    values = graph.related(key_block, "VALUE")
+    confidences = [
+        block.get("Confidence", 100.0) for block in (key_block, *values)
+    ]
+    return {
+        "key": graph.text(key_block),
+        "value": " ".join(filter(None, (graph.text(value) for value in values))),
+        "confidence": min(confidences) / 100.0,
+        "page": key_block.get("Page", 1),
+    }
+
+
+def _table(graph: BlockGraph, table_block: dict[str, Any]) -> dict[str, Any]:
+    """Build a grid of cell text from a TABLE block and its CELL children."""
+    cells = [
+        cell
+        for cell in graph.related(table_block)
+        if cell.get("BlockType") == "CELL"
+    ]
+    row_count = max((cell.get("RowIndex", 1) for cell in cells), default=0)
+    column_count = max((cell.get("ColumnIndex", 1) for cell in cells), default=0)
+    rows = [[""] * column_count for _ in range(row_count)]
+    for cell in cells:
+        rows[cell.get("RowIndex", 1) - 1][cell.get("ColumnIndex", 1) - 1] = (
+            graph.text(cell)
+        )
+    return {
+        "page": table_block.get("Page", 1),
+        "rows": rows,
+        "confidence": table_block.get("Confidence", 100.0) / 100.0,
+    }
@@ -0,0 +1,260 @@
+"""Poller for asynchronous (multi-page) Textract jobs."""
+
+import asyncio
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+from app.core.exceptions import TextractError
+from app.core.executor import BlockingExecutor
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Maximum blocks Textract returns per Get* call
+MAX_RESULTS_PER_PAGE = 1000
+
+
+@dataclass
+class _PendingJob:
+    """Book-keeping for one outstanding Textract job."""
+
+    job_id: str
+    get_results: Callable[..., dict[str, Any]]
+    future: asyncio.Future[list[dict[str, Any]]]
+    deadline: float
+    interval: float
+    next_poll_at: float
+    next_token: str | None = None
+    blocks: list[dict[str, Any]] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+
+
+class TextractJobPoller:
+    """
+    Shared poller for asynchronous Textract jobs.
+
+    A single background task tracks every outstanding JobId. Jobs that are
+    still running are re-polled with exponential backoff; once a job
+    succeeds its result pages are fetched back to back (following
+    NextToken) and accumulated until the full block list is available.
+    Callers simply await ``wait()`` for their JobId.
+    """
+
+    def __init__(
+        self,
+        executor: BlockingExecutor,
+        initial_interval: float,
+        max_interval: float,
+        timeout: float,
+    ) -> None:
+        """
+        Initialize the poller.
+
+        Args:
+            executor: Executor used for the blocking Get* calls
+            initial_interval: Seconds before the first status poll
+            max_interval: Upper bound for the backoff interval in seconds
+            timeout: Seconds after which an unfinished job is failed
+        """
+        self.executor = executor
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.timeout = timeout
+        self._jobs: dict[str, _PendingJob] = {}
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def outstanding(self) -> int:
+        """Number of jobs currently being tracked."""
+        return len(self._jobs)
+
+    async def wait(
+        self, job_id: str, get_results: Callable[..., dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """
+        Wait for an asynchronous Textract job and return all of its blocks.
+
+        Args:
+            job_id: JobId returned by a Start* call
+            get_results: Matching Get* client method (e.g. get_document_analysis)
+
+        Returns:
+            All blocks produced by the job, in result order
+
+        Raises:
+            TextractError: If the job fails or times out
+        """
+        self._ensure_running()
+        assert self._wakeup is not None
+
+        now = time.monotonic()
+        job = _PendingJob(
+            job_id=job_id,
+            get_results=get_results,
+            future=asyncio.get_running_loop().create_future(),
+            deadline=now + self.timeout,
+            interval=self.initial_interval,
+            next_poll_at=now + self.initial_interval,
+        )
+        self._jobs[job_id] = job
+        self._wakeup.set()
+
+        try:
+            # Backstop in case the polling task itself dies: the deadline is
+            # otherwise only enforced by that task.
+            async with asyncio.timeout(self.timeout + self.max_interval):
+                return await job.future
+        except TimeoutError as e:
+            raise TextractError(
+                "Textract job timed out",
+                details={"job_id": job_id, "timeout_seconds": self.timeout},
+            ) from e
+        finally:
+            self._jobs.pop(job_id, None)
+
+    async def shutdown(self) -> None:
+        """Stop the polling task and fail any jobs still outstanding."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for job in list(self._jobs.values()):
+            if not job.future.done():
+                job.future.set_exception(
+                    TextractError(
+                        "Textract job poller shut down",
+                        details={"job_id": job.job_id},
+                    )
+                )
+        self._jobs.clear()
+
+    def _ensure_running(self) -> None:
+        """Start the polling task in the current loop if it is not running."""
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="textract-job-poller")
+
+    async def _run(self) -> None:
+        """Poll due jobs until cancelled."""
+        assert self._wakeup is not None
+        while True:
+            self._wakeup.clear()
+            now = time.monotonic()
+            due = [job for job in self._jobs.values() if job.next_poll_at <= now]
+
+            if due:
+                await asyncio.gather(*(self._poll_safely(job) for job in due))
+                continue
+
+            if self._jobs:
+                delay = min(job.next_poll_at for job in self._jobs.values()) - now
+            else:
+                delay = None
+
+            try:
+                async with asyncio.timeout(delay):
+                    await self._wakeup.wait()
+            except TimeoutError:
+                pass
+
+    async def _poll_safely(self, job: _PendingJob) -> None:
+        """Poll one job, failing only that job if anything unexpected goes wrong."""
+        try:
+            await self._poll(job)
+        except Exception as e:
+            logger.error(
+                "Unexpected error polling Textract job",
+                extra={"job_id": job.job_id, "error": str(e)},
+                exc_info=True,
+            )
+            if not job.future.done():
+                job.future.set_exception(
+                    TextractError(
+                        f"Failed to poll Textract job: {str(e)}",
+                        details={"job_id": job.job_id},
+                    )
+                )
+
+    async def _poll(self, job: _PendingJob) -> None:
+        """Fetch the next status or result page for one job."""
+        if job.future.done():
+            return
+
+        if time.monotonic() > job.deadline:
+            job.future.set_exception(
+                TextractError(
+                    "Textract job timed out",
+                    details={"job_id": job.job_id, "timeout_seconds": self.timeout},
+                )
+            )
+            return
+
+        params: dict[str, Any] = {
+            "JobId": job.job_id,
+            "MaxResults": MAX_RESULTS_PER_PAGE,
+        }
+        if job.next_token:
+            params["NextToken"] = job.next_token
+
+        try:
+            response = await self.executor.run(job.get_results, **params)
+        except (BotoCoreError, ClientError) as e:
+            logger.error(
+                "Textract job poll failed",
+                extra={"job_id": job.job_id, "error": str(e)},
+            )
+            job.future.set_exception(
+                TextractError(
+                    f"Failed to fetch Textract job results: {str(e)}",
+                    details={"job_id": job.job_id},
+                )
+            )
+            return
+
+        job_status = response.get("JobStatus")
+
+        if job_status == "IN_PROGRESS":
+            job.interval = min(job.interval * 2, self.max_interval)
+            job.next_poll_at = time.monotonic() + job.interval
+            return
+
+        if job_status == "FAILED":
+            job.future.set_exception(
+                TextractError(
+                    f"Textract job failed: {response.get('StatusMessage', '')}",
+                    details={"job_id": job.job_id},
+                )
+            )
+            return
+
+        if job_status == "PARTIAL_SUCCESS":
+            job.warnings.extend(
+                w.get("ErrorCode", "") for w in response.get("Warnings", [])
+            )
+
+        job.blocks.extend(response.get("Blocks", []))
+        job.next_token = response.get("NextToken")
+
+        if job.next_token:
+            # More result pages are ready; fetch them on the next pass
+            job.next_poll_at = time.monotonic()
+            return
+
+        logger.info(
+            "Textract job completed",
+            extra={
+                "job_id": job.job_id,
+                "status": job_status,
+                "block_count": len(job.blocks),
+                "warnings": job.warnings,
+            },
+        )
+        job.future.set_result(job.blocks)
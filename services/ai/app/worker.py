@@ -0,0 +1,81 @@
+"""
+Standalone document processing worker.
+
+Run with ``python -m app.worker`` next to API processes configured with
+``JOB_BACKEND=sqlite``. The API only enqueues jobs; any number of worker
+processes lease them from the shared SQLite queue and run the pipeline.
+"""
+
+import argparse
+import asyncio
+import signal
+
+from app.config import settings
+from app.core.logging import get_logger, setup_logging
+from app.services.job_store import SQLiteJobQueue
+from app.services.jobs import DurableJobManager
+from app.services.textract import textract_service
+
+logger = get_logger(__name__)
+
+
+async def run_worker(worker_count: int) -> None:
+    """
+    Process jobs from the SQLite queue until SIGINT or SIGTERM.
+
+    Args:
+        worker_count: Number of concurrent lease loops in this process
+    """
+    store = SQLiteJobQueue(
+        settings.job_store_path,
+        lease_seconds=settings.job_lease_seconds,
+        max_attempts=settings.job_max_attempts,
+        retry_delay_seconds=settings.job_retry_delay_seconds,
+    )
+    manager = DurableJobManager(
+        store=store,
+        worker_count=worker_count,
+        queue_size=settings.job_queue_size,
+        consume=True,
+        poll_interval=settings.job_poll_interval_seconds,
+    )
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    manager.start()
+    logger.info(
+        "Document worker running",
+        extra={"worker_id": manager.worker_id, "store": settings.job_store_path},
+    )
+
+    await stop.wait()
+
+    logger.info("Document worker stopping", extra={"worker_id": manager.worker_id})
+    await manager.shutdown()
+    await textract_service.job_poller.shutdown()
+    textract_service.executor.shutdown(wait=False)
+    if textract_service.image_executor is not None:
+        textract_service.image_executor.shutdown(wait=False)
+    store.close()
+
+
+def main() -> None:
+    """Parse arguments and run the worker."""
+    parser = argparse.ArgumentParser(description="CombatID document worker")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.job_worker_count,
+        help="Concurrent jobs processed by this process",
+    )
+    args = parser.parse_args()
+
+    setup_logging()
+    asyncio.run(run_worker(args.workers))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,47 @@
 """Pytest configuration and fixtures."""
 
-from typing import AsyncGenerator
+from collections.abc import AsyncGenerator, Generator
+from pathlib import Path
 
 import pytest
 from fastapi.testclient import TestClient
 from httpx import AsyncClient
 
+from app.config import settings
 from app.main import app
+from app.services.textract import TextractService, textract_service
+from tests.fakes import FakeS3Client, FakeTextractClient
+
+
+@pytest.fixture(autouse=True)
+def offline_aws(monkeypatch: pytest.MonkeyPatch) -> FakeTextractClient:
+    """
+    Point the global Textract service at offline fakes.
+
+    Returns:
+        Fake Textract client; its S3 fake is available as ``.s3``
+    """
+    textract_client = FakeTextractClient()
+    textract_client.s3 = FakeS3Client()
+    monkeypatch.setattr(textract_service, "client", textract_client)
+    monkeypatch.setattr(textract_service, "s3_client", textract_client.s3)
+    monkeypatch.setattr(textract_service, "cache", None)
+    return textract_client
 
 
 @pytest.fixture
-def client() -> TestClient:
+def client() -> Generator[TestClient, None, None]:
     """
     Create a test client for the FastAPI application.
 
-    Returns:
+    The client is used as a context manager so the application lifespan
+    (and its background workers) runs for the duration of the test.
+
+    Yields:
         TestClient instance
     """
-    return TestClient(app)
+    with TestClient(app) as test_client:
+        yield test_client
 
 
 @pytest.fixture
@@ -30,3 +54,26 @@ async def async_client() -> AsyncGenerator[AsyncClient, None]:
     """
     async with AsyncClient(app=app, base_url="http://test") as ac:
         yield ac
+
+
+@pytest.fixture
+async def fake_textract(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> AsyncGenerator[TextractService, None]:
+    """
+    Create a Textract service backed by offline fakes.
+
+    Yields:
+        TextractService with fake Textract and S3 clients
+    """
+    monkeypatch.setattr(settings, "ocr_cache_dir", str(tmp_path / "ocr"))
+    monkeypatch.setattr(settings, "textract_poll_initial_seconds", 0.001)
+    monkeypatch.setattr(settings, "textract_poll_max_seconds", 0.004)
+    service = TextractService()
+    service.client = FakeTextractClient()
+    service.s3_client = FakeS3Client()
+    yield service
+    await service.job_poller.shutdown()
+    service.executor.shutdown()
+    if service.image_executor is not None:
+        service.image_executor.shutdown()
@@ -0,0 +1,219 @@
+"""Offline fakes for AWS clients used in tests."""
+
+import io
+from typing import Any
+
+from botocore.exceptions import ClientError
+
+
+def make_line_blocks(lines: list[str], page: int = 1) -> list[dict[str, Any]]:
+    """Build a minimal PAGE + LINE block list for the given text lines."""
+    blocks: list[dict[str, Any]] = [
+        {"BlockType": "PAGE", "Id": f"page-{page}", "Page": page}
+    ]
+    for index, text in enumerate(lines):
+        blocks.append(
+            {
+                "BlockType": "LINE",
+                "Id": f"line-{page}-{index}",
+                "Page": page,
+                "Text": text,
+                "Confidence": 99.0,
+            }
+        )
+    return blocks
+
+
+def make_text_pdf(pages: list[list[str]]) -> bytes:
+    """
+    Build a minimal PDF with a text layer.
+
+    Each page draws its lines top to bottom in Helvetica; a page with no
+    lines has no content at all, like an image-only scan.
+    """
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",  # page tree, filled in once the page objects are numbered
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+    for lines in pages:
+        stream = "".join(
+            f"BT /F1 12 Tf 72 {720 - 20 * index} Td ({line}) Tj ET\n"
+            for index, line in enumerate(lines)
+        ).encode("latin-1")
+        objects.append(
+            b"<< /Length %d >>\nstream\n%sendstream" % (len(stream), stream)
+        )
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>"
+            % len(objects)
+        )
+        page_ids.append(len(objects))
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    return bytes(output)
+
+
+class FakeS3Client:
+    """In-memory stand-in for the boto3 S3 client."""
+
+    def __init__(self) -> None:
+        self.objects: dict[str, dict[str, Any]] = {}
+        self.head_calls = 0
+
+    def put(self, key: str, etag: str = "etag-1", body: bytes = b"") -> None:
+        self.objects[key] = {"ETag": f'"{etag}"', "Body": body}
+
+    def head_object(self, Bucket: str, Key: str) -> dict[str, Any]:
+        self.head_calls += 1
+        if Key not in self.objects:
+            raise ClientError(
+                {"Error": {"Code": "404", "Message": "Not Found"}}, "HeadObject"
+            )
+        obj = self.objects[Key]
+        return {"ETag": obj["ETag"], "ContentLength": len(obj["Body"])}
+
+    def get_object(self, Bucket: str, Key: str) -> dict[str, Any]:
+        if Key not in self.objects:
+            raise ClientError(
+                {"Error": {"Code": "NoSuchKey", "Message": "Not Found"}}, "GetObject"
+            )
+        body = self.objects[Key]["Body"]
+        return {"Body": io.BytesIO(body), "ContentLength": len(body)}
+
+
+class FakeTextractClient:
+    """
+    In-memory stand-in for the boto3 Textract client.
+
+    Supports the synchronous APIs and the asynchronous Start*/Get* job flow.
+    Documents sent as Bytes are recorded in ``uploads``.
+    Jobs report IN_PROGRESS for ``in_progress_polls`` polls, then return
+    their blocks ``page_size`` at a time using NextToken.
+    """
+
+    def __init__(self) -> None:
+        self.documents: dict[str, list[dict[str, Any]]] = {}
+        self.calls: list[str] = []
+        self.uploads: list[bytes] = []
+        self.jobs: dict[str, dict[str, Any]] = {}
+        self.in_progress_polls = 0
+        self.page_size = 1000
+        self.fail_jobs = False
+
+    def add_document(self, key: str, lines: list[str]) -> None:
+        self.documents[key] = make_line_blocks(lines)
+
+    def add_pages(self, key: str, pages: list[list[str]]) -> None:
+        self.documents[key] = [
+            block
+            for number, lines in enumerate(pages, start=1)
+            for block in make_line_blocks(lines, page=number)
+        ]
+
+    def _blocks(self, document: dict[str, Any]) -> list[dict[str, Any]]:
+        if "Bytes" in document:
+            self.uploads.append(document["Bytes"])
+            return make_line_blocks([f"{len(document['Bytes'])} bytes received"])
+        key = document["S3Object"]["Name"]
+        if key not in self.documents:
+            raise ClientError(
+                {"Error": {"Code": "InvalidS3ObjectException", "Message": key}},
+                "AnalyzeDocument",
+            )
+        return self.documents[key]
+
+    def detect_document_text(self, Document: dict[str, Any]) -> dict[str, Any]:
+        self.calls.append("detect_document_text")
+        return {"Blocks": self._blocks(Document)}
+
+    def analyze_document(
+        self, Document: dict[str, Any], FeatureTypes: list[str]
+    ) -> dict[str, Any]:
+        self.calls.append("analyze_document")
+        return {"Blocks": self._blocks(Document)}
+
+    def _start_job(self, DocumentLocation: dict[str, Any]) -> dict[str, Any]:
+        job_id = f"job-{len(self.jobs) + 1}"
+        self.jobs[job_id] = {
+            "blocks": self._blocks(DocumentLocation),
+            "polls_remaining": self.in_progress_polls,
+        }
+        return {"JobId": job_id}
+
+    def _get_job(
+        self, JobId: str, MaxResults: int = 1000, NextToken: str | None = None
+    ) -> dict[str, Any]:
+        job = self.jobs[JobId]
+        if job["polls_remaining"] > 0:
+            job["polls_remaining"] -= 1
+            return {"JobStatus": "IN_PROGRESS"}
+        if self.fail_jobs:
+            return {"JobStatus": "FAILED", "StatusMessage": "Unsupported document"}
+
+        start = int(NextToken or 0)
+        end = start + min(MaxResults, self.page_size)
+        response: dict[str, Any] = {
+            "JobStatus": "SUCCEEDED",
+            "Blocks": job["blocks"][start:end],
+        }
+        if end < len(job["blocks"]):
+            response["NextToken"] = str(end)
+        return response
+
+    def start_document_analysis(
+        self, DocumentLocation: dict[str, Any], FeatureTypes: list[str]
+    ) -> dict[str, Any]:
+        self.calls.append("start_document_analysis")
+        return self._start_job(DocumentLocation)
+
+    def get_document_analysis(self, **params: Any) -> dict[str, Any]:
+        self.calls.append("get_document_analysis")
+        return self._get_job(**params)
+
+    def start_document_text_detection(
+        self, DocumentLocation: dict[str, Any]
+    ) -> dict[str, Any]:
+        self.calls.append("start_document_text_detection")
+        return self._start_job(DocumentLocation)
+
+    def get_document_text_detection(self, **params: Any) -> dict[str, Any]:
+        self.calls.append("get_document_text_detection")
+        return self._get_job(**params)
+
+
+class FakeCompletion:
+    """
+    Scripted replacement for ``AIClient.complete``.
+
+    Returns the response whose trigger substring appears in the system
+    prompt, and records every prompt it receives.
+    """
+
+    def __init__(self, responses: dict[str, str]) -> None:
+        self.responses = responses
+        self.prompts: list[str] = []
+
+    async def __call__(
+        self, prompt: str, system_prompt: str | None = None, **kwargs: Any
+    ) -> str:
+        self.prompts.append(prompt)
+        for trigger, response in self.responses.items():
+            if trigger in (system_prompt or ""):
+                return response
+        return "{}"
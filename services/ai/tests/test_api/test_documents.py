@@ -1,9 +1,27 @@
 """Tests for document processing endpoints."""
 
+import json
+import time
+from typing import Any
+
 import pytest
 from fastapi import status
 from fastapi.testclient import TestClient
 
+from app.services.openai_client import ai_client
+from tests.fakes import FakeCompletion, FakeTextractClient
+
+
+def wait_for_job(client: TestClient, document_id: str) -> dict[str, Any]:
+    """Poll the status endpoint until the document's job finishes."""
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        data = client.get(f"/api/v1/documents/{document_id}/status").json()
+        if data["status"] in ("completed", "failed"):
+            return data
+        time.sleep(0.01)
+    raise AssertionError(f"Job for {document_id} did not finish")
+
 
 def test_process_document_returns_202_accepted(client: TestClient) -> None:
     """Test that process document endpoint returns 202 ACCEPTED."""
@@ -58,6 +76,10 @@ def test_process_document_requires_s3_key(client: TestClient) -> None:
 
 def test_get_document_status_returns_200(client: TestClient) -> None:
     """Test that get document status endpoint returns 200 OK."""
+    client.post(
+        "/api/v1/documents/process",
+        json={"document_id": "test-doc-123", "s3_key": "documents/test.pdf"},
+    )
     response = client.get("/api/v1/documents/test-doc-123/status")
 
     assert response.status_code == status.HTTP_200_OK
@@ -65,6 +87,10 @@ def test_get_document_status_returns_200(client: TestClient) -> None:
 
 def test_get_document_status_returns_status_info(client: TestClient) -> None:
     """Test that get document status returns status information."""
+    client.post(
+        "/api/v1/documents/process",
+        json={"document_id": "test-doc-123", "s3_key": "documents/test.pdf"},
+    )
     response = client.get("/api/v1/documents/test-doc-123/status")
     data = response.json()
 
@@ -79,3 +105,121 @@ def test_get_document_status_invalid_document_returns_404(client: TestClient) ->
     response = client.get("/api/v1/documents/invalid-not-found/status")
 
     assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_document_is_processed_to_completion(
+    client: TestClient,
+    offline_aws: FakeTextractClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that a queued document runs through OCR, classify and extract."""
+    offline_aws.add_document("documents/id.jpg", ["DRIVER LICENSE", "DOE, JANE"])
+    offline_aws.s3.put("documents/id.jpg")
+    monkeypatch.setattr(
+        ai_client,
+        "complete",
+        FakeCompletion(
+            {
+                "classifier": json.dumps(
+                    {"document_type": "photo_id", "confidence": 0.9}
+                ),
+                "extraction": json.dumps({"full_name": "Jane Doe"}),
+            }
+        ),
+    )
+
+    client.post(
+        "/api/v1/documents/process",
+        json={"document_id": "doc-complete", "s3_key": "documents/id.jpg"},
+    )
+    data = wait_for_job(client, "doc-complete")
+
+    assert data["status"] == "completed"
+    assert data["stage"] == "completed"
+    assert data["progress"] == 100
+    assert data["document_type"] == "photo_id"
+    assert data["extraction_complete"] is True
+    assert data["metadata"]["extracted_data"]["full_name"] == "Jane Doe"
+
+
+def test_missing_document_fails_job(client: TestClient) -> None:
+    """Test that a job for a missing S3 object reports a failure."""
+    client.post(
+        "/api/v1/documents/process",
+        json={"document_id": "doc-missing", "s3_key": "documents/missing.jpg"},
+    )
+    data = wait_for_job(client, "doc-missing")
+
+    assert data["status"] == "failed"
+    assert data["stage"] == "failed"
+    assert data["error_message"].startswith("Failed to analyze document")
+
+
+def test_event_stream_follows_document_to_completion(client: TestClient) -> None:
+    """Test that the SSE stream delivers stage events and closes when done."""
+    client.post(
+        "/api/v1/documents/process",
+        json={"document_id": "doc-stream", "s3_key": "documents/missing.jpg"},
+    )
+
+    with client.stream(
+        "GET", "/api/v1/documents/events", params={"document_id": "doc-stream"}
+    ) as response:
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/event-stream")
+        body = "".join(response.iter_text())
+
+    events = [chunk.splitlines() for chunk in body.strip().split("\n\n")]
+    names = [lines[0].removeprefix("event: ") for lines in events]
+    last = json.loads(events[-1][1].removeprefix("data: "))
+    assert names[-1] == "failed"
+    assert last["document_id"] == "doc-stream"
+    assert last["status"] == "failed"
+
+
+def test_event_stream_requires_document_id(client: TestClient) -> None:
+    """Test that at least one document must be followed."""
+    response = client.get("/api/v1/documents/events")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_batch_dedupes_and_reports_progress(client: TestClient) -> None:
+    """Test that a batch queues each document once and aggregates progress."""
+    documents = [
+        {"document_id": f"batch-doc-{i}", "s3_key": "documents/missing.jpg"}
+        for i in range(3)
+    ]
+    documents.append(documents[0])
+
+    response = client.post("/api/v1/documents/batch", json={"documents": documents})
+    data = response.json()
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert data["accepted"] == 3
+    assert sorted(data["jobs"]) == ["batch-doc-0", "batch-doc-1", "batch-doc-2"]
+    assert data["duplicates"] == ["batch-doc-0"]
+
+    for i in range(3):
+        wait_for_job(client, f"batch-doc-{i}")
+    batch = client.get(f"/api/v1/documents/batch/{data['batch_id']}").json()
+
+    assert batch["total"] == 3
+    assert batch["failed"] == 3
+    assert batch["finished"] is True
+    assert batch["progress"] == 100
+    assert sorted(batch["failed_document_ids"]) == sorted(data["jobs"])
+
+
+def test_batch_rejects_empty_batch(client: TestClient) -> None:
+    """Test that an empty batch is rejected."""
+    response = client.post("/api/v1/documents/batch", json={"documents": []})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_unknown_batch_returns_404(client: TestClient) -> None:
+    """Test that an unknown batch ID returns 404."""
+    response = client.get("/api/v1/documents/batch/no-such-batch")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,191 @@
+"""Tests for data extraction endpoints."""
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from httpx import AsyncClient
+
+from app.core.cache import TwoTierCache
+from app.services.openai_client import ai_client
+from app.services.textract import textract_service
+from tests.fakes import FakeCompletion, FakeTextractClient
+
+
+@pytest.fixture
+def weigh_in(
+    offline_aws: FakeTextractClient, monkeypatch: pytest.MonkeyPatch
+) -> FakeTextractClient:
+    """Upload a weigh-in slip and script the extraction reply."""
+    offline_aws.add_document("docs/slip.jpg", ["WEIGH-IN", "Weight: 170.0 lbs"])
+    offline_aws.s3.put("docs/slip.jpg")
+    monkeypatch.setattr(
+        ai_client,
+        "complete",
+        FakeCompletion({"extraction": json.dumps({"weight": 170.0})}),
+    )
+    return offline_aws
+
+
+def test_extract_unknown_type_returns_400(client: TestClient) -> None:
+    """Test that extraction requires a known document type."""
+    response = client.post(
+        "/api/v1/extract/data",
+        json={"document_id": "d1", "document_type": "unknown", "s3_key": "a.jpg"},
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_extract_returns_fields(client: TestClient, weigh_in: FakeTextractClient) -> None:
+    """Test that extraction returns the parsed fields."""
+    response = client.post(
+        "/api/v1/extract/data",
+        json={
+            "document_id": "d1",
+            "document_type": "weigh_in_record",
+            "s3_key": "docs/slip.jpg",
+        },
+    )
+    data = response.json()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert data["extracted_data"]["weight"] == 170.0
+    assert data["extracted_fields"][0]["field_name"] == "weight"
+
+
+def test_force_reprocess_reaches_textract(
+    client: TestClient,
+    weigh_in: FakeTextractClient,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """Test that ExtractionRequest.force_reprocess bypasses the OCR cache."""
+    monkeypatch.setattr(textract_service, "cache", TwoTierCache(8, tmp_path))
+    payload = {
+        "document_id": "d1",
+        "document_type": "weigh_in_record",
+        "s3_key": "docs/slip.jpg",
+    }
+    client.post("/api/v1/extract/data", json=payload)
+    client.post("/api/v1/extract/data", json=payload)
+    assert weigh_in.calls == ["analyze_document"]
+
+    client.post("/api/v1/extract/data", json={**payload, "force_reprocess": True})
+    assert weigh_in.calls == ["analyze_document", "analyze_document"]
+
+
+def test_classify_returns_document_type(
+    client: TestClient, offline_aws: FakeTextractClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that classification runs OCR and the classifier."""
+    offline_aws.add_document("docs/slip.jpg", ["WEIGH-IN", "Weight: 170.0 lbs"])
+    offline_aws.s3.put("docs/slip.jpg")
+    monkeypatch.setattr(
+        ai_client,
+        "complete",
+        FakeCompletion(
+            {
+                "classifier": json.dumps(
+                    {"document_type": "weigh_in_record", "confidence": 0.9}
+                )
+            }
+        ),
+    )
+
+    response = client.post(
+        "/api/v1/extract/classify",
+        json={"document_id": "d1", "s3_key": "docs/slip.jpg"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["document_type"] == "weigh_in_record"
+
+
+def test_classify_requires_s3_key(client: TestClient) -> None:
+    """Test that classification without an S3 key is rejected."""
+    response = client.post("/api/v1/extract/classify", json={"document_id": "d1"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+async def test_concurrent_duplicate_extractions_are_coalesced(
+    async_client: AsyncClient,
+    weigh_in: FakeTextractClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that identical in-flight extractions share one OCR + LLM call."""
+    completion = FakeCompletion({"extraction": json.dumps({"weight": 170.0})})
+
+    async def slow_complete(*args: object, **kwargs: object) -> str:
+        await asyncio.sleep(0.05)
+        return await completion(*args, **kwargs)
+
+    monkeypatch.setattr(ai_client, "complete", slow_complete)
+    payload = {
+        "document_id": "d1",
+        "document_type": "weigh_in_record",
+        "s3_key": "docs/slip.jpg",
+    }
+
+    responses = await asyncio.gather(
+        *(async_client.post("/api/v1/extract/data", json=payload) for _ in range(3))
+    )
+
+    assert [r.status_code for r in responses] == [status.HTTP_200_OK] * 3
+    assert weigh_in.calls == ["analyze_document"]
+    assert len(completion.prompts) == 1
+
+
+def test_stream_extract_sends_fields_then_result(
+    client: TestClient, offline_aws: FakeTextractClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the streaming endpoint emits field events before the result."""
+    offline_aws.add_document("docs/slip.jpg", ["WEIGH-IN", "Weight: 170.0 lbs"])
+    offline_aws.s3.put("docs/slip.jpg")
+
+    async def stream(**request: object) -> AsyncIterator[str]:
+        for part in ['{"fighter_name": "Jane', ' Doe", "weight_cl', 'ass": null}']:
+            yield part
+
+    monkeypatch.setattr(ai_client, "stream", stream)
+
+    response = client.post(
+        "/api/v1/extract/data/stream",
+        json={
+            "document_id": "d1",
+            "document_type": "weigh_in_record",
+            "s3_key": "docs/slip.jpg",
+        },
+    )
+    events = [
+        (block.split("\n")[0].removeprefix("event: "), block.split("\n")[1][6:])
+        for block in response.text.strip().split("\n\n")
+    ]
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [name for name, _ in events] == ["field", "field", "result"]
+    assert json.loads(events[0][1])["field_name"] == "weight"
+    assert json.loads(events[1][1])["value"] == "Jane Doe"
+    assert json.loads(events[2][1])["extracted_data"]["fighter_name"] == "Jane Doe"
+
+
+def test_stream_extract_reports_errors_as_events(
+    client: TestClient, offline_aws: FakeTextractClient
+) -> None:
+    """Test that a failure after the stream started becomes an error event."""
+    response = client.post(
+        "/api/v1/extract/data/stream",
+        json={
+            "document_id": "d1",
+            "document_type": "weigh_in_record",
+            "s3_key": "docs/missing.jpg",
+        },
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.text.startswith("event: error")
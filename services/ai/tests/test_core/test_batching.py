@@ -0,0 +1,116 @@
+"""Tests for micro-batching of concurrent requests."""
+
+import asyncio
+
+import pytest
+
+from app.core.batching import MicroBatcher
+
+
+class RecordingHandler:
+    """Batch handler that records batches and doubles each item."""
+
+    def __init__(self) -> None:
+        self.batches: list[tuple[str, list[int]]] = []
+
+    async def __call__(self, key: str, items: list[int]) -> list[int | BaseException]:
+        self.batches.append((key, list(items)))
+        await asyncio.sleep(0)
+        return [ValueError(item) if item < 0 else item * 2 for item in items]
+
+
+async def test_requests_within_window_share_a_batch() -> None:
+    """Test that concurrent requests for a key are handled together."""
+    handler = RecordingHandler()
+    batcher = MicroBatcher("test", handler, window_seconds=0.01, max_batch_size=10)
+
+    results = await asyncio.gather(*(batcher.submit("a", i) for i in range(3)))
+
+    assert results == [0, 2, 4]
+    assert handler.batches == [("a", [0, 1, 2])]
+
+
+async def test_keys_are_batched_separately() -> None:
+    """Test that items with different keys never share a batch."""
+    handler = RecordingHandler()
+    batcher = MicroBatcher("test", handler, window_seconds=0.01, max_batch_size=10)
+
+    await asyncio.gather(batcher.submit("a", 1), batcher.submit("b", 2))
+
+    assert sorted(handler.batches) == [("a", [1]), ("b", [2])]
+
+
+async def test_full_batch_flushes_before_window() -> None:
+    """Test that reaching the size limit does not wait for the window."""
+    handler = RecordingHandler()
+    batcher = MicroBatcher("test", handler, window_seconds=60, max_batch_size=2)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(*(batcher.submit("a", i) for i in range(4))), timeout=1
+    )
+
+    assert results == [0, 2, 4, 6]
+    assert handler.batches == [("a", [0, 1]), ("a", [2, 3])]
+
+
+async def test_item_exception_fails_only_that_item() -> None:
+    """Test that an exception returned for one item reaches only its caller."""
+    batcher = MicroBatcher(
+        "test", RecordingHandler(), window_seconds=0.01, max_batch_size=10
+    )
+
+    ok, failed = await asyncio.gather(
+        batcher.submit("a", 1), batcher.submit("a", -1), return_exceptions=True
+    )
+
+    assert ok == 2
+    assert isinstance(failed, ValueError)
+
+
+async def test_handler_exception_fails_whole_batch() -> None:
+    """Test that a handler failure reaches every caller in the batch."""
+
+    async def fail(key: str, items: list[int]) -> list[int | BaseException]:
+        raise RuntimeError("provider down")
+
+    batcher = MicroBatcher("test", fail, window_seconds=0.01, max_batch_size=10)
+
+    results = await asyncio.gather(
+        batcher.submit("a", 1), batcher.submit("a", 2), return_exceptions=True
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+async def test_wrong_result_count_fails_whole_batch() -> None:
+    """Test that a handler returning too few results fails every caller."""
+
+    async def short(key: str, items: list[int]) -> list[int | BaseException]:
+        return items[:1]
+
+    batcher = MicroBatcher("test", short, window_seconds=0.01, max_batch_size=10)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(
+            batcher.submit("a", 1), batcher.submit("a", 2), return_exceptions=True
+        ),
+        timeout=1,
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+async def test_cancelled_caller_does_not_break_batch() -> None:
+    """Test that cancelling one waiter leaves the others' results intact."""
+    handler = RecordingHandler()
+    batcher = MicroBatcher("test", handler, window_seconds=0.01, max_batch_size=10)
+
+    cancelled = asyncio.create_task(batcher.submit("a", 1))
+    kept = asyncio.create_task(batcher.submit("a", 2))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+
+    assert await kept == 4
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+    assert handler.batches == [("a", [1, 2])]
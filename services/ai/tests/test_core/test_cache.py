@@ -0,0 +1,45 @@
+"""Tests for the shared caches."""
+
+import os
+import time
+from pathlib import Path
+
+from app.core.cache import DiskCache, LRUCache, TwoTierCache
+
+
+def test_lru_entries_expire_after_ttl() -> None:
+    """Test that expired memory entries count as misses and are dropped."""
+    cache = LRUCache(4, ttl_seconds=0.01)
+    cache.set("key", "value")
+    assert cache.get("key") == "value"
+
+    time.sleep(0.02)
+    assert cache.get("key") is None
+    assert len(cache) == 0
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+
+def test_disk_entries_expire_by_file_age(tmp_path: Path) -> None:
+    """Test that stale disk entries are deleted on read."""
+    cache = DiskCache(tmp_path, ttl_seconds=60)
+    cache.set("key", {"text": "hello"})
+    assert cache.get("key") == {"text": "hello"}
+
+    path = tmp_path / "key.json"
+    stale = time.time() - 120
+    os.utime(path, (stale, stale))
+    assert cache.get("key") is None
+    assert not path.exists()
+
+
+def test_memory_tier_holds_packed_values(tmp_path: Path) -> None:
+    """Test that pack applies to memory (including disk promotions) only."""
+    cache = TwoTierCache(4, tmp_path, pack=tuple)
+    cache.set("key", [1, 2])
+
+    assert cache.get("key") == (1, 2)
+    assert cache.disk is not None and cache.disk.get("key") == [1, 2]
+
+    cache.memory.clear()
+    assert cache.get("key") == (1, 2)
@@ -0,0 +1,69 @@
+"""Tests for the blocking-call executor."""
+
+import asyncio
+import os
+import threading
+import time
+
+from app.core.executor import BlockingExecutor, ProcessExecutor
+from app.core.logging import request_id_var
+
+
+async def test_blocking_call_does_not_stall_event_loop() -> None:
+    """Test that the loop keeps serving other tasks during a blocking call."""
+    executor = BlockingExecutor(max_workers=1, name="test")
+    ticks = 0
+
+    async def ticker() -> None:
+        nonlocal ticks
+        for _ in range(5):
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    await asyncio.gather(executor.run(time.sleep, 0.1), ticker())
+    executor.shutdown()
+
+    assert ticks == 5
+
+
+async def test_concurrency_is_capped_by_max_workers() -> None:
+    """Test that no more than max_workers calls run at once."""
+    executor = BlockingExecutor(max_workers=2, name="test")
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def work() -> None:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+
+    await asyncio.gather(*(executor.run(work) for _ in range(6)))
+    executor.shutdown()
+
+    assert peak == 2
+
+
+async def test_context_variables_are_propagated() -> None:
+    """Test that the request ID is visible inside the worker thread."""
+    executor = BlockingExecutor(max_workers=1, name="test")
+    request_id_var.set("req-123")
+
+    result = await executor.run(request_id_var.get)
+    executor.shutdown()
+
+    assert result == "req-123"
+
+
+async def test_process_executor_runs_in_another_process() -> None:
+    """Test that CPU-bound work leaves the event loop's process."""
+    executor = ProcessExecutor(max_workers=1, name="test")
+
+    pid = await executor.run(os.getpid)
+    executor.shutdown()
+
+    assert pid != os.getpid()
@@ -0,0 +1,75 @@
+"""Tests for token-bucket rate limiting."""
+
+import asyncio
+import time
+
+from app.core.rate_limit import RateLimiter, TokenBucket
+
+
+def test_bucket_starts_full_and_refills() -> None:
+    """Test that consumed tokens come back at the per-minute rate."""
+    bucket = TokenBucket(6000)  # 100 tokens per second
+    bucket.consume(6000)
+
+    assert bucket.wait_time(50) > 0.4
+    bucket._updated -= 0.5
+    assert bucket.wait_time(50) == 0.0
+
+
+async def test_reserve_waits_for_request_budget() -> None:
+    """Test that calls beyond the RPM budget wait for the refill."""
+    limiter = RateLimiter("test", requests_per_minute=600, tokens_per_minute=0)
+    limiter.requests.consume(600)
+
+    started = time.monotonic()
+    async with limiter.reserve(10):
+        pass
+
+    assert time.monotonic() - started >= 0.09
+
+
+async def test_reservations_are_granted_in_order() -> None:
+    """Test that a large request at the head of the queue is not overtaken."""
+    limiter = RateLimiter("test", requests_per_minute=0, tokens_per_minute=60000)
+    limiter.tokens.consume(60000)
+    order: list[str] = []
+
+    async def call(name: str, tokens: int) -> None:
+        async with limiter.reserve(tokens):
+            order.append(name)
+
+    big = asyncio.create_task(call("big", 50))
+    await asyncio.sleep(0)
+    small = asyncio.create_task(call("small", 1))
+    await asyncio.gather(big, small)
+
+    assert order == ["big", "small"]
+
+
+async def test_reported_usage_corrects_estimate() -> None:
+    """Test that the token budget is charged for actual usage."""
+    limiter = RateLimiter("test", requests_per_minute=0, tokens_per_minute=1000)
+
+    async with limiter.reserve(500) as reservation:
+        reservation.used = 200
+
+    assert limiter.tokens.level >= 800
+
+
+async def test_throttle_empties_budgets() -> None:
+    """Test that a provider rate-limit response drains both buckets."""
+    limiter = RateLimiter("test", requests_per_minute=60, tokens_per_minute=1000)
+
+    limiter.throttle()
+
+    assert limiter.requests.wait_time(1) > 0
+    assert limiter.tokens.wait_time(1) > 0
+
+
+async def test_unlimited_limiter_never_waits() -> None:
+    """Test that zero limits disable the budgets."""
+    limiter = RateLimiter("test", requests_per_minute=0, tokens_per_minute=0)
+
+    for _ in range(100):
+        async with limiter.reserve(10_000):
+            pass
@@ -0,0 +1,79 @@
+"""Tests for in-flight call coalescing."""
+
+import asyncio
+
+import pytest
+
+from app.core.singleflight import SingleFlight
+
+
+async def test_concurrent_calls_share_one_execution() -> None:
+    """Test that callers with the same key wait on a single call."""
+    flight = SingleFlight("test")
+    calls = 0
+
+    async def work() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "done"
+
+    results = await asyncio.gather(*(flight.do("k", work) for _ in range(5)))
+
+    assert results == ["done"] * 5
+    assert calls == 1
+    assert flight.in_flight == 0
+
+
+async def test_different_keys_run_separately() -> None:
+    """Test that distinct keys are not coalesced."""
+    flight = SingleFlight("test")
+    seen: list[str] = []
+
+    async def work(key: str) -> str:
+        seen.append(key)
+        return key
+
+    assert await asyncio.gather(
+        flight.do("a", lambda: work("a")), flight.do("b", lambda: work("b"))
+    ) == ["a", "b"]
+    assert seen == ["a", "b"]
+
+
+async def test_exception_is_shared_and_not_remembered() -> None:
+    """Test that a failure reaches every waiter and the next call retries."""
+    flight = SingleFlight("test")
+
+    async def fail() -> None:
+        await asyncio.sleep(0)
+        raise ValueError("boom")
+
+    first, second = await asyncio.gather(
+        flight.do("k", fail), flight.do("k", fail), return_exceptions=True
+    )
+    assert isinstance(first, ValueError) and first is second
+
+    async def succeed() -> str:
+        return "ok"
+
+    assert await flight.do("k", succeed) == "ok"
+
+
+async def test_cancelled_caller_does_not_cancel_shared_call() -> None:
+    """Test that a disconnecting caller leaves the call running for others."""
+    flight = SingleFlight("test")
+    release = asyncio.Event()
+
+    async def work() -> str:
+        await release.wait()
+        return "done"
+
+    leaver = asyncio.create_task(flight.do("k", work))
+    stayer = asyncio.create_task(flight.do("k", work))
+    await asyncio.sleep(0)
+    leaver.cancel()
+    release.set()
+
+    assert await stayer == "done"
+    with pytest.raises(asyncio.CancelledError):
+        await leaver
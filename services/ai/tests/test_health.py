@@ -7,6 +7,7 @@ from fastapi import status
 from fastapi.testclient import TestClient
 
 from app.config import settings
+from app.services.openai_client import ai_client
 
 
 def test_health_check_returns_200(client: TestClient) -> None:
@@ -116,3 +117,39 @@ def test_root_endpoint_includes_docs_link(client: TestClient) -> None:
 
     assert data["docs"] == "/docs"
     assert data["health"] == "/health"
+
+
+def test_readiness_check_reports_cache_counters(client: TestClient) -> None:
+    """Test that OCR and AI completion cache counters are exposed as integers."""
+    response = client.get("/health/ready")
+    data = response.json()
+
+    for counter in ["hits", "disk_hits", "misses", "evictions"]:
+        assert isinstance(data["ocr_cache"][counter], int)
+        assert isinstance(data["llm_cache"][counter], int)
+
+
+def test_readiness_check_reports_ai_provider_circuits(client: TestClient) -> None:
+    """Test that each AI provider's circuit state is exposed."""
+    response = client.get("/health/ready")
+    data = response.json()
+
+    for provider in ["openai", "anthropic"]:
+        assert data["ai_providers"][provider]["state"] == "closed"
+        configured = data["ai_providers"][provider]["configured"]
+        assert data["checks"][provider] is configured
+
+
+def test_readiness_check_requires_a_configured_provider(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the service is not ready when no AI client is configured."""
+    monkeypatch.setattr(ai_client, "openai_client", None)
+    monkeypatch.setattr(ai_client, "anthropic_client", None)
+
+    response = client.get("/health/ready")
+    data = response.json()
+
+    assert data["checks"]["openai"] is False
+    assert data["checks"]["anthropic"] is False
+    assert data["ready"] is False
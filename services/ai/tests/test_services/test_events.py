@@ -0,0 +1,41 @@
+"""Tests for the job event broadcaster."""
+
+from app.models.document import DocumentStatusResponse, ProcessingStatus
+from app.services.events import JobEventBroadcaster
+
+
+def make_event(document_id: str, progress: int) -> DocumentStatusResponse:
+    return DocumentStatusResponse(
+        document_id=document_id, status=ProcessingStatus.PROCESSING, progress=progress
+    )
+
+
+async def test_events_are_routed_by_document() -> None:
+    """Test that subscribers only receive events for their documents."""
+    broadcaster = JobEventBroadcaster()
+
+    with broadcaster.subscribe(["a", "b"]) as both, broadcaster.subscribe(["b"]) as only_b:
+        broadcaster.publish(make_event("a", 10))
+        broadcaster.publish(make_event("b", 20))
+        broadcaster.publish(make_event("c", 30))
+
+        assert (await both.get()).document_id == "a"
+        assert (await both.get()).document_id == "b"
+        assert (await only_b.get()).document_id == "b"
+        assert broadcaster.subscriber_count == 2
+
+    assert broadcaster.subscriber_count == 0
+    assert not broadcaster.has_subscribers("a")
+    assert not broadcaster.has_subscribers("b")
+
+
+async def test_slow_subscriber_keeps_latest_events() -> None:
+    """Test that a full buffer drops the oldest snapshot."""
+    broadcaster = JobEventBroadcaster(buffer_size=2)
+
+    with broadcaster.subscribe(["a"]) as subscription:
+        for progress in (10, 20, 30):
+            broadcaster.publish(make_event("a", progress))
+
+        assert (await subscription.get()).progress == 20
+        assert (await subscription.get()).progress == 30
@@ -0,0 +1,96 @@
+"""Tests for micro-batched multi-document extraction."""
+
+import asyncio
+import json
+
+import pytest
+
+from app.config import settings
+from app.models.document import DocumentType
+from app.services.extractor import DataExtractor
+from app.services.openai_client import ai_client
+from tests.fakes import FakeCompletion
+
+# Substring of the batch system prompt only
+BATCH_TRIGGER = "never copy a value"
+
+
+@pytest.fixture
+def batching(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Enable extraction micro-batching."""
+    monkeypatch.setattr(settings, "extraction_batch_enabled", True)
+
+
+async def extract_both(extractor: DataExtractor) -> list[dict]:
+    """Extract two short clearances concurrently and return their data."""
+    results = await asyncio.gather(
+        *(
+            extractor.extract(
+                document_id,
+                f"{document_id}.pdf",
+                DocumentType.MEDICAL_CLEARANCE,
+                ocr_result={"text": f"Clearance letter for {name}"},
+            )
+            for document_id, name in (("d1", "Alex Stone"), ("d2", "Sam Reyes"))
+        )
+    )
+    return [data for data, _, _ in results]
+
+
+@pytest.mark.usefixtures("batching")
+async def test_concurrent_documents_share_one_prompt(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that a batch is answered by one call and split per document."""
+    completion = FakeCompletion(
+        {
+            BATCH_TRIGGER: json.dumps(
+                {
+                    "d1": {"fighter_name": "Alex Stone"},
+                    "d2": {"fighter_name": "Sam Reyes", "unknown": 1},
+                }
+            )
+        }
+    )
+    monkeypatch.setattr(ai_client, "complete", completion)
+
+    first, second = await extract_both(DataExtractor())
+
+    assert len(completion.prompts) == 1
+    assert '### Document "d1"' in completion.prompts[0]
+    assert "Clearance letter for Sam Reyes" in completion.prompts[0]
+    assert first["fighter_name"] == "Alex Stone"
+    assert second["fighter_name"] == "Sam Reyes"
+    assert "unknown" not in second
+
+
+@pytest.mark.usefixtures("batching")
+async def test_unusable_batch_response_falls_back_to_single_prompts(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that documents missing from the batch answer are retried alone."""
+    completion = FakeCompletion(
+        {
+            BATCH_TRIGGER: json.dumps({"d1": {"fighter_name": "Alex Stone"}}),
+            "extraction": json.dumps({"fighter_name": "Sam Reyes"}),
+        }
+    )
+    monkeypatch.setattr(ai_client, "complete", completion)
+
+    first, second = await extract_both(DataExtractor())
+
+    assert len(completion.prompts) == 2
+    assert "Clearance letter for Sam Reyes" in completion.prompts[1]
+    assert first["fighter_name"] == "Alex Stone"
+    assert second["fighter_name"] == "Sam Reyes"
+
+
+async def test_batching_is_off_by_default(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that each document gets its own prompt unless batching is enabled."""
+    completion = FakeCompletion({"extraction": "{}"})
+    monkeypatch.setattr(ai_client, "complete", completion)
+
+    await extract_both(DataExtractor())
+
+    assert len(completion.prompts) == 2
+    assert all("### Document" not in prompt for prompt in completion.prompts)
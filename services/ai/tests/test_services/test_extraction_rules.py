@@ -0,0 +1,154 @@
+"""Tests for deterministic field extraction rules."""
+
+from datetime import date
+
+import pytest
+
+from app.models.document import DocumentType
+from app.services.extraction_rules import (
+    FieldMatch,
+    FormFieldRule,
+    MRZRule,
+    PatternRule,
+    RuleEngine,
+    parse_date,
+    rule_engine,
+)
+from app.services.extractor import DataExtractor
+from app.services.openai_client import ai_client
+from tests.fakes import FakeCompletion
+
+PASSPORT_TEXT = "\n".join(
+    [
+        "PASSPORT",
+        "P<UTOERIKSSON<<ANNA<MARIA<<<<<<<<<<<<<<<<<<<",
+        "L898902C36UTO7408122F1204159ZE184226B<<<<<10",
+    ]
+)
+
+WEIGH_IN_TEXT = "\n".join(
+    [
+        "OFFICIAL WEIGH-IN",
+        "Date: 03/14/2024 Time: 10:15 AM",
+        "Fighter Name: John Smith",
+        "Weight: 77.1 kg",
+        "Weight Class: Welterweight",
+        "Made weight: YES",
+        "Inspector: K. Johnson",
+    ]
+)
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("2024-03-14", date(2024, 3, 14)),
+        ("03/14/2024", date(2024, 3, 14)),
+        ("12 MAR 1993", date(1993, 3, 12)),
+        ("March 12, 1993", date(1993, 3, 12)),
+        ("Sept. 31 2024", None),
+    ],
+)
+def test_parse_date(text: str, expected: date | None) -> None:
+    """Test the supported date spellings."""
+    assert parse_date(text) == expected
+
+
+def test_mrz_rule_decodes_passport() -> None:
+    """Test that a TD3 passport MRZ fills the identity fields."""
+    matches = MRZRule().apply({"text": PASSPORT_TEXT})
+
+    assert matches["full_name"].value == "Anna Maria Eriksson"
+    assert matches["id_number"].value == "L898902C3"
+    assert matches["date_of_birth"].value == date(1974, 8, 12)
+    assert matches["expiration_date"].value == date(2012, 4, 15)
+    assert matches["id_type"].value == "passport"
+
+
+def test_mrz_rule_skips_fields_failing_check_digit() -> None:
+    """Test that a misread field is left for the LLM rather than guessed."""
+    misread = PASSPORT_TEXT.replace("7408122F", "7408192F")
+
+    matches = MRZRule().apply({"text": misread})
+
+    assert "date_of_birth" not in matches
+    assert matches["id_number"].value == "L898902C3"
+
+
+def test_weigh_in_rules_fill_fields_and_convert_kilograms() -> None:
+    """Test the built-in weigh-in rules."""
+    matches = rule_engine.extract(
+        DocumentType.WEIGH_IN_RECORD, {"text": WEIGH_IN_TEXT, "confidence": 1.0}
+    )
+
+    assert {name: match.value for name, match in matches.items()} == {
+        "weight": 170.0,
+        "weight_class": "Welterweight",
+        "weigh_in_date": date(2024, 3, 14),
+        "weigh_in_time": "10:15 AM",
+        "made_weight": True,
+        "fighter_name": "John Smith",
+        "official_name": "K. Johnson",
+    }
+
+
+def test_form_rule_uses_key_value_pairs() -> None:
+    """Test that form pairs are matched on normalised keys."""
+    rule = FormFieldRule("id_number", ["License No."], 0.9)
+    forms = [{"key": "LICENSE NO:", "value": " D123 ", "confidence": 0.5}]
+
+    assert rule.apply({"text": "", "forms": forms}) == {
+        "id_number": FieldMatch("D123", 0.45, "form")
+    }
+
+
+def test_engine_keeps_most_confident_match() -> None:
+    """Test that competing rules resolve to the most confident value."""
+    engine = RuleEngine()
+    engine.register(
+        DocumentType.LICENSE,
+        PatternRule("license_number", r"no\. (\w+)", 0.6),
+        PatternRule("license_number", r"license (\w+)", 0.9),
+    )
+
+    matches = engine.extract(DocumentType.LICENSE, {"text": "license A1 no. B2"})
+
+    assert matches["license_number"].value == "A1"
+
+
+async def test_extractor_only_asks_llm_for_missing_fields(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that rule-filled fields are not requested from the AI."""
+    completion = FakeCompletion({"extraction": '{"weigh_in_time": "9:00"}'})
+    monkeypatch.setattr(ai_client, "complete", completion)
+    text = "WEIGH-IN\nFighter: Jane Doe\nWeight: 134.5 lbs"
+
+    data, fields, _ = await DataExtractor().extract(
+        "d1", "a.jpg", DocumentType.WEIGH_IN_RECORD, ocr_result={"text": text}
+    )
+
+    assert data["weight"] == 134.5
+    assert data["weigh_in_time"] == "9:00"
+    assert "- weight:" not in completion.prompts[0]
+    assert "- weigh_in_time:" in completion.prompts[0]
+    weight = next(f for f in fields if f.field_name == "weight")
+    assert weight.source_location == {"rule": "pattern"}
+
+
+async def test_extractor_skips_llm_when_rules_fill_every_field(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that a fully rule-extracted document makes no AI call."""
+    completion = FakeCompletion({})
+    monkeypatch.setattr(ai_client, "complete", completion)
+
+    data, _, _ = await DataExtractor().extract(
+        "d1",
+        "a.jpg",
+        DocumentType.WEIGH_IN_RECORD,
+        ocr_result={"text": WEIGH_IN_TEXT, "confidence": 0.99},
+    )
+
+    assert completion.prompts == []
+    assert data["fighter_name"] == "John Smith"
@@ -0,0 +1,82 @@
+"""Tests for pre-OCR image preprocessing."""
+
+import io
+
+import pytest
+
+from app.config import settings
+from app.services.image_preprocessing import preprocess_image
+from app.services.textract import TextractService
+
+Image = pytest.importorskip("PIL.Image")
+ImageDraw = pytest.importorskip("PIL.ImageDraw")
+
+# EXIF orientation tag; 6 means the camera was rotated 90 degrees clockwise
+ORIENTATION = 0x0112
+
+
+def phone_photo(orientation: int = 1) -> bytes:
+    """A 2000x1500 JPEG of a wide, text-covered page on a dark, grainy table."""
+    table = Image.effect_noise((2000, 1500), 10).point(lambda v: v // 4 + 20)
+    image = table.convert("RGB")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((500, 400, 1500, 1100), fill=(245, 245, 240))
+    for y in range(450, 1060, 30):
+        draw.line((550, y, 1450, y), fill=(20, 20, 20), width=5)
+    exif = Image.Exif()
+    exif[ORIENTATION] = orientation
+    output = io.BytesIO()
+    image.save(output, format="JPEG", quality=95, exif=exif)
+    return output.getvalue()
+
+
+@pytest.fixture(scope="module")
+def photo() -> bytes:
+    """A sideways phone photo."""
+    return phone_photo(orientation=6)
+
+
+def test_photo_is_rotated_cropped_and_shrunk(photo: bytes) -> None:
+    """Test the output is upright, cropped to the page and much smaller."""
+    processed = preprocess_image(photo, max_edge_px=1200, jpeg_quality=80)
+
+    assert processed is not None
+    assert len(processed) * 4 < len(photo)
+    image = Image.open(io.BytesIO(processed))
+    assert image.format == "JPEG"
+    assert image.mode == "L"
+    # The wide page is upright (taller than wide) once the EXIF rotation is
+    # applied, and the table around it (1000 of 2000 px) is cropped away
+    width, height = image.size
+    assert width < height <= 700
+
+
+def test_undecodable_bytes_return_none() -> None:
+    """Test that a corrupt upload is left for Textract to reject."""
+    assert preprocess_image(b"not an image", 2400, 80) is None
+
+
+async def test_large_photo_is_sent_as_smaller_bytes(
+    fake_textract: TextractService, photo: bytes, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a large photo is preprocessed in the pool and sent as bytes."""
+    monkeypatch.setattr(settings, "image_preprocess_min_kb", 100)
+    monkeypatch.setattr(settings, "image_preprocess_max_edge_px", 1200)
+    fake_textract.s3_client.put("docs/id.jpg", body=photo)
+
+    result = await fake_textract.analyze_document("docs/id.jpg")
+
+    (upload,) = fake_textract.client.uploads
+    assert len(upload) < len(photo)
+    assert result["text"] == f"{len(upload)} bytes received"
+
+
+async def test_small_photo_is_read_from_s3(fake_textract: TextractService) -> None:
+    """Test that photos under the threshold are not downloaded or re-encoded."""
+    fake_textract.client.add_document("docs/slip.jpg", ["OFFICIAL WEIGH-IN"])
+    fake_textract.s3_client.put("docs/slip.jpg", body=b"small")
+
+    result = await fake_textract.analyze_document("docs/slip.jpg")
+
+    assert fake_textract.client.uploads == []
+    assert result["text"] == "OFFICIAL WEIGH-IN"
@@ -0,0 +1,124 @@
+"""Tests for the SQLite lease queue."""
+
+import time
+from pathlib import Path
+
+from app.models.document import ProcessingStage, ProcessingStatus
+from app.services.job_store import JobRecord, SQLiteJobQueue
+
+
+def make_store(tmp_path: Path, **kwargs: float) -> SQLiteJobQueue:
+    options = {"lease_seconds": 30.0, "max_attempts": 2, "retry_delay_seconds": 0.0}
+    options.update(kwargs)
+    return SQLiteJobQueue(tmp_path / "jobs.sqlite3", **options)
+
+
+def make_job(job_id: str) -> JobRecord:
+    return JobRecord(job_id=job_id, document_id=f"doc-{job_id}", s3_key=f"{job_id}.jpg")
+
+
+def test_lease_hands_each_job_to_one_worker(tmp_path: Path) -> None:
+    """Test that a leased job is invisible to other workers."""
+    store = make_store(tmp_path)
+    store.enqueue(make_job("a"))
+
+    job = store.lease("worker-1")
+    assert job is not None
+    assert job.job_id == "a"
+    assert job.attempts == 1
+    assert store.lease("worker-2") is None
+
+
+def test_expired_lease_is_reclaimed(tmp_path: Path) -> None:
+    """Test that a crashed worker's job becomes visible after its lease."""
+    store = make_store(tmp_path, lease_seconds=0.01)
+    store.enqueue(make_job("a"))
+    store.lease("worker-1")
+    time.sleep(0.02)
+
+    job = store.lease("worker-2")
+    assert job is not None
+    assert job.attempts == 2
+    assert not store.heartbeat("a", "worker-1")
+    assert store.heartbeat("a", "worker-2")
+
+
+def test_release_retries_then_dead_letters(tmp_path: Path) -> None:
+    """Test that transient failures are retried up to max_attempts."""
+    store = make_store(tmp_path)
+    store.enqueue(make_job("a"))
+
+    job = store.lease("worker-1")
+    assert store.release(job, "worker-1", retry=True, error_message="Textract down")
+    job = store.lease("worker-1")
+    assert job.attempts == 2
+    assert not store.release(job, "worker-1", retry=True, error_message="Textract down")
+
+    record = store.get("a")
+    assert record.status == ProcessingStatus.FAILED
+    assert record.stage == ProcessingStage.FAILED
+    assert [j.job_id for j in store.dead_letters()] == ["a"]
+    assert store.lease("worker-1") is None
+
+
+def test_requeue_does_not_use_an_attempt(tmp_path: Path) -> None:
+    """Test that jobs interrupted by shutdown keep their attempt budget."""
+    store = make_store(tmp_path)
+    store.enqueue(make_job("a"))
+    store.requeue(store.lease("worker-1"), "worker-1")
+
+    job = store.lease("worker-2")
+    assert job.attempts == 1
+
+
+def test_save_round_trips_progress(tmp_path: Path) -> None:
+    """Test that status reads see the worker's latest stage."""
+    store = make_store(tmp_path)
+    store.enqueue(make_job("a"))
+    job = store.lease("worker-1")
+    job.stage = ProcessingStage.OCR
+    job.progress = 40
+    job.result = {"classification_confidence": 0.9}
+    store.save(job, "worker-1")
+
+    latest = store.get_latest("doc-a")
+    assert latest.stage == ProcessingStage.OCR
+    assert latest.progress == 40
+    assert latest.result == {"classification_confidence": 0.9}
+
+
+def test_batch_enqueue_and_active_lookup(tmp_path: Path) -> None:
+    """Test that batches insert atomically and unfinished jobs are found."""
+    store = make_store(tmp_path)
+    jobs = [make_job(job_id) for job_id in ("a", "b")]
+    for job in jobs:
+        job.batch_id = "batch-1"
+    store.enqueue_many(jobs)
+    job = store.lease("worker-1")
+    job.status = ProcessingStatus.COMPLETED
+    store.save(job, "worker-1")
+
+    assert [j.job_id for j in store.batch_jobs("batch-1")] == ["a", "b"]
+    assert list(store.active_jobs(["doc-a", "doc-b", "doc-c"])) == ["doc-b"]
+
+
+def test_stale_worker_cannot_overwrite_new_lease(tmp_path: Path) -> None:
+    """Test that a worker whose lease expired writes nothing."""
+    store = make_store(tmp_path, lease_seconds=0.01)
+    store.enqueue(make_job("a"))
+    stale = store.lease("worker-1")
+    time.sleep(0.02)
+    current = store.lease("worker-2")
+    current.stage = ProcessingStage.OCR
+    current.progress = 40
+    assert store.save(current, "worker-2")
+
+    stale.status = ProcessingStatus.COMPLETED
+    stale.progress = 100
+    assert not store.save(stale, "worker-1")
+    store.requeue(stale, "worker-1")
+    assert store.release(stale, "worker-1", retry=False, error_message="stale")
+
+    record = store.get("a")
+    assert record.status == ProcessingStatus.PROCESSING
+    assert record.progress == 40
@@ -0,0 +1,199 @@
+"""Tests for the document processing job engine."""
+
+import asyncio
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from app.core.exceptions import JobQueueFullError, TextractError
+from app.models.document import DocumentProcessRequest, ProcessingStatus
+from app.services.job_store import SQLiteJobQueue
+from app.services.jobs import DurableJobManager, JobManager
+
+
+class BlockingPipeline:
+    """Pipeline whose OCR stage never finishes."""
+
+    def __init__(self, document_id: str, s3_key: str, **kwargs: Any) -> None:
+        self.document_id = document_id
+
+    async def ocr(self) -> dict[str, Any]:
+        await asyncio.Event().wait()
+        return {}
+
+
+def make_request(document_id: str) -> DocumentProcessRequest:
+    return DocumentProcessRequest(document_id=document_id, s3_key=f"{document_id}.jpg")
+
+
+async def test_submit_requires_running_workers() -> None:
+    """Test that jobs are rejected until the lifespan starts the workers."""
+    manager = JobManager(worker_count=1, queue_size=1, history_size=10)
+
+    with pytest.raises(JobQueueFullError):
+        await manager.submit(make_request("doc-1"))
+
+
+async def test_full_queue_rejects_jobs() -> None:
+    """Test that the bounded queue rejects work beyond its capacity."""
+    manager = JobManager(
+        worker_count=1, queue_size=1, history_size=10, pipeline_factory=BlockingPipeline
+    )
+    manager.start()
+    await manager.submit(make_request("doc-1"))
+    await asyncio.sleep(0)  # worker takes doc-1 off the queue
+    await manager.submit(make_request("doc-2"))
+
+    with pytest.raises(JobQueueFullError):
+        await manager.submit(make_request("doc-3"))
+    await manager.shutdown()
+
+
+async def test_shutdown_requeues_in_flight_jobs() -> None:
+    """Test that interrupted jobs return to PENDING and rerun on restart."""
+    manager = JobManager(
+        worker_count=1, queue_size=5, history_size=10, pipeline_factory=BlockingPipeline
+    )
+    manager.start()
+    job = await manager.submit(make_request("doc-1"))
+    await asyncio.sleep(0.01)
+    assert job.status == ProcessingStatus.PROCESSING
+
+    await manager.shutdown()
+    assert job.status == ProcessingStatus.PENDING
+
+    manager.start()
+    await asyncio.sleep(0.01)
+    assert job.status == ProcessingStatus.PROCESSING
+    await manager.shutdown()
+
+
+async def test_batch_fan_out_is_bounded() -> None:
+    """Test that one batch never occupies more than its share of workers."""
+    manager = JobManager(
+        worker_count=4,
+        queue_size=10,
+        history_size=100,
+        pipeline_factory=BlockingPipeline,
+        batch_concurrency=2,
+    )
+    manager.start()
+    requests = [make_request(f"doc-{i}") for i in range(5)]
+    submission = await manager.submit_batch([*requests, requests[0]])
+    await asyncio.sleep(0.01)
+
+    batch = await manager.get_batch(submission.batch_id)
+    assert submission.duplicates == ["doc-0"]
+    assert batch.total == 5
+    assert batch.processing == 2
+    assert batch.pending == 3
+
+    # Single documents still find a free worker
+    single = await manager.submit(make_request("doc-single"))
+    await asyncio.sleep(0.01)
+    assert single.status == ProcessingStatus.PROCESSING
+
+    again = await manager.submit_batch([requests[1]])
+    assert again.jobs == []
+    assert list(again.existing) == ["doc-1"]
+    await manager.shutdown()
+
+
+class FlakyPipeline:
+    """Pipeline whose OCR stage always hits a Textract outage."""
+
+    def __init__(self, document_id: str, s3_key: str, **kwargs: Any) -> None:
+        self.document_id = document_id
+
+    async def ocr(self) -> dict[str, Any]:
+        raise TextractError("Textract unavailable")
+
+
+async def test_durable_workers_retry_and_dead_letter(tmp_path: Path) -> None:
+    """Test that workers retry to dead-letter and the API relays their events."""
+    store = SQLiteJobQueue(
+        tmp_path / "jobs.sqlite3",
+        lease_seconds=30.0,
+        max_attempts=2,
+        retry_delay_seconds=0.0,
+    )
+    api = DurableJobManager(
+        store=store, worker_count=1, queue_size=10, consume=False, poll_interval=0.01
+    )
+    worker = DurableJobManager(
+        store=store,
+        worker_count=1,
+        queue_size=10,
+        consume=True,
+        poll_interval=0.01,
+        pipeline_factory=FlakyPipeline,
+    )
+    api.start()
+    assert not api.running
+
+    with api.events.subscribe(["doc-1"]) as subscription:
+        job = await api.submit(make_request("doc-1"))
+        worker.start()
+        async with asyncio.timeout(5):
+            event = await subscription.get()
+            while event.status != ProcessingStatus.FAILED:
+                event = await subscription.get()
+    await worker.shutdown()
+    await api.shutdown()
+
+    status = await api.get_status("doc-1")
+    assert event.metadata["job_id"] == job.job_id
+    assert status.attempts == 2
+    assert status.error_message == "Textract unavailable"
+    assert [j.job_id for j in store.dead_letters()] == [job.job_id]
+
+
+async def test_worker_abandons_job_after_losing_lease(tmp_path: Path) -> None:
+    """Test that a stalled worker stops and cannot clobber the new holder."""
+    store = SQLiteJobQueue(
+        tmp_path / "jobs.sqlite3",
+        lease_seconds=0.05,
+        max_attempts=3,
+        retry_delay_seconds=0.0,
+    )
+    taken_over = asyncio.Event()
+
+    class StallingPipeline:
+        """Stalls the event loop past its lease while another worker steals it."""
+
+        def __init__(self, document_id: str, s3_key: str, **kwargs: Any) -> None:
+            self.document_id = document_id
+
+        async def ocr(self) -> dict[str, Any]:
+            time.sleep(0.08)
+            job = store.lease("worker-2")
+            assert job is not None
+            job.progress = 40
+            store.save(job, "worker-2")
+            taken_over.set()
+            await asyncio.Event().wait()
+            return {}
+
+    worker = DurableJobManager(
+        store=store,
+        worker_count=1,
+        queue_size=10,
+        consume=True,
+        poll_interval=0.01,
+        pipeline_factory=StallingPipeline,
+        worker_id="worker-1",
+    )
+    worker.start()
+    job = await worker.submit(make_request("doc-1"))
+    async with asyncio.timeout(5):
+        await taken_over.wait()
+        while worker._active:
+            await asyncio.sleep(0.01)
+    await worker.shutdown()
+
+    record = store.get(job.job_id)
+    assert record.status == ProcessingStatus.PROCESSING
+    assert record.progress == 40
+    assert record.attempts == 2
@@ -0,0 +1,120 @@
+"""Tests for the local first-stage classifier."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from app.config import settings
+from app.models.document import DocumentType
+from app.services.classifier import DocumentClassifier
+from app.services.local_classifier import LocalClassifier, local_classifier, tokenize
+from app.services.openai_client import ai_client
+from tests.fakes import FakeCompletion
+
+WEIGH_IN_TEXT = (
+    "OFFICIAL WEIGH-IN Fighter: Jose Aldo Weight: 145.0 lbs "
+    "Weight Class: Featherweight Made weight: YES Commission official"
+)
+
+
+def test_tokenize_adds_bigrams() -> None:
+    """Test that adjacent words become bigram features."""
+    assert tokenize("Weigh-In Sheet") == [
+        "weigh",
+        "in",
+        "sheet",
+        "weigh in",
+        "in sheet",
+    ]
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        (WEIGH_IN_TEXT, DocumentType.WEIGH_IN_RECORD),
+        (
+            "DRIVER LICENSE STATE OF FLORIDA DL S123-456 CLASS E DOB 01/01/1990 "
+            "EXP 01/01/2030 ISS 01/01/2022 SEX F HGT 5-06 EYES BLU",
+            DocumentType.PHOTO_ID,
+        ),
+        (
+            "CERTIFICATE OF LIABILITY INSURANCE Insured Fight Club LLC Policy "
+            "number GL-1 Each occurrence limit Certificate holder commission",
+            DocumentType.INSURANCE_CERT,
+        ),
+    ],
+)
+def test_bundled_model_recognises_obvious_documents(
+    text: str, expected: DocumentType
+) -> None:
+    """Test that obvious documents are classified confidently."""
+    result = local_classifier.classify(text)
+
+    assert result is not None
+    assert result.document_type == expected
+    assert result.confidence >= settings.local_classifier_min_confidence
+
+
+def test_short_or_unrelated_text_is_left_to_the_llm() -> None:
+    """Test that texts sharing few features with the corpus are not answered."""
+    assert local_classifier.classify("weight") is None
+    assert local_classifier.classify("lorem ipsum dolor sit amet") is None
+
+
+def test_trains_from_configured_corpus(tmp_path: Path) -> None:
+    """Test that a custom labelled corpus is used for training."""
+    corpus = tmp_path / "corpus.jsonl"
+    records = [
+        {"document_type": "contract", "text": "bout agreement purse promoter " * 3},
+        {"document_type": "license", "text": "commission license licensee " * 3},
+        {"document_type": "not_a_type", "text": "ignored"},
+    ]
+    corpus.write_text("\n".join(json.dumps(r) for r in records))
+    model = LocalClassifier(corpus, min_confidence=0.5)
+
+    ranked = model.predict("Bout agreement: purse, promoter. " * 2)
+
+    assert {label for label, _ in ranked} == {
+        DocumentType.CONTRACT,
+        DocumentType.LICENSE,
+    }
+    assert ranked[0][0] == DocumentType.CONTRACT
+
+
+async def test_warm_up_trains_before_first_use(tmp_path: Path) -> None:
+    """Test that warming up trains the model ahead of classification."""
+    corpus = tmp_path / "corpus.jsonl"
+    records = [
+        {"document_type": "contract", "text": "bout agreement purse promoter " * 3},
+        {"document_type": "license", "text": "commission license licensee " * 3},
+    ]
+    corpus.write_text("\n".join(json.dumps(r) for r in records))
+    model = LocalClassifier(corpus, min_confidence=0.5)
+
+    await model.warm_up()
+    corpus.unlink()
+
+    assert model.predict("Bout agreement: purse, promoter. " * 2)
+
+
+async def test_confident_documents_skip_the_llm(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that the classifier only calls the LLM for ambiguous text."""
+    completion = FakeCompletion(
+        {"classifier": json.dumps({"document_type": "contract", "confidence": 0.7})}
+    )
+    monkeypatch.setattr(ai_client, "complete", completion)
+    classifier = DocumentClassifier()
+
+    obvious = await classifier.classify(
+        "d1", "a.jpg", ocr_result={"text": WEIGH_IN_TEXT}
+    )
+    ambiguous = await classifier.classify(
+        "d2", "b.jpg", ocr_result={"text": "Name John Smith Date 2024 signature page"}
+    )
+
+    assert obvious.document_type == DocumentType.WEIGH_IN_RECORD
+    assert ambiguous.document_type == DocumentType.CONTRACT
+    assert len(completion.prompts) == 1
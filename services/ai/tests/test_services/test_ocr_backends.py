@@ -0,0 +1,93 @@
+"""Tests for the local OCR backends."""
+
+import pytest
+
+from app.config import settings
+from app.services.ocr_backends import EmbeddedTextBackend
+from app.services.textract import TextractService
+from app.services.textract_blocks import parse_blocks
+from tests.fakes import make_text_pdf
+
+pytest.importorskip("pypdf")
+
+CLEARANCE = [
+    "MEDICAL CLEARANCE CERTIFICATE",
+    "Fighter Name: Alex Stone",
+    "Cleared for competition: YES",
+]
+
+
+@pytest.fixture
+def backend() -> EmbeddedTextBackend:
+    """Embedded text backend with the default page threshold."""
+    return EmbeddedTextBackend(min_chars_per_page=20)
+
+
+def test_text_layer_becomes_textract_blocks(backend: EmbeddedTextBackend) -> None:
+    """Test that embedded lines come back as LINE and WORD blocks in order."""
+    blocks = backend.read(make_text_pdf([CLEARANCE, ["Second page of the packet"]]))
+
+    assert blocks is not None
+    parsed = parse_blocks(blocks)
+    assert parsed.text.splitlines() == [*CLEARANCE, "Second page of the packet"]
+    assert parsed.confidence == 1.0
+    words = [block["Text"] for block in blocks if block["BlockType"] == "WORD"]
+    assert words[:3] == ["MEDICAL", "CLEARANCE", "CERTIFICATE"]
+    assert {block["Page"] for block in blocks} == {1, 2}
+
+
+def test_geometry_is_normalized_top_down(backend: EmbeddedTextBackend) -> None:
+    """Test that boxes are on Textract's 0-1 scale with y growing downwards."""
+    blocks = backend.read(make_text_pdf([CLEARANCE])) or []
+
+    lines = [block for block in blocks if block["BlockType"] == "LINE"]
+    tops = [line["Geometry"]["BoundingBox"]["Top"] for line in lines]
+    assert tops == sorted(tops)
+    for block in blocks:
+        box = block["Geometry"]["BoundingBox"]
+        assert 0.0 <= box["Left"] <= box["Left"] + box["Width"] <= 1.0
+        assert 0.0 <= box["Top"] <= box["Top"] + box["Height"] <= 1.0
+
+
+def test_page_without_text_layer_falls_back(backend: EmbeddedTextBackend) -> None:
+    """Test that a single image-only page sends the whole document to Textract."""
+    assert backend.read(make_text_pdf([CLEARANCE, []])) is None
+
+
+def test_unreadable_pdf_falls_back(backend: EmbeddedTextBackend) -> None:
+    """Test that malformed bytes are declined rather than raising."""
+    assert backend.read(b"%PDF-1.4 truncated") is None
+    assert backend.read(b"") is None
+
+
+def test_only_pdfs_are_accepted(backend: EmbeddedTextBackend) -> None:
+    """Test that images are never downloaded for the text-layer reader."""
+    assert backend.accepts("docs/Clearance.PDF")
+    assert not backend.accepts("docs/id.jpg")
+
+
+async def test_digital_pdf_skips_textract(fake_textract: TextractService) -> None:
+    """Test that a born-digital PDF is analyzed without calling Textract."""
+    fake_textract.s3_client.put("docs/clearance.pdf", body=make_text_pdf([CLEARANCE]))
+
+    result = await fake_textract.analyze_document("docs/clearance.pdf")
+    await fake_textract.analyze_document("docs/clearance.pdf")
+
+    assert result["ocr_engine"] == "embedded_text"
+    assert result["text"].splitlines() == CLEARANCE
+    assert fake_textract.client.calls == []
+    assert fake_textract.cache_stats()["hits"] == 1
+
+
+async def test_scanned_pdf_uses_textract(
+    fake_textract: TextractService, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a PDF with an image-only page still goes to Textract."""
+    monkeypatch.setattr(settings, "ocr_page_parallel_enabled", False)
+    fake_textract.client.add_pages("docs/scan.pdf", [CLEARANCE, ["Signature"]])
+    fake_textract.s3_client.put("docs/scan.pdf", body=make_text_pdf([CLEARANCE, []]))
+
+    result = await fake_textract.analyze_document("docs/scan.pdf")
+
+    assert result["ocr_engine"] == "textract"
+    assert fake_textract.client.calls[0] == "start_document_analysis"
@@ -0,0 +1,147 @@
+"""Tests for the compact OCR block representation."""
+
+import sys
+from typing import Any
+
+import pytest
+
+from app.services.ocr_blocks import CompactBlocks, compact_result
+from app.services.textract import TextractService
+
+
+def geometry(left: float, top: float) -> dict[str, Any]:
+    """Build a Textract geometry dict."""
+    return {
+        "BoundingBox": {"Width": 0.2, "Height": 0.05, "Left": left, "Top": top},
+        "Polygon": [
+            {"X": left, "Y": top},
+            {"X": left + 0.2, "Y": top},
+            {"X": left + 0.2, "Y": top + 0.05},
+            {"X": left, "Y": top + 0.05},
+        ],
+    }
+
+
+def page_blocks(page: int, lines: int = 40) -> list[dict[str, Any]]:
+    """Build a realistic page of LINE and WORD blocks."""
+    blocks: list[dict[str, Any]] = [
+        {
+            "BlockType": "PAGE",
+            "Id": f"page-{page}",
+            "Page": page,
+            "Geometry": geometry(0.0, 0.0),
+            "Relationships": [
+                {"Type": "CHILD", "Ids": [f"line-{page}-{i}" for i in range(lines)]}
+            ],
+        }
+    ]
+    for i in range(lines):
+        words = [f"word-{page}-{i}-{w}" for w in range(3)]
+        blocks.append(
+            {
+                "BlockType": "LINE",
+                "Id": f"line-{page}-{i}",
+                "Page": page,
+                "Text": f"Line {i} of page {page}",
+                "Confidence": 99.12345678901234,
+                "Geometry": geometry(0.1, i / lines),
+                "Relationships": [{"Type": "CHILD", "Ids": words}],
+            }
+        )
+        blocks.extend(
+            {
+                "BlockType": "WORD",
+                "Id": word_id,
+                "Page": page,
+                "Text": text,
+                "TextType": "PRINTED",
+                "Confidence": 98.5,
+                "Geometry": geometry(0.1 + w * 0.05, i / lines),
+            }
+            for w, (word_id, text) in enumerate(
+                zip(words, ["Line", str(i), "page"], strict=True)
+            )
+        )
+    return blocks
+
+
+def deep_size(value: Any) -> int:
+    """Approximate memory held by nested dicts, lists and scalars."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(deep_size(k) + deep_size(v) for k, v in value.items())
+    elif isinstance(value, list):
+        size += sum(deep_size(item) for item in value)
+    return size
+
+
+def test_round_trip_is_lossless() -> None:
+    """Test that rebuilt blocks equal the originals, key for key."""
+    blocks = page_blocks(1) + page_blocks(2)
+
+    compact = CompactBlocks(blocks)
+
+    assert compact.to_list() == blocks
+    assert compact == blocks
+    assert len(compact) == len(blocks)
+
+
+def test_values_outside_the_columns_are_kept_verbatim() -> None:
+    """Test that unusual keys and values survive the conversion unchanged."""
+    blocks = [
+        {
+            "BlockType": "KEY_VALUE_SET",
+            "Id": "k",
+            "EntityTypes": ["KEY"],
+            "Confidence": 90,
+            "Relationships": [{"Type": "VALUE", "Ids": ["missing"]}],
+        },
+        {"BlockType": "CELL", "RowIndex": 1, "ColumnIndex": 2, "Geometry": {}},
+    ]
+
+    rebuilt = CompactBlocks(blocks).to_list()
+
+    assert rebuilt == blocks
+    assert type(rebuilt[0]["Confidence"]) is int
+
+
+def test_indexing_and_slicing() -> None:
+    """Test sequence access by index, negative index and slice."""
+    blocks = page_blocks(1, lines=2)
+    compact = CompactBlocks(blocks)
+
+    assert compact[1] == blocks[1]
+    assert compact[-1] == blocks[-1]
+    assert compact[1:3] == blocks[1:3]
+    with pytest.raises(IndexError):
+        compact[len(blocks)]
+
+
+def test_compact_form_is_much_smaller() -> None:
+    """Test that the columns take a fraction of the dict representation."""
+    blocks = [block for page in range(1, 6) for block in page_blocks(page)]
+
+    assert CompactBlocks(blocks).nbytes * 5 < deep_size(blocks)
+
+
+def test_compact_result_replaces_only_blocks() -> None:
+    """Test that compact_result keeps the other result keys as they are."""
+    result = {"blocks": page_blocks(1, lines=1), "text": "Line 0", "forms": []}
+
+    compacted = compact_result(result)
+
+    assert isinstance(compacted["blocks"], CompactBlocks)
+    assert compacted == result
+    assert compact_result({"text": ""}) == {"text": ""}
+
+
+async def test_ocr_cache_holds_compact_blocks(fake_textract: TextractService) -> None:
+    """Test that cached results are held compactly and read back equal."""
+    fake_textract.client.add_document("docs/license.jpg", ["LICENSE", "No. 123"])
+    fake_textract.s3_client.put("docs/license.jpg")
+
+    first = await fake_textract.analyze_document("docs/license.jpg")
+    second = await fake_textract.analyze_document("docs/license.jpg")
+
+    assert isinstance(second["blocks"], CompactBlocks)
+    assert second == first
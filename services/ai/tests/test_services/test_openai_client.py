@@ -0,0 +1,307 @@
+"""Tests for provider routing in the AI client."""
+
+import asyncio
+from collections.abc import AsyncIterator
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from openai import APIConnectionError
+
+from app.config import settings
+from app.core.cache import TwoTierCache
+from app.core.exceptions import AIProviderError
+from app.services.openai_client import OPENAI, AIClient
+from app.services.provider_health import CircuitState
+
+
+class ScriptedProvider:
+    """Provider call that sleeps, then answers or fails."""
+
+    def __init__(self, answer: str, delay: float = 0.0, fail: bool = False) -> None:
+        self.answer = answer
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = False
+
+    async def __call__(self, **request: object) -> str:
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.fail:
+            raise APIConnectionError(request=httpx.Request("POST", "https://api"))
+        return self.answer
+
+
+def make_client(
+    monkeypatch: pytest.MonkeyPatch, openai: ScriptedProvider, anthropic: ScriptedProvider
+) -> AIClient:
+    client = AIClient()
+    client.cache = None
+    client.openai_client = object()
+    client.anthropic_client = object()
+    monkeypatch.setattr(client, "_complete_openai", openai)
+    monkeypatch.setattr(client, "_complete_anthropic", anthropic)
+    return client
+
+
+async def test_falls_back_when_primary_fails(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that Anthropic answers when OpenAI errors."""
+    openai = ScriptedProvider("openai", fail=True)
+    anthropic = ScriptedProvider("anthropic")
+    client = make_client(monkeypatch, openai, anthropic)
+
+    assert await client.complete("prompt") == "anthropic"
+
+
+async def test_no_fallback_raises_provider_error(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that use_fallback=False surfaces the primary's failure."""
+    openai = ScriptedProvider("openai", fail=True)
+    anthropic = ScriptedProvider("anthropic")
+    client = make_client(monkeypatch, openai, anthropic)
+
+    with pytest.raises(AIProviderError, match="OpenAI completion failed"):
+        await client.complete("prompt", use_fallback=False)
+    assert anthropic.calls == 0
+
+
+async def test_hedging_starts_secondary_when_primary_is_slow(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that a slow primary is hedged and the loser cancelled."""
+    monkeypatch.setattr(settings, "ai_hedging_enabled", True)
+    monkeypatch.setattr(settings, "ai_hedge_default_delay_seconds", 0.02)
+    openai = ScriptedProvider("openai", delay=5.0)
+    anthropic = ScriptedProvider("anthropic")
+    client = make_client(monkeypatch, openai, anthropic)
+
+    async with asyncio.timeout(1):
+        assert await client.complete("prompt") == "anthropic"
+    await asyncio.sleep(0)
+    assert openai.cancelled
+
+
+async def test_hedging_leaves_fast_primary_alone(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that the secondary is not called when the primary is quick."""
+    monkeypatch.setattr(settings, "ai_hedging_enabled", True)
+    monkeypatch.setattr(settings, "ai_hedge_default_delay_seconds", 1.0)
+    openai = ScriptedProvider("openai")
+    anthropic = ScriptedProvider("anthropic")
+    client = make_client(monkeypatch, openai, anthropic)
+
+    assert await client.complete("prompt") == "openai"
+    assert anthropic.calls == 0
+
+
+async def test_deterministic_completions_are_cached(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Test that temperature-0 answers are reused per prompt version."""
+    openai = ScriptedProvider("openai")
+    client = make_client(monkeypatch, openai, ScriptedProvider("anthropic"))
+    client.cache = TwoTierCache(16, tmp_path / "llm", ttl_seconds=60)
+
+    await client.complete("prompt", temperature=0.0, prompt_version="v1")
+    await client.complete("prompt", temperature=0.0, prompt_version="v1")
+    assert openai.calls == 1
+
+    await client.complete("prompt", temperature=0.0, prompt_version="v2")
+    await client.complete("prompt", temperature=0.7, prompt_version="v2")
+    assert openai.calls == 3
+
+    client.cache.memory.clear()
+    await client.complete("prompt", temperature=0.0, prompt_version="v1")
+    assert openai.calls == 3
+    assert client.cache_stats()["disk_hits"] == 1
+
+
+def test_latency_percentile_needs_samples() -> None:
+    """Test that the hedge delay falls back until latencies are known."""
+    client = AIClient()
+    client.cache = None
+    stats = client.health["openai"].stats
+    assert client._hedge_delay("openai") == settings.ai_hedge_default_delay_seconds
+
+    for latency in range(1, 21):
+        stats.record_success(latency / 10)
+    assert stats.latency_percentile(0.95) == 1.9
+
+
+async def test_failing_provider_stops_costing_a_round_trip(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that after a failure the healthy provider is tried first."""
+    openai = ScriptedProvider("openai", fail=True)
+    anthropic = ScriptedProvider("anthropic")
+    client = make_client(monkeypatch, openai, anthropic)
+
+    for _ in range(5):
+        assert await client.complete("prompt") == "anthropic"
+    assert openai.calls == 1
+
+
+async def test_open_circuit_skips_provider(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a provider is not called while its circuit is open."""
+    openai = ScriptedProvider("openai", fail=True)
+    client = make_client(monkeypatch, openai, ScriptedProvider("anthropic"))
+    breaker = client.health["openai"].breaker
+    for _ in range(breaker.failure_threshold):
+        with pytest.raises(AIProviderError):
+            await client.complete("prompt", use_fallback=False)
+
+    assert client.provider_health()["openai"]["state"] == "open"
+    with pytest.raises(AIProviderError, match="circuit open"):
+        await client.complete("prompt", use_fallback=False)
+    assert await client.complete("prompt") == "anthropic"
+    assert openai.calls == breaker.failure_threshold
+
+
+async def test_half_open_probe_closes_circuit(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a successful probe after the reset timeout closes the circuit."""
+    openai = ScriptedProvider("openai", fail=True)
+    client = make_client(monkeypatch, openai, ScriptedProvider("anthropic"))
+    breaker = client.health["openai"].breaker
+    breaker.reset_timeout = 0.01
+    for _ in range(breaker.failure_threshold):
+        with pytest.raises(AIProviderError):
+            await client.complete("prompt", use_fallback=False)
+    assert breaker.state == CircuitState.OPEN
+
+    await asyncio.sleep(0.02)
+    assert breaker.state == CircuitState.HALF_OPEN
+    openai.fail = False
+    assert await client.complete("prompt", use_fallback=False) == "openai"
+    assert breaker.state == CircuitState.CLOSED
+
+
+async def test_unhealthy_provider_is_tried_last(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that routing prefers the provider with the lower error rate."""
+    client = make_client(
+        monkeypatch, ScriptedProvider("openai"), ScriptedProvider("anthropic")
+    )
+    for _ in range(3):
+        client.health["openai"].stats.record_failure()
+    client.health["openai"].stats.record_success(0.1)
+
+    assert client._providers(use_fallback=True) == ["anthropic", "openai"]
+    assert client._providers(use_fallback=False) == ["openai"]
+
+
+async def test_all_circuits_open_fails_fast(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that no request is made while every circuit is open."""
+    openai = ScriptedProvider("openai", fail=True)
+    anthropic = ScriptedProvider("anthropic", fail=True)
+    client = make_client(monkeypatch, openai, anthropic)
+    threshold = client.health["openai"].breaker.failure_threshold
+    for _ in range(threshold):
+        with pytest.raises(AIProviderError):
+            await client.complete("prompt")
+
+    with pytest.raises(AIProviderError, match="circuit open"):
+        await client.complete("prompt")
+    assert openai.calls == anthropic.calls == threshold
+
+
+async def test_openai_usage_is_charged_to_token_budget(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that the reported usage replaces the up-front token estimate."""
+    usage = SimpleNamespace(total_tokens=40)
+    message = SimpleNamespace(content="answer")
+    response = SimpleNamespace(
+        usage=usage, choices=[SimpleNamespace(message=message)]
+    )
+
+    async def create(**request: object) -> SimpleNamespace:
+        return response
+
+    client = AIClient()
+    client.openai_client = SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=create))
+    )
+    limiter = client.limiters[OPENAI]
+    before = limiter.tokens.level
+
+    text = await client._complete_openai("x" * 400, None, 500, 0.0)
+
+    assert text == "answer"
+    assert before - limiter.tokens.level <= 40
+
+
+class ScriptedStream:
+    """Provider stream that yields its parts, optionally failing part-way."""
+
+    def __init__(self, *parts: str, fail_after: int | None = None) -> None:
+        self.parts = parts
+        self.fail_after = fail_after
+        self.calls = 0
+
+    async def __call__(self, **request: object) -> AsyncIterator[str]:
+        self.calls += 1
+        for index, part in enumerate(self.parts):
+            if index == self.fail_after:
+                break
+            yield part
+        if self.fail_after is not None:
+            raise APIConnectionError(request=httpx.Request("POST", "https://api"))
+
+
+async def test_stream_falls_back_before_first_token(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that a provider failing before any output is replaced."""
+    client = make_client(
+        monkeypatch, ScriptedProvider("openai"), ScriptedProvider("anthropic")
+    )
+    monkeypatch.setattr(client, "_stream_openai", ScriptedStream(fail_after=0))
+    monkeypatch.setattr(client, "_stream_anthropic", ScriptedStream("an", "swer"))
+
+    parts = [part async for part in client.stream("prompt")]
+
+    assert parts == ["an", "swer"]
+
+
+async def test_stream_failure_after_output_is_raised(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that a mid-stream failure is not spliced onto another provider."""
+    client = make_client(
+        monkeypatch, ScriptedProvider("openai"), ScriptedProvider("anthropic")
+    )
+    anthropic = ScriptedStream("other")
+    monkeypatch.setattr(client, "_stream_openai", ScriptedStream("an", fail_after=1))
+    monkeypatch.setattr(client, "_stream_anthropic", anthropic)
+
+    parts = []
+    with pytest.raises(AIProviderError, match="OpenAI completion failed"):
+        async for part in client.stream("prompt"):
+            parts.append(part)
+
+    assert parts == ["an"]
+    assert anthropic.calls == 0
+
+
+async def test_streamed_completion_is_cached(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Test that a streamed temperature-0 answer serves later calls."""
+    openai = ScriptedProvider("openai")
+    client = make_client(monkeypatch, openai, ScriptedProvider("anthropic"))
+    client.cache = TwoTierCache(16, tmp_path / "llm")
+    monkeypatch.setattr(client, "_stream_openai", ScriptedStream("an", "swer"))
+
+    streamed = [part async for part in client.stream("prompt", temperature=0.0)]
+    cached = await client.complete("prompt", temperature=0.0)
+
+    assert streamed == ["an", "swer"]
+    assert cached == "answer"
+    assert openai.calls == 0
@@ -0,0 +1,102 @@
+"""Tests for the single-pass document pipeline."""
+
+import json
+from datetime import date
+
+import pytest
+
+from app.config import settings
+from app.models.document import DocumentType
+from app.services.classifier import DocumentClassifier
+from app.services.extractor import DataExtractor
+from app.services.openai_client import ai_client
+from app.services.pipeline import DocumentPipeline
+from app.services.textract import TextractService
+from tests.fakes import FakeCompletion
+
+WEIGH_IN_LINES = [
+    "OFFICIAL WEIGH-IN RECORD",
+    "Fighter: Jane Doe",
+    "Weight: 134.5 lbs",
+    "Date: 2026-03-14",
+]
+
+
+@pytest.fixture
+def completion(monkeypatch: pytest.MonkeyPatch) -> FakeCompletion:
+    """Replace AI completions with scripted classification/extraction replies."""
+    fake = FakeCompletion(
+        {
+            "classifier": json.dumps(
+                {"document_type": "weigh_in_record", "confidence": 0.97}
+            ),
+            "extraction": "```json\n"
+            + json.dumps(
+                {
+                    "fighter_name": "Jane Doe",
+                    "weight": 134.5,
+                    "weigh_in_date": "2026-03-14",
+                    "weight_class": None,
+                }
+            )
+            + "\n```",
+        }
+    )
+    monkeypatch.setattr(ai_client, "complete", fake)
+    return fake
+
+
+@pytest.fixture
+def pipeline(fake_textract: TextractService) -> DocumentPipeline:
+    """Pipeline for a weigh-in document stored in the fake S3 bucket."""
+    fake_textract.client.add_document("docs/weigh-in.jpg", WEIGH_IN_LINES)
+    fake_textract.s3_client.put("docs/weigh-in.jpg")
+    return DocumentPipeline(
+        "doc-1",
+        "docs/weigh-in.jpg",
+        textract=fake_textract,
+        document_classifier=DocumentClassifier(),
+        data_extractor=DataExtractor(),
+    )
+
+
+async def test_pipeline_runs_single_ocr_pass(
+    pipeline: DocumentPipeline, completion: FakeCompletion
+) -> None:
+    """Test that classification and extraction share one Textract call."""
+    result = await pipeline.run()
+
+    assert pipeline.textract.client.calls == ["analyze_document"]
+    assert result.classification.document_type == DocumentType.WEIGH_IN_RECORD
+    assert result.extracted_data["weight"] == 134.5
+    assert result.extracted_data["weigh_in_date"] == date(2026, 3, 14)
+    assert {f.field_name for f in result.extracted_fields} == {
+        "fighter_name",
+        "weight",
+        "weigh_in_date",
+    }
+    assert all("Jane Doe" in prompt for prompt in completion.prompts)
+
+
+async def test_pipeline_skips_extraction_for_unknown_documents(
+    pipeline: DocumentPipeline, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that an unclassifiable document is not sent for extraction."""
+    monkeypatch.setattr(settings, "local_classifier_enabled", False)
+    fake = FakeCompletion({"classifier": "I am not sure."})
+    monkeypatch.setattr(ai_client, "complete", fake)
+
+    result = await pipeline.run()
+
+    assert result.classification.document_type == DocumentType.UNKNOWN
+    assert result.extracted_fields == []
+    assert len(fake.prompts) == 1
+
+
+def test_validate_flags_expired_documents(pipeline: DocumentPipeline) -> None:
+    """Test that validation warns about expired documents and bad weights."""
+    warnings = pipeline.validate(
+        {"expiration_date": date(2000, 1, 1), "weight": 12.0}
+    )
+
+    assert len(warnings) == 2
@@ -0,0 +1,168 @@
+"""Tests for extraction prompt compaction."""
+
+import json
+from typing import Any
+
+import pytest
+
+from app.config import settings
+from app.models.document import DocumentType
+from app.services.extractor import DataExtractor
+from app.services.openai_client import ai_client
+from app.services.prompt_compaction import chunk_pages, compact_text, schema_keywords
+from tests.fakes import FakeCompletion
+
+BOILERPLATE = [
+    f"Patient education leaflet paragraph {i} about healthy eating" for i in range(60)
+]
+CLEARANCE = [
+    "Examining physician: Dr. Alan Reed",
+    "Physician license: MD-1234",
+    "Clearance date: 03/14/2024",
+    "Cleared for competition: YES",
+]
+
+
+def test_short_text_is_unchanged() -> None:
+    """Test that text within the budget is passed through."""
+    result = compact_text("Weight: 170 lbs", ["weight"], max_tokens=100)
+
+    assert result.text == "Weight: 170 lbs"
+    assert result.dropped == []
+
+
+def test_keeps_relevant_chunks_within_budget() -> None:
+    """Test that the schema-relevant section survives and filler is dropped."""
+    text = "\n".join(BOILERPLATE[:30] + CLEARANCE + BOILERPLATE[30:])
+    keywords = ["physician_license Physician license number", "clearance_date Date"]
+
+    result = compact_text(text, keywords, max_tokens=200)
+
+    assert "Physician license: MD-1234" in result.text
+    assert "Cleared for competition: YES" in result.text
+    assert len(result.text) <= 200 * 4 + 40
+    assert result.dropped and result.dropped_chars > 0
+    assert "[...]" in result.text
+
+
+def test_compaction_can_be_disabled() -> None:
+    """Test that a zero budget disables compaction."""
+    text = "\n".join(BOILERPLATE)
+
+    assert compact_text(text, ["weight"], max_tokens=0).text == text
+
+
+def test_schema_keywords_drop_stopwords_and_plurals() -> None:
+    """Test keyword extraction from field descriptions."""
+    assert schema_keywords(["restrictions Medical restrictions"]) >= {
+        "restriction",
+        "medical",
+    }
+    assert "of" not in schema_keywords(["date_of_birth Date of birth"])
+
+
+async def test_extractor_sends_compacted_text(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that long documents are compacted before the AI call."""
+    monkeypatch.setattr(settings, "extraction_prompt_max_tokens", 200)
+    completion = FakeCompletion({"extraction": "{}"})
+    monkeypatch.setattr(ai_client, "complete", completion)
+    text = "\n".join(BOILERPLATE[:30] + CLEARANCE + BOILERPLATE[30:])
+
+    await DataExtractor().extract(
+        "d1", "a.pdf", DocumentType.MEDICAL_CLEARANCE, ocr_result={"text": text}
+    )
+
+    prompt = completion.prompts[0]
+    assert "Cleared for competition: YES" in prompt
+    assert "paragraph 59" not in prompt
+
+
+def _page(number: int, text: str, confidence: float = 0.9) -> dict[str, Any]:
+    return {"page": number, "text": text, "confidence": confidence}
+
+
+def test_chunk_pages_groups_consecutive_pages() -> None:
+    """Test that pages are packed in order up to the character budget."""
+    pages = [_page(number, "x" * 100) for number in range(1, 6)]
+
+    chunks = chunk_pages(pages, max_chars=250, max_chunks=6)
+
+    assert [chunk.pages for chunk in chunks] == [[1, 2], [3, 4], [5]]
+
+
+def test_chunk_pages_caps_chunk_count() -> None:
+    """Test that the budget grows so there are at most max_chunks chunks."""
+    pages = [_page(number, "x" * (10 * number)) for number in range(1, 11)]
+
+    chunks = chunk_pages(pages, max_chars=10, max_chunks=3)
+
+    assert len(chunks) <= 3
+    assert [page for chunk in chunks for page in chunk.pages] == list(range(1, 11))
+
+
+def test_chunk_pages_weights_confidence_by_length() -> None:
+    """Test that chunk confidence is weighted by page text length."""
+    pages = [_page(1, "x" * 300, 0.9), _page(2, "y" * 100, 0.5), _page(3, "  ")]
+
+    (chunk,) = chunk_pages(pages, max_chars=1000, max_chunks=6)
+
+    assert chunk.pages == [1, 2]
+    assert chunk.confidence == pytest.approx(0.8)
+
+
+async def test_extractor_maps_page_chunks_and_merges_by_confidence(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that each field comes from the most confident chunk holding it."""
+    monkeypatch.setattr(settings, "extraction_prompt_max_tokens", 50)
+    monkeypatch.setattr(settings, "extraction_batch_enabled", False)
+    prompts: list[str] = []
+
+    async def complete(prompt: str, **kwargs: Any) -> str:
+        prompts.append(prompt)
+        if "faded" in prompt:
+            return json.dumps({"physician_name": "Dr. Reel", "notes": "Faded copy"})
+        return json.dumps({"physician_name": "Dr. Alan Reed"})
+
+    monkeypatch.setattr(ai_client, "complete", complete)
+    pages = [
+        _page(1, "faded photocopy of the examination summary " * 4, 0.6),
+        _page(2, "typed examination summary from the clinic " * 4, 0.95),
+    ]
+
+    data, fields, _ = await DataExtractor().extract(
+        "d1",
+        "a.pdf",
+        DocumentType.MEDICAL_CLEARANCE,
+        ocr_result={
+            "text": "\n".join(page["text"] for page in pages),
+            "pages": pages,
+            "confidence": 0.8,
+        },
+    )
+
+    assert len(prompts) == 2
+    assert data["physician_name"] == "Dr. Alan Reed"
+    assert data["notes"] == "Faded copy"
+    by_name = {field.field_name: field for field in fields}
+    assert by_name["physician_name"].source_location == {"pages": [2]}
+    assert by_name["physician_name"].confidence == pytest.approx(0.95)
+    assert by_name["notes"].source_location == {"pages": [1]}
+
+
+async def test_short_multi_page_document_uses_one_prompt(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that documents within the prompt budget are not split."""
+    completion = FakeCompletion({"extraction": "{}"})
+    monkeypatch.setattr(ai_client, "complete", completion)
+    pages = [_page(1, "Page one"), _page(2, "Page two")]
+
+    await DataExtractor().extract(
+        "d1",
+        "a.pdf",
+        DocumentType.MEDICAL_CLEARANCE,
+        ocr_result={"text": "Page one\nPage two", "pages": pages},
+    )
+
+    assert len(completion.prompts) == 1
@@ -0,0 +1,147 @@
+"""Tests for classification and extraction response parsing."""
+
+from datetime import date
+
+import pytest
+
+from app.models.document import DocumentType
+from app.services.classifier import DocumentClassifier
+from app.services.extractor import DataExtractor
+from app.services.response_parsing import IncrementalJSONParser, extract_json_object
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        '{"a": 1}',
+        'Here is the result:\n```json\n{"a": 1}\n```\nLet me know.',
+        'Sure! The answer is {"a": 1} as requested.',
+        'Braces {not json} before {"a": 1}',
+    ],
+)
+def test_extract_json_object_handles_wrapping(text: str) -> None:
+    """Test that bare, fenced and prose-wrapped JSON objects are found."""
+    assert extract_json_object(text) == {"a": 1}
+
+
+def test_extract_json_object_returns_none_without_object() -> None:
+    """Test that responses without an object return None."""
+    assert extract_json_object("[1, 2, 3] and no object") is None
+
+
+def test_parse_classification_fenced_json() -> None:
+    """Test classification parsing from a fenced response with alternatives."""
+    result = DocumentClassifier()._parse_classification(
+        "```json\n"
+        '{"document_type": "PHOTO_ID", "confidence": 0.92, '
+        '"alternatives": [{"document_type": "license", "confidence": 0.05}], '
+        '"reasoning": "Driver license layout"}\n```'
+    )
+
+    assert result.document_type == DocumentType.PHOTO_ID
+    assert result.confidence == pytest.approx(0.92)
+    assert result.alternative_types == [(DocumentType.LICENSE, 0.05)]
+    assert result.reasoning == "Driver license layout"
+
+
+def test_parse_classification_prose_wrapped_json() -> None:
+    """Test classification parsing when JSON is surrounded by prose."""
+    result = DocumentClassifier()._parse_classification(
+        'I believe this is {"document_type": "weigh_in_record", "confidence": 0.8}.'
+    )
+
+    assert result.document_type == DocumentType.WEIGH_IN_RECORD
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        "not json at all",
+        '{"document_type": "passport", "confidence": 0.9}',
+    ],
+)
+def test_parse_classification_invalid_is_unknown(response: str) -> None:
+    """Test that unparseable or unknown types classify as UNKNOWN."""
+    result = DocumentClassifier()._parse_classification(response)
+
+    assert result.document_type == DocumentType.UNKNOWN
+    assert result.confidence == 0.0
+
+
+def test_parse_classification_clamps_confidence() -> None:
+    """Test that out-of-range confidences are clamped to [0, 1]."""
+    result = DocumentClassifier()._parse_classification(
+        '{"document_type": "contract", "confidence": 7}'
+    )
+
+    assert result.confidence == 1.0
+
+
+def test_parse_extraction_fenced_json() -> None:
+    """Test extraction parsing validates values against the schema."""
+    data = DataExtractor()._parse_extraction(
+        '```json\n{"full_name": "Jane Doe", "date_of_birth": "1990-05-01"}\n```',
+        DocumentType.PHOTO_ID,
+    )
+
+    assert data["full_name"] == "Jane Doe"
+    assert data["date_of_birth"] == date(1990, 5, 1)
+
+
+def test_parse_extraction_prose_wrapped_json() -> None:
+    """Test extraction parsing when JSON is surrounded by prose."""
+    data = DataExtractor()._parse_extraction(
+        'Extracted: {"weight": 155.5, "made_weight": true} Done.',
+        DocumentType.WEIGH_IN_RECORD,
+    )
+
+    assert data["weight"] == 155.5
+    assert data["made_weight"] is True
+
+
+def test_parse_extraction_drops_invalid_and_unknown_fields() -> None:
+    """Test that invalid values and unknown keys are dropped, not fatal."""
+    data = DataExtractor()._parse_extraction(
+        '{"weight": "heavy", "fighter_name": "Jane Doe", "favorite_color": "red"}',
+        DocumentType.WEIGH_IN_RECORD,
+    )
+
+    assert data["weight"] is None
+    assert data["fighter_name"] == "Jane Doe"
+    assert "favorite_color" not in data
+
+
+def test_parse_extraction_unparseable_returns_empty() -> None:
+    """Test that an unparseable response yields no data."""
+    assert DataExtractor()._parse_extraction("nothing", DocumentType.PHOTO_ID) == {}
+
+
+def test_incremental_parser_emits_members_as_they_close() -> None:
+    """Test that each member is emitted on the fragment that completes it."""
+    response = (
+        'Sure:\n```json\n{"name": "Jane \\"JD\\" Doe", "weight": 134.5, '
+        '"restrictions": ["no sparring", {"weeks": 2}], "cleared": true}\n```'
+    )
+    parser = IncrementalJSONParser()
+    emitted: list[tuple[int, tuple[str, object]]] = []
+
+    for index, char in enumerate(response):
+        emitted.extend((index, member) for member in parser.feed(char))
+
+    assert [member for _, member in emitted] == [
+        ("name", 'Jane "JD" Doe'),
+        ("weight", 134.5),
+        ("restrictions", ["no sparring", {"weeks": 2}]),
+        ("cleared", True),
+    ]
+    assert emitted[0][0] == response.index('",')
+    assert parser.done
+
+
+def test_incremental_parser_skips_invalid_values() -> None:
+    """Test that malformed values are dropped without derailing the rest."""
+    parser = IncrementalJSONParser()
+
+    members = parser.feed('{"a": tru, "b": null}')
+
+    assert members == [("b", None)]
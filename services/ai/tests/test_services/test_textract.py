@@ -0,0 +1,231 @@
+"""Tests for the Textract service and its OCR cache."""
+
+import asyncio
+import threading
+import time
+from typing import Any
+
+import pytest
+
+from app.config import settings
+from app.core.exceptions import DocumentNotFoundException, TextractError
+from app.services.textract import TextractService
+from tests.fakes import make_text_pdf
+
+
+@pytest.fixture
+def service(fake_textract: TextractService) -> TextractService:
+    """Textract service with a single-page weigh-in document uploaded."""
+    fake_textract.client.add_document(
+        "docs/weigh-in.jpg", ["OFFICIAL WEIGH-IN", "155.5 lbs"]
+    )
+    fake_textract.s3_client.put("docs/weigh-in.jpg")
+    return fake_textract
+
+
+async def test_analyze_document_returns_text(service: TextractService) -> None:
+    """Test that analysis joins LINE blocks into text."""
+    result = await service.analyze_document("docs/weigh-in.jpg")
+
+    assert result["text"] == "OFFICIAL WEIGH-IN\n155.5 lbs"
+    assert result["confidence"] == pytest.approx(0.99)
+
+
+async def test_repeated_analysis_is_served_from_cache(
+    service: TextractService,
+) -> None:
+    """Test that re-reading the same object does not call Textract again."""
+    first = await service.analyze_document("docs/weigh-in.jpg")
+    second = await service.analyze_document("docs/weigh-in.jpg")
+
+    assert first == second
+    assert service.client.calls == ["analyze_document"]
+    assert service.cache_stats()["hits"] == 1
+    assert service.cache_stats()["misses"] == 1
+
+
+async def test_feature_types_are_cached_separately(service: TextractService) -> None:
+    """Test that text detection and analysis use distinct cache entries."""
+    await service.extract_text("docs/weigh-in.jpg")
+    await service.analyze_document("docs/weigh-in.jpg")
+
+    assert service.client.calls == ["detect_document_text", "analyze_document"]
+
+
+async def test_cache_hit_reuses_memoized_etag(service: TextractService) -> None:
+    """Test that a cache hit within the ETag TTL makes no S3 round trip."""
+    await service.analyze_document("docs/weigh-in.jpg")
+    await service.analyze_document("docs/weigh-in.jpg")
+
+    assert service.s3_client.head_calls == 1
+
+
+async def test_new_etag_invalidates_cache(
+    service: TextractService, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that overwriting the S3 object forces a fresh Textract call."""
+    monkeypatch.setattr(settings, "ocr_etag_ttl_seconds", 0.0)
+    await service.analyze_document("docs/weigh-in.jpg")
+    service.s3_client.put("docs/weigh-in.jpg", etag="etag-2")
+    await service.analyze_document("docs/weigh-in.jpg")
+
+    assert service.client.calls == ["analyze_document", "analyze_document"]
+
+
+async def test_force_reprocess_bypasses_cache(service: TextractService) -> None:
+    """Test that force_reprocess calls Textract even when cached."""
+    await service.analyze_document("docs/weigh-in.jpg")
+    await service.analyze_document("docs/weigh-in.jpg", force_reprocess=True)
+
+    assert service.client.calls == ["analyze_document", "analyze_document"]
+
+
+async def test_disk_tier_survives_memory_loss(service: TextractService) -> None:
+    """Test that results are recovered from disk after the memory tier is cleared."""
+    await service.analyze_document("docs/weigh-in.jpg")
+    service.cache.memory.clear()
+    await service.analyze_document("docs/weigh-in.jpg")
+
+    assert service.client.calls == ["analyze_document"]
+    assert service.cache_stats()["disk_hits"] == 1
+
+
+async def test_memory_tier_evicts_least_recently_used(
+    service: TextractService,
+) -> None:
+    """Test that the memory tier is bounded and counts evictions."""
+    service.cache.memory.max_entries = 1
+    service.client.add_document("docs/id.jpg", ["DRIVER LICENSE"])
+    service.s3_client.put("docs/id.jpg")
+
+    await service.analyze_document("docs/weigh-in.jpg")
+    await service.analyze_document("docs/id.jpg")
+
+    assert len(service.cache.memory) == 1
+    assert service.cache_stats()["evictions"] == 1
+
+
+async def test_missing_object_raises_not_found(service: TextractService) -> None:
+    """Test that a missing S3 object raises DocumentNotFoundException."""
+    with pytest.raises(DocumentNotFoundException):
+        await service.analyze_document("docs/missing.pdf")
+
+
+async def test_pdf_uses_asynchronous_job(service: TextractService) -> None:
+    """Test that multi-page PDFs go through the Start/Get job flow."""
+    service.client.add_pages(
+        "docs/medical.pdf", [["MEDICAL CLEARANCE"], ["Physician: Dr. Lee"]]
+    )
+    service.s3_client.put("docs/medical.pdf")
+    service.client.in_progress_polls = 3
+    service.client.page_size = 2
+
+    result = await service.analyze_document("docs/medical.pdf")
+
+    assert result["text"] == "MEDICAL CLEARANCE\nPhysician: Dr. Lee"
+    assert service.client.calls[0] == "start_document_analysis"
+    # 3 in-progress polls, then 4 blocks returned 2 per page
+    assert service.client.calls.count("get_document_analysis") == 5
+    assert service.job_poller.outstanding == 0
+
+
+async def test_concurrent_jobs_share_one_poller(service: TextractService) -> None:
+    """Test that many outstanding jobs are resolved by the shared poller."""
+    keys = [f"docs/packet-{i}.pdf" for i in range(5)]
+    for key in keys:
+        service.client.add_pages(key, [[f"PAGE ONE {key}"], ["PAGE TWO"]])
+        service.s3_client.put(key)
+    service.client.in_progress_polls = 2
+
+    results = await asyncio.gather(*(service.extract_text(key) for key in keys))
+
+    assert [r["text"].splitlines()[0] for r in results] == [
+        f"PAGE ONE {key}" for key in keys
+    ]
+    assert service.client.calls.count("start_document_text_detection") == 5
+
+
+async def test_failed_job_raises_textract_error(service: TextractService) -> None:
+    """Test that a FAILED job surfaces as TextractError."""
+    service.client.add_pages("docs/broken.pdf", [["x"]])
+    service.s3_client.put("docs/broken.pdf")
+    service.client.fail_jobs = True
+
+    with pytest.raises(TextractError):
+        await service.analyze_document("docs/broken.pdf")
+
+
+async def test_unexpected_poll_error_fails_only_that_job(
+    service: TextractService,
+) -> None:
+    """Test that a non-boto error fails its job without killing the poller."""
+    service.client.add_pages("docs/ok.pdf", [["OK"]])
+    service.s3_client.put("docs/ok.pdf")
+    service.client.add_pages("docs/bad.pdf", [["BAD"]])
+    service.s3_client.put("docs/bad.pdf")
+
+    original = service.client.get_document_analysis
+
+    def flaky(**params: object) -> dict:
+        if service.client.jobs[params["JobId"]]["blocks"][1]["Text"] == "BAD":
+            raise KeyError("malformed response")
+        return original(**params)
+
+    service.client.get_document_analysis = flaky
+
+    results = await asyncio.gather(
+        service.analyze_document("docs/bad.pdf"),
+        service.analyze_document("docs/ok.pdf"),
+        return_exceptions=True,
+    )
+
+    assert isinstance(results[0], TextractError)
+    assert results[1]["text"] == "OK"
+
+
+async def test_mixed_pdf_is_read_page_by_page(service: TextractService) -> None:
+    """Test that only the scanned page of a split PDF goes to Textract."""
+    pytest.importorskip("pypdf")
+    pdf = make_text_pdf(
+        [["MEDICAL CLEARANCE CERTIFICATE"], [], ["Physician signature on file"]]
+    )
+    service.s3_client.put("docs/packet.pdf", body=pdf)
+
+    result = await service.analyze_document("docs/packet.pdf")
+
+    assert result["ocr_engine"] == "embedded_text+textract"
+    assert service.client.calls == ["analyze_document"]
+    assert [page["page"] for page in result["pages"]] == [1, 2, 3]
+    assert result["pages"][2]["text"] == "Physician signature on file"
+    ids = [block["Id"] for block in result["blocks"]]
+    assert len(ids) == len(set(ids))
+
+
+async def test_page_concurrency_is_capped(
+    service: TextractService, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that no more than OCR_PAGE_CONCURRENCY pages are read at once."""
+    pytest.importorskip("pypdf")
+    monkeypatch.setattr(settings, "ocr_page_concurrency", 2)
+    service.s3_client.put("docs/scan.pdf", body=make_text_pdf([[]] * 6))
+    analyze = service.client.analyze_document
+    in_flight = peak = 0
+    lock = threading.Lock()
+
+    def tracked(**params: Any) -> dict[str, Any]:
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.02)
+        with lock:
+            in_flight -= 1
+        return analyze(**params)
+
+    monkeypatch.setattr(service.client, "analyze_document", tracked)
+
+    result = await service.analyze_document("docs/scan.pdf")
+
+    assert len(service.client.uploads) == 6
+    assert peak == 2
+    assert [page["page"] for page in result["pages"]] == list(range(1, 7))
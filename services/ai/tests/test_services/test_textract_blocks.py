@@ -0,0 +1,169 @@
+"""Tests for the Textract block graph parser."""
+
+from typing import Any
+
+import pytest
+
+from app.services.textract import TextractService
+from app.services.textract_blocks import BlockGraph, parse_blocks
+
+
+def word(block_id: str, text: str, page: int = 1) -> dict[str, Any]:
+    """Build a WORD block."""
+    return {"BlockType": "WORD", "Id": block_id, "Text": text, "Page": page}
+
+
+def children(*ids: str) -> list[dict[str, Any]]:
+    """Build a CHILD relationship list."""
+    return [{"Type": "CHILD", "Ids": list(ids)}]
+
+
+def form_blocks(prefix: str, key: str, value: str, page: int = 1) -> list[dict]:
+    """Build KEY and VALUE blocks (with their words) for one form pair."""
+    return [
+        {
+            "BlockType": "KEY_VALUE_SET",
+            "Id": f"{prefix}-key",
+            "EntityTypes": ["KEY"],
+            "Confidence": 90.0,
+            "Page": page,
+            "Relationships": [
+                {"Type": "VALUE", "Ids": [f"{prefix}-value"]},
+                *children(f"{prefix}-kw"),
+            ],
+        },
+        {
+            "BlockType": "KEY_VALUE_SET",
+            "Id": f"{prefix}-value",
+            "EntityTypes": ["VALUE"],
+            "Confidence": 80.0,
+            "Page": page,
+            "Relationships": children(f"{prefix}-vw"),
+        },
+        word(f"{prefix}-kw", key, page),
+        word(f"{prefix}-vw", value, page),
+    ]
+
+
+def test_form_pairs_are_resolved() -> None:
+    """Test that KEY blocks are joined to their VALUE text."""
+    parsed = parse_blocks(form_blocks("f1", "Weight:", "155.5 lbs"))
+
+    assert parsed.forms == [
+        {"key": "Weight:", "value": "155.5 lbs", "confidence": 0.8, "page": 1}
+    ]
+
+
+def test_selection_elements_read_as_status() -> None:
+    """Test that checkbox values come through as SELECTED / NOT_SELECTED."""
+    blocks = form_blocks("f1", "Cleared", "")
+    blocks[-1] = {
+        "BlockType": "SELECTION_ELEMENT",
+        "Id": "f1-vw",
+        "SelectionStatus": "SELECTED",
+    }
+
+    assert parse_blocks(blocks).forms[0]["value"] == "SELECTED"
+
+
+def test_tables_are_built_as_grids() -> None:
+    """Test that CELL blocks are placed by row and column index."""
+    cells = [
+        {
+            "BlockType": "CELL",
+            "Id": f"c{row}{column}",
+            "RowIndex": row,
+            "ColumnIndex": column,
+            "Relationships": children(f"w{row}{column}"),
+        }
+        for row in (1, 2)
+        for column in (1, 2)
+    ]
+    words = [
+        word(f"w{row}{column}", text)
+        for (row, column), text in {
+            (1, 1): "Bout",
+            (1, 2): "Result",
+            (2, 1): "1",
+            (2, 2): "KO",
+        }.items()
+    ]
+    table = {
+        "BlockType": "TABLE",
+        "Id": "t1",
+        "Page": 2,
+        "Confidence": 95.0,
+        "Relationships": children(*(cell["Id"] for cell in cells)),
+    }
+
+    parsed = parse_blocks([table, *cells, *words])
+
+    assert parsed.tables == [
+        {"page": 2, "rows": [["Bout", "Result"], ["1", "KO"]], "confidence": 0.95}
+    ]
+
+
+def test_text_and_confidence_come_from_lines() -> None:
+    """Test that LINE blocks give the text and mean confidence."""
+    parsed = parse_blocks(
+        [
+            {"BlockType": "LINE", "Id": "l1", "Text": "A", "Confidence": 90.0},
+            {"BlockType": "LINE", "Id": "l2", "Text": "B", "Confidence": 70.0},
+        ]
+    )
+
+    assert parsed.text == "A\nB"
+    assert parsed.confidence == pytest.approx(0.8)
+
+
+def test_lines_are_grouped_by_page() -> None:
+    """Test that per-page text and confidence follow page order."""
+    parsed = parse_blocks(
+        [
+            {"BlockType": "LINE", "Text": "C", "Confidence": 60.0, "Page": 2},
+            {"BlockType": "LINE", "Text": "A", "Confidence": 90.0, "Page": 1},
+            {"BlockType": "LINE", "Text": "B", "Confidence": 70.0, "Page": 1},
+        ]
+    )
+
+    assert [page["page"] for page in parsed.pages] == [1, 2]
+    assert parsed.pages[0]["text"] == "A\nB"
+    assert parsed.pages[0]["confidence"] == pytest.approx(0.8)
+    assert parsed.pages[1]["confidence"] == pytest.approx(0.6)
+
+
+def test_unknown_relationship_ids_are_skipped() -> None:
+    """Test that dangling Ids (e.g. a truncated job) do not raise."""
+    cell = {"BlockType": "CELL", "Id": "c", "Relationships": children("missing")}
+
+    assert BlockGraph([cell]).text(cell) == ""
+
+
+def test_many_pages_parse_every_pair() -> None:
+    """Test that pairs on every page of a long document are recovered."""
+    blocks = [
+        block
+        for page in range(1, 51)
+        for block in form_blocks(f"p{page}", "Page", str(page), page)
+    ]
+
+    forms = parse_blocks(blocks).forms
+
+    assert [pair["value"] for pair in forms] == [str(page) for page in range(1, 51)]
+    assert forms[-1]["page"] == 50
+
+
+async def test_analyze_document_returns_forms(
+    fake_textract: TextractService,
+) -> None:
+    """Test that analysis results carry the resolved form pairs."""
+    fake_textract.client.documents["docs/weigh-in.jpg"] = form_blocks(
+        "f1", "Weight", "155.5 lbs"
+    )
+    fake_textract.s3_client.put("docs/weigh-in.jpg")
+
+    result = await fake_textract.analyze_document("docs/weigh-in.jpg")
+
+    assert result["forms"][0]["key"] == "Weight"
+    assert result["forms"][0]["value"] == "155.5 lbs"
+    assert result["tables"] == []